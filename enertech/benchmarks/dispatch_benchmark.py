@@ -0,0 +1,145 @@
+"""
+Benchmark del despacho automático (DispatchService).
+
+Carga N órdenes sin asignar y M técnicos en una base de datos dedicada y mide cuántas órdenes por segundo asigna
+el despacho con 1 o más despachadores en paralelo, comparado con asignar de a una (WorkOrderService.try_assign).
+Al terminar verifica que ningún técnico supere max_active_orders y que ninguna orden quede asignada dos veces.
+
+ATENCIÓN: vacía las tablas de la base indicada (por defecto enertech_dispatch_bench, que se crea si no existe).
+
+Uso:
+    python -m enertech.benchmarks.dispatch_benchmark --orders 50000 --technicians 2000 --workers 1 4
+    (conexión por --host, --port, --user, --dbname; la contraseña se toma de PGPASSWORD)
+"""
+import argparse
+import os
+import random
+import threading
+import time
+from datetime import datetime, timedelta
+
+from psycopg2.extras import execute_values
+
+from enertech.src.database.DatabaseManager import DatabaseManager
+from enertech.src.domain.MaintenanceType import MaintenanceType
+from enertech.src.domain.PriorityLevel import PriorityLevel
+from enertech.src.domain.Status import Status
+from enertech.src.domain.TimeUnit import TimeUnit
+from enertech.src.domain.WorkOrder import WorkOrder
+from enertech.src.repository.TechnicianRepository import TechnicianRepository
+from enertech.src.repository.WorkOrderRepository import WorkOrderRepository
+from enertech.src.service.DispatchService import DispatchService
+from enertech.src.service.TechnicianService import TechnicianService
+from enertech.src.service.WorkOrderService import WorkOrderService
+
+
+def seed(db_manager: DatabaseManager, orders: int, technicians: int, capacity: int):
+    """Vacía las tablas y carga los técnicos, un supervisor, un activo y las órdenes sin asignar"""
+    with db_manager.connection() as conn, conn.cursor() as cursor:
+        cursor.execute("TRUNCATE work_orders, technicians, supervisors, industrial_assets RESTART IDENTITY CASCADE")
+        execute_values(cursor, "INSERT INTO technicians (first_name, last_name, email, password, rol, active, "
+                               "max_active_orders) VALUES %s",
+                       [('Tecnico', str(i), f"tecnico{i}@bench.local", 'password', 'TECHNICIAN', True, capacity)
+                        for i in range(technicians)], page_size=1000)
+        cursor.execute("INSERT INTO supervisors (first_name, last_name, email, password, rol, active, assigned_area) "
+                       "VALUES ('Super', 'Visor', 'supervisor@bench.local', 'password', 'SUPERVISOR', TRUE, 'Norte')")
+        cursor.execute("INSERT INTO industrial_assets (acquisition_date, location, model, asset_type) "
+                       "VALUES (CURRENT_DATE, 'Planta', 'T-1', 'Turbina')")
+    rng = random.Random(42)
+    now = datetime.now()
+    work_orders = []
+    for i in range(orders):
+        order = WorkOrder(title=f"Orden {i}", created_by=1, asset_id=1,
+                          maintenance_type=rng.choice(list(MaintenanceType)), priority=rng.choice(list(PriorityLevel)),
+                          estimated_time=rng.randint(1, 10), estimated_time_unit=rng.choice(list(TimeUnit)),
+                          description="Orden generada para el benchmark")
+        order.opened_at = now - timedelta(minutes=rng.randint(0, 60 * 24 * 30))
+        work_orders.append(order)
+    WorkOrderRepository(db_manager).save_many(work_orders)
+    with db_manager.connection() as conn, conn.cursor() as cursor:
+        cursor.execute("ANALYZE")
+
+
+def verify(db_manager: DatabaseManager, expected: int):
+    """Comprueba que se asignó lo esperado sin superar la capacidad de ningún técnico"""
+    with db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+        cursor.execute("SELECT COUNT(*) FROM work_orders WHERE status = %s AND assigned_to IS NOT NULL",
+                       (Status.IN_PROGRESS.value,))
+        assigned = cursor.fetchone()[0]
+        cursor.execute("""
+                       SELECT COUNT(*)
+                       FROM technicians t
+                       WHERE max_active_orders < (SELECT COUNT(*) FROM work_orders w
+                                                  WHERE w.assigned_to = t.id AND w.status = 'IN_PROGRESS')
+                       """)
+        over_capacity = cursor.fetchone()[0]
+    if assigned != expected or over_capacity:
+        raise AssertionError(f"asignadas={assigned} (esperadas {expected}), técnicos excedidos={over_capacity}")
+
+
+def run_dispatchers(dispatcher: DispatchService, workers: int) -> tuple:
+    """Ejecuta run() en varios hilos a la vez; devuelve (órdenes asignadas, lotes, segundos)"""
+    reports = []
+    threads = [threading.Thread(target=lambda: reports.append(dispatcher.run())) for _ in range(workers)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - started
+    return sum(report.assigned for report in reports), sum(report.batches for report in reports), elapsed
+
+
+def run_one_by_one(work_order_service: WorkOrderService, orders: int, technicians: int) -> tuple:
+    """Línea de base: asignación atómica de a una orden, repartiendo en turnos entre los técnicos"""
+    started = time.perf_counter()
+    assigned = 0
+    for order_id in range(1, orders + 1):
+        if work_order_service.try_assign(order_id, (order_id - 1) % technicians + 1).assigned:
+            assigned += 1
+    return assigned, orders, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark del despacho automático de órdenes de trabajo")
+    parser.add_argument('--orders', type=int, default=20000, help="Órdenes sin asignar a cargar")
+    parser.add_argument('--technicians', type=int, default=1000, help="Técnicos activos")
+    parser.add_argument('--capacity', type=int, default=6, help="max_active_orders de cada técnico")
+    parser.add_argument('--batch-size', type=int, default=500, help="Órdenes por lote del despacho")
+    parser.add_argument('--workers', type=int, nargs='+', default=[1, 4], help="Despachadores en paralelo a probar")
+    parser.add_argument('--baseline-orders', type=int, default=2000,
+                        help="Órdenes para la línea de base de a una (0 para omitirla)")
+    parser.add_argument('--host', default=os.environ.get('PGHOST', 'localhost'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PGPORT', 5432)))
+    parser.add_argument('--user', default=os.environ.get('PGUSER', 'postgres'))
+    parser.add_argument('--dbname', default='enertech_dispatch_bench')
+    args = parser.parse_args()
+
+    db_config = {'host': args.host, 'port': args.port, 'user': args.user, 'dbname': args.dbname}
+    if os.environ.get('PGPASSWORD'):
+        db_config['password'] = os.environ['PGPASSWORD']
+    db_manager = DatabaseManager(db_config, max_pool_size=max(args.workers) + 2, instrument_queries=False)
+    db_manager.initialize()
+    work_order_service = WorkOrderService(WorkOrderRepository(db_manager))
+    technician_service = TechnicianService(TechnicianRepository(db_manager), work_order_service)
+    dispatcher = DispatchService(work_order_service, technician_service, batch_size=args.batch_size)
+    expected = min(args.orders, args.technicians * args.capacity)
+
+    print(f"{'modo':<22} {'asignadas':>10} {'lotes':>7} {'segundos':>9} {'órdenes/s':>10}")
+    try:
+        if args.baseline_orders:
+            baseline_orders = min(args.baseline_orders, args.orders)
+            seed(db_manager, baseline_orders, args.technicians, args.capacity)
+            assigned, calls, elapsed = run_one_by_one(work_order_service, baseline_orders, args.technicians)
+            print(f"{'de a una (try_assign)':<22} {assigned:>10} {calls:>7} {elapsed:>9.2f} {assigned / elapsed:>10.0f}")
+        for workers in args.workers:
+            seed(db_manager, args.orders, args.technicians, args.capacity)
+            assigned, batches, elapsed = run_dispatchers(dispatcher, workers)
+            verify(db_manager, expected)
+            print(f"{f'despacho x{workers}':<22} {assigned:>10} {batches:>7} {elapsed:>9.2f} {assigned / elapsed:>10.0f}")
+    finally:
+        db_manager.close()
+
+
+if __name__ == '__main__':
+    main()
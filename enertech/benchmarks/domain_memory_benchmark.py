@@ -0,0 +1,94 @@
+"""
+Benchmark de memoria de las entidades del dominio (WorkOrder, IndustrialAsset, Technician, Supervisor y Admin).
+
+Compara las clases actuales, con __slots__, contra una copia de cada clase con los mismos métodos y propiedades pero
+con __dict__ por instancia (el esquema anterior). Para cada una muestra el tamaño de un objeto (sys.getsizeof del
+objeto más el de su __dict__), la memoria de una lista de N objetos medida con tracemalloc (incluye los valores que
+cada objeto crea, como la fecha de apertura de una orden) y el tiempo de creación. No usa la base de datos.
+
+Uso:
+    python -m enertech.benchmarks.domain_memory_benchmark --objects 100000
+"""
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+import types
+from abc import ABC
+from datetime import date
+
+from enertech.src.domain.Admin import Admin
+from enertech.src.domain.IndustrialAsset import IndustrialAsset
+from enertech.src.domain.MaintenanceType import MaintenanceType
+from enertech.src.domain.PriorityLevel import PriorityLevel
+from enertech.src.domain.Supervisor import Supervisor
+from enertech.src.domain.Technician import Technician
+from enertech.src.domain.TimeUnit import TimeUnit
+from enertech.src.domain.WorkOrder import WorkOrder
+
+# Argumentos de construcción de cada entidad; los valores se comparten entre objetos para medir solo las instancias
+ENTITIES = [
+    (WorkOrder, ("Cambio de rodamientos", 1, 1, MaintenanceType.CORRECTIVE, PriorityLevel.HIGH, 4, TimeUnit.HOURS,
+                 "Ruido en el eje principal")),
+    (IndustrialAsset, ("Turbina", "T-1000", "Planta Norte", date(2020, 1, 1))),
+    (Technician, ("Ana", "Pérez", "ana@enertech.com", "password", 5)),
+    (Supervisor, ("Luis", "Gómez", "luis@enertech.com", "password", "Norte")),
+    (Admin, ("Eva", "Díaz", "eva@enertech.com", "password", "Sistemas")),
+]
+
+
+def dict_backed(cls: type) -> type:
+    """Copia de cls (y de sus clases base) sin __slots__: cada instancia vuelve a tener su propio __dict__"""
+    bases = tuple(dict_backed(base) for base in cls.__bases__ if base not in (object, ABC))
+    namespace = {name: value for name, value in vars(cls).items()
+                 if name not in ('__slots__', '__dict__', '__weakref__', '__abstractmethods__', '_abc_impl')
+                 and name not in cls.__dict__.get('__slots__', ())}
+    copy = type(cls.__name__, bases, namespace)
+    # Los métodos que usan super() apuntan a la clase original en la celda __class__: se rehacen con la copia
+    for name, value in namespace.items():
+        if isinstance(value, types.FunctionType) and '__class__' in value.__code__.co_freevars:
+            cells = tuple(types.CellType(copy) if free == '__class__' else cell
+                          for free, cell in zip(value.__code__.co_freevars, value.__closure__))
+            setattr(copy, name, types.FunctionType(value.__code__, value.__globals__, name, value.__defaults__, cells))
+    return copy
+
+
+def object_size(instance) -> int:
+    """Bytes del objeto más los de su __dict__, si tiene"""
+    size = sys.getsizeof(instance)
+    if hasattr(instance, '__dict__'):
+        size += sys.getsizeof(instance.__dict__)
+    return size
+
+
+def measure(cls: type, args: tuple, objects: int):
+    """Retorna (bytes por objeto, bytes de la lista de objetos, segundos de creación)"""
+    gc.collect()
+    tracemalloc.start()
+    started = time.perf_counter()
+    instances = [cls(*args) for _ in range(objects)]
+    elapsed = time.perf_counter() - started
+    footprint = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return object_size(instances[0]), footprint, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de memoria de las entidades del dominio")
+    parser.add_argument('--objects', type=int, default=100000, help="Objetos por lista")
+    args = parser.parse_args()
+
+    print(f"{'Entidad':<16}{'Esquema':<10}{'Bytes/objeto':>14}{'Lista (MB)':>12}{'Creación (s)':>14}")
+    for cls, constructor_args in ENTITIES:
+        results = {}
+        for layout, target in (('__dict__', dict_backed(cls)), ('__slots__', cls)):
+            results[layout] = measure(target, constructor_args, args.objects)
+            size, footprint, elapsed = results[layout]
+            print(f"{cls.__name__:<16}{layout:<10}{size:>14}{footprint / 1e6:>12.1f}{elapsed:>14.3f}")
+        saved = 1 - results['__slots__'][1] / results['__dict__'][1]
+        print(f"{'':<16}{'ahorro':<10}{'':>14}{saved:>12.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,5 @@
+import psycopg2
+
 from enertech.src.database.DatabaseManager import DatabaseManager
 from enertech.src.domain.IndustrialAssetData import IndustrialAssetData
 from enertech.src.domain.MaintenanceType import MaintenanceType
@@ -10,11 +12,18 @@ from enertech.src.domain.User import User
 from enertech.src.domain.UserBaseData import UserBaseData
 from enertech.src.domain.UserRole import UserRole
 from enertech.src.domain.WorkOrderData import WorkOrderData
+from enertech.src.repository.EntityCache import EntityCache
 from enertech.src.repository.IndustrialAssetRepository import IndustrialAssetRepository
+from enertech.src.repository.Page import Page
+from enertech.src.repository.ReliabilityRepository import ReliabilityRepository
 from enertech.src.repository.SupervisorRepository import SupervisorRepository
 from enertech.src.repository.TechnicianRepository import TechnicianRepository
 from enertech.src.repository.WorkOrderRepository import WorkOrderRepository
+from enertech.src.service.DispatchService import DispatchService
+from enertech.src.service.OverdueSweeper import OverdueSweeper
+from enertech.src.service.ReliabilityService import ReliabilityService
 from enertech.src.service.IndustrialAssetService import IndustrialAssetService
+from enertech.src.service.OpenWorkOrderIndex import OpenWorkOrderIndex
 from enertech.src.service.SupervisorService import SupervisorService
 from enertech.src.service.TechnicianService import TechnicianService
 from enertech.src.service.WorkOrderService import WorkOrderService
@@ -30,16 +39,52 @@ db_manager = DatabaseManager(db_config)
 db_manager.initialize()  # Inicializa la base de datos y el esquema
 
 # repositorio
-asset_repository = IndustrialAssetRepository(db_manager)
+# activos y usuarios casi no cambian: se guardan en caché (una por tabla, porque los IDs se repiten entre tablas)
+asset_repository = IndustrialAssetRepository(db_manager, EntityCache(max_size=2048, ttl=300.0))
 order_repository = WorkOrderRepository(db_manager)
-tech_repository = TechnicianRepository(db_manager)
-supervisor_repository = SupervisorRepository(db_manager)
+tech_repository = TechnicianRepository(db_manager, EntityCache(max_size=512, ttl=300.0))
+supervisor_repository = SupervisorRepository(db_manager, EntityCache(max_size=512, ttl=300.0))
 
 # servicios
 asset_service = IndustrialAssetService(asset_repository)
-order_service = WorkOrderService(order_repository)
+order_service = WorkOrderService(order_repository, OpenWorkOrderIndex())
 tech_service = TechnicianService(tech_repository, order_service)
 supervisor_service = SupervisorService(supervisor_repository, order_service, tech_service, asset_service)
+dispatch_service = DispatchService(order_service, tech_service)
+reliability_service = ReliabilityService(ReliabilityRepository(db_manager))
+overdue_sweeper = OverdueSweeper(order_service, interval=60.0)  # marca vencidas y completa resolved_on_time
+
+PAGE_SIZE = 20  # Resultados por página en los listados
+
+
+def page_technicians_with_load(after):
+    """Página de técnicos junto con sus órdenes en curso (una sola consulta de carga por página)"""
+    page = tech_repository.page_projection({}, ('id', 'first_name', 'last_name', 'max_active_orders'),
+                                           PAGE_SIZE, after=after)
+    loads = order_service.count_active_orders([technician.id for technician in page.items])
+    return Page([(technician, loads[technician.id]) for technician in page.items], page.next_cursor)
+
+
+def print_paginated(fetch_page, format_item, empty_message: str) -> bool:
+    """
+    Muestra un listado de a una página por vez, pidiendo confirmación para ver la siguiente.
+    :param fetch_page: Función que recibe el cursor de la página anterior (None la primera vez) y devuelve un Page.
+    :param format_item: Función que convierte cada elemento en el texto a mostrar.
+    :param empty_message: Mensaje a mostrar si no hay resultados.
+    :return: True si se mostró al menos un resultado.
+    """
+    page = fetch_page(None)
+    if not page.items:
+        print(empty_message)
+        return False
+    while True:
+        for item in page.items:
+            print(format_item(item))
+        if not page.has_next:
+            return True
+        if input("Enter para ver más resultados, 'q' para continuar: ").strip().lower() == 'q':
+            return True
+        page = fetch_page(page.next_cursor)
 
 
 def register_user() -> User:
@@ -133,7 +178,11 @@ def supervisor_menu(supervisor: Supervisor):
         print("2. Iniciar una orden de trabajo")
         print("3. Asignar técnico a una orden de trabajo")
         print("4. Listar las órdenes de trabajo no asignadas")
-        print("5. Cerrar sesión")
+        print("5. Buscar órdenes de trabajo")
+        print("6. Despachar automáticamente las órdenes sin asignar")
+        print("7. Ver órdenes urgentes y vencidas")
+        print("8. Ver confiabilidad de los activos (MTTR/MTBF)")
+        print("9. Cerrar sesión")
         opcion = input("Selecciona una opción: \n")
 
         if opcion == '1':
@@ -156,13 +205,11 @@ def supervisor_menu(supervisor: Supervisor):
         elif opcion == '2':
             print("--Iniciar una orden de trabajo--")
             print("Lista de activos industriales existentes:")
-            assets = asset_repository.list_by_criteria({})
-            if not assets:
-                print("No hay activos industriales registrados.")
+            has_assets = print_paginated(
+                lambda after: asset_repository.page_by_criteria({}, PAGE_SIZE, after=after),
+                str, "No hay activos industriales registrados.")
+            if not has_assets:
                 continue
-            else:
-                for asset in assets:
-                    print(f"{asset}")
             asset_id = int(input("Ingresa el ID del activo industrial: "))
             try:
                 asset_service.get_asset_by_id(asset_id)
@@ -246,23 +293,22 @@ def supervisor_menu(supervisor: Supervisor):
         elif opcion == '3':
             print("--Asignar técnico a una orden de trabajo--")
             print("Ordenes lisas para asignar:")
-            unassigned_orders = order_service.list_work_orders(
-                {'status': Status.UNASSIGNED.value, 'created_by': supervisor.id})
-            if not unassigned_orders:
-                print("No hay órdenes de trabajo sin asignar.")
+            has_orders = print_paginated(
+                lambda after: order_service.page_work_order_views(
+                    {'status': Status.UNASSIGNED, 'created_by': supervisor.id}, 'summary', PAGE_SIZE, after=after),
+                lambda order: f"Orden ID: {order.id}, Título: {order.title}, Descripción: {order.description}",
+                "No hay órdenes de trabajo sin asignar.")
+            if not has_orders:
                 continue
-            else:
-                for order in unassigned_orders:
-                    print(f"Orden ID: {order.id}, Título: {order.title}, Descripción: {order.description}")
             work_order_id = int(input("Ingresa el ID de la orden de trabajo: "))
             print("Técnicos disponibles:")
-            technicians = tech_repository.list_by_criteria({})
-            if not technicians:
-                print("No hay técnicos disponibles.")
+            has_technicians = print_paginated(
+                page_technicians_with_load,
+                lambda item: f"Técnico ID: {item[0].id}, Nombre: {item[0].first_name} {item[0].last_name}, "
+                             f"Órdenes en curso: {item[1]}/{item[0].max_active_orders}",
+                "No hay técnicos disponibles.")
+            if not has_technicians:
                 continue
-            else:
-                for technician in technicians:
-                    print(f"Técnico ID: {technician.id}, Nombre: {technician.first_name} {technician.last_name}")
             technician_id = int(input("Ingresa el ID del técnico a asignar: "))
             try:
                 assigned_order = supervisor_service.assign_work_order(technician_id, work_order_id)
@@ -271,18 +317,71 @@ def supervisor_menu(supervisor: Supervisor):
                 print(f"Error al asignar técnico: {ex}")
         elif opcion == '4':
             print("--Listar órdenes de trabajo sin asignar--")
-            unassigned_orders = order_service.list_work_orders(
-                {'status': Status.UNASSIGNED.value, 'technician_id': None, 'created_by': supervisor.id})
-            if unassigned_orders:
-                for order in unassigned_orders:
-                    print(f"Orden ID: {order.id}, Título: {order.title}, Descripción: {order.description}")
-            else:
-                print("No hay órdenes de trabajo sin asignar.")
+            print_paginated(
+                lambda after: order_service.page_work_order_views(
+                    {'status': Status.UNASSIGNED, 'created_by': supervisor.id}, 'summary', PAGE_SIZE, after=after),
+                lambda order: f"Orden ID: {order.id}, Título: {order.title}, Descripción: {order.description}",
+                "No hay órdenes de trabajo sin asignar.")
         elif opcion == '5':
+            print("--Buscar órdenes de trabajo--")
+            text = input("Texto a buscar (título, descripción o comentarios de cierre): ")
+            try:
+                found_orders = order_service.search_work_orders(text)
+            except Exception as ex:
+                print(f"Error al buscar órdenes de trabajo: {ex}")
+                continue
+            if found_orders:
+                for order in found_orders:
+                    print(f"Orden ID: {order.id}, Estado: {order.status.value}, Título: {order.title}")
+            else:
+                print("No se encontraron órdenes de trabajo.")
+        elif opcion == '6':
+            print("--Despacho automático de órdenes sin asignar--")
+            try:
+                report = dispatch_service.run()
+            except Exception as ex:
+                print(f"Error al despachar órdenes: {ex}")
+                continue
+            if report.assigned:
+                print(f"Se asignaron {report.assigned} órdenes de trabajo en {report.batches} lotes.")
+            else:
+                print("No hay órdenes sin asignar o técnicos con capacidad libre.")
+        elif opcion == '7':
+            print("--Órdenes urgentes y vencidas--")
+            sections = (("Más urgentes sin asignar", order_service.next_work_orders(10, [Status.UNASSIGNED])),
+                        ("Vencidas", order_service.overdue_work_orders(limit=10)),
+                        ("Vencen en las próximas 24 horas", order_service.work_orders_due_within(24)))
+            for section_title, orders in sections:
+                print(f"{section_title}:")
+                if not orders:
+                    print("  (ninguna)")
+                for order in orders:
+                    print(f"  Orden ID: {order.id}, Prioridad: {order.priority.value}, Estado: {order.status.value}, "
+                          f"Vence: {order.deadline:%d/%m/%Y %H:%M}, Título: {order.title}")
+        elif opcion == '8':
+            print("--Confiabilidad de los activos--")
+            try:
+                reliability_service.refresh()  # solo recalcula los activos con cambios desde la última vez
+            except Exception as ex:
+                print(f"Error al actualizar los indicadores: {ex}")
+                continue
+            sections = (("Por tipo de activo", reliability_service.reliability_by_asset_type()),
+                        ("Por ubicación", reliability_service.reliability_by_location()),
+                        ("Activos con mayor tiempo de reparación", reliability_service.worst_assets('mttr', 10)))
+            for section_title, metrics in sections:
+                print(f"{section_title}:")
+                if not metrics:
+                    print("  (sin datos)")
+                for metric in metrics:
+                    mttr = f"{metric.mttr.total_seconds() / 3600:.1f} h" if metric.mttr else "-"
+                    mtbf = f"{metric.mtbf.total_seconds() / 3600:.1f} h" if metric.mtbf else "-"
+                    print(f"  {metric.key}: activos {metric.assets}, fallas {metric.failures}, MTTR {mttr}, "
+                          f"MTBF {mtbf}")
+        elif opcion == '9':
             print("Cerrando sesión de Supervisor...")
             break  # Vuelve al menú de inicio de sesión
         else:
-            print("Opción inválida. Por favor, elige una opción del 1 al 5.")
+            print("Opción inválida. Por favor, elige una opción del 1 al 9.")
 
 
 def technician_menu(tech: Technician):
@@ -319,6 +418,14 @@ def technician_menu(tech: Technician):
             print("Opción inválida. Por favor, elige una opción del 1 al 3.")
 
 
+def load_open_index():
+    """Carga en memoria las órdenes abiertas para las consultas de urgencia; sin base de datos el menú abre igual"""
+    try:
+        order_service.rebuild_open_index()
+    except psycopg2.Error as ex:
+        print(f"No se pudieron cargar las órdenes abiertas: {ex}")
+
+
 def main():
     """Función principal del sistema de gestión."""
     while True:
@@ -349,7 +456,13 @@ def main():
 # Iniciar la aplicación
 if __name__ == "__main__":
     try:
+        load_open_index()
+        overdue_sweeper.start()
         main()
     except KeyboardInterrupt as e:
         print(f"\nError inesperado: {e}")
         print("Por favor, contacta al administrador del sistema.")
+    finally:
+        overdue_sweeper.stop()
+        db_manager.dump_query_stats()  # deja en el log las consultas que más tiempo consumieron
+        db_manager.close()  # cierra las conexiones del pool
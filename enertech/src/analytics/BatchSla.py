@@ -0,0 +1,93 @@
+from datetime import datetime, timezone
+from typing import Iterable, Optional, Sequence
+
+import numpy as np
+
+from enertech.src.analytics.SlaResult import SlaResult
+from enertech.src.domain.TimeUnit import TimeUnit
+from enertech.src.domain.WorkOrder import WorkOrder
+
+
+class BatchSla:
+    """
+    Cálculo vectorizado (NumPy) del SLA de muchas órdenes a la vez: fecha límite, tiempo restante y si se
+    resolvieron a tiempo, con los mismos resultados que WorkOrder.get_remaining_time y was_resolved_on_time
+    pero en una sola pasada sobre columnas, sin crear objetos WorkOrder.
+    Requiere el extra opcional analytics (pip install -e .[analytics]).
+    """
+    # Microsegundos por unidad de tiempo, en el orden de TimeUnit (un día son 24 h, como timedelta(days=1))
+    _UNIT_CODES = {unit: code for code, unit in enumerate(TimeUnit)}
+    _UNIT_MICROSECONDS = np.array([3_600_000_000, 86_400_000_000, 604_800_000_000], dtype=np.int64)
+    _NAT = np.iinfo(np.int64).min  # representación entera de NaT (sin fecha)
+
+    @staticmethod
+    def compute(opened_at: np.ndarray, resolved_at: np.ndarray, estimated_time: np.ndarray, unit: np.ndarray,
+                now: Optional[datetime] = None, ids: Optional[np.ndarray] = None) -> SlaResult:
+        """
+        Calcula el SLA de todas las órdenes en una pasada.
+        :param opened_at: Aperturas, datetime64 en UTC.
+        :param resolved_at: Resoluciones, datetime64 en UTC; NaT donde la orden no se resolvió.
+        :param estimated_time: Tiempo estimado (enteros).
+        :param unit: Unidad de cada tiempo estimado: códigos enteros (posición en TimeUnit, ver unit_codes) o
+        los valores de texto del enum ('HOURS', 'DAYS', 'WEEKS').
+        :param now: Instante de referencia para el tiempo restante; por defecto, ahora.
+        :param ids: IDs de las órdenes, opcional; se devuelven tal cual en el resultado.
+        :return: SlaResult con una columna por resultado.
+        """
+        opened_at = np.asarray(opened_at).astype('datetime64[us]')
+        resolved_at = np.asarray(resolved_at).astype('datetime64[us]')
+        codes = BatchSla.unit_codes(unit)
+        durations = (np.asarray(estimated_time, dtype=np.int64) * BatchSla._UNIT_MICROSECONDS[codes]).astype(
+            'timedelta64[us]')
+        deadline = opened_at + durations
+        remaining = deadline - BatchSla._to_datetime64(now or datetime.now(timezone.utc))
+        resolved = ~np.isnat(resolved_at)
+        # Las comparaciones con NaT dan False, así que las órdenes sin resolver quedan en False
+        on_time = resolved_at <= deadline
+        return SlaResult(deadline, remaining, resolved, on_time, ids)
+
+    @staticmethod
+    def unit_codes(unit: np.ndarray) -> np.ndarray:
+        """Convierte una columna de unidades (texto o TimeUnit) en códigos enteros; los códigos quedan igual"""
+        unit = np.asarray(unit)
+        if np.issubdtype(unit.dtype, np.integer):
+            return unit
+        codes = np.full(unit.shape, -1, dtype=np.int64)
+        for time_unit, code in BatchSla._UNIT_CODES.items():
+            codes[(unit == time_unit.value) | (unit == time_unit)] = code
+        if (codes < 0).any():
+            raise ValueError(f"Unidades de tiempo desconocidas: {sorted(set(unit[codes < 0].tolist()))}")
+        return codes
+
+    @staticmethod
+    def from_rows(rows: Sequence[tuple], now: Optional[datetime] = None) -> SlaResult:
+        """
+        Calcula el SLA a partir de filas (id, apertura, resolución, tiempo estimado, unidad) con los instantes en
+        microsegundos desde la época Unix, como las devuelve WorkOrderRepository.fetch_sla_rows.
+        """
+        count = len(rows)
+        ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+        opened_at = np.fromiter((row[1] for row in rows), dtype=np.int64, count=count)
+        resolved_at = np.fromiter((BatchSla._NAT if row[2] is None else row[2] for row in rows), dtype=np.int64,
+                                  count=count)
+        estimated_time = np.fromiter((row[3] for row in rows), dtype=np.int64, count=count)
+        unit = np.array([row[4] for row in rows], dtype=object)
+        return BatchSla.compute(opened_at.view('datetime64[us]'), resolved_at.view('datetime64[us]'),
+                                estimated_time, unit, now, ids)
+
+    @staticmethod
+    def from_orders(orders: Iterable[WorkOrder], now: Optional[datetime] = None) -> SlaResult:
+        """Calcula el SLA de objetos WorkOrder ya cargados (las fechas sin zona horaria se toman como locales)"""
+        orders = list(orders)
+        opened_at = np.array([BatchSla._to_datetime64(order.opened_at) for order in orders], dtype='datetime64[us]')
+        resolved_at = np.array([BatchSla._to_datetime64(order.resolved_at) if order.resolved_at else np.datetime64('NaT')
+                                for order in orders], dtype='datetime64[us]')
+        estimated_time = np.array([order.estimated_time for order in orders], dtype=np.int64)
+        unit = np.array([BatchSla._UNIT_CODES[order.estimated_time_unit] for order in orders], dtype=np.int64)
+        ids = np.array([order.id if order.id is not None else -1 for order in orders], dtype=np.int64)
+        return BatchSla.compute(opened_at, resolved_at, estimated_time, unit, now, ids)
+
+    @staticmethod
+    def _to_datetime64(moment: datetime) -> np.datetime64:
+        # NumPy no admite zonas horarias: se pasa a UTC sin zona
+        return np.datetime64(moment.astimezone(timezone.utc).replace(tzinfo=None), 'us')
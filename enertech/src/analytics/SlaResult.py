@@ -0,0 +1,67 @@
+from typing import Optional
+
+import numpy as np
+
+
+class SlaResult:
+    """
+    Resultado de BatchSla.compute: una columna (arreglo de NumPy) por dato, alineadas con las columnas de entrada.
+    Los instantes son datetime64[us] en UTC y las duraciones timedelta64[us].
+    """
+
+    def __init__(self, deadline: np.ndarray, remaining: np.ndarray, resolved: np.ndarray, on_time: np.ndarray,
+                 ids: Optional[np.ndarray] = None):
+        self._ids = ids
+        self._deadline = deadline
+        self._remaining = remaining
+        self._resolved = resolved
+        self._on_time = on_time
+
+    def __len__(self) -> int:
+        return len(self._deadline)
+
+    @property
+    def ids(self) -> Optional[np.ndarray]:
+        """IDs de las órdenes, si se calcularon a partir de filas u objetos WorkOrder"""
+        return self._ids
+
+    @property
+    def deadline(self) -> np.ndarray:
+        """Fecha límite: apertura + tiempo estimado"""
+        return self._deadline
+
+    @property
+    def remaining(self) -> np.ndarray:
+        """Tiempo restante hasta la fecha límite (negativo si ya venció), como WorkOrder.get_remaining_time"""
+        return self._remaining
+
+    @property
+    def resolved(self) -> np.ndarray:
+        """True donde la orden tiene fecha de resolución"""
+        return self._resolved
+
+    @property
+    def on_time(self) -> np.ndarray:
+        """
+        True donde la orden se resolvió en o antes de la fecha límite, como WorkOrder.was_resolved_on_time.
+        Donde resolved es False el valor es False (el método escalar devuelve None).
+        """
+        return self._on_time
+
+    def on_time_values(self) -> list:
+        """Los mismos valores que was_resolved_on_time (True, False o None), como lista de Python"""
+        return [bool(on_time) if resolved else None for on_time, resolved in zip(self._on_time, self._resolved)]
+
+    def summary(self) -> dict:
+        """Totales para reportes: órdenes, resueltas, a tiempo, tarde, abiertas vencidas y tasa de cumplimiento"""
+        resolved = int(self._resolved.sum())
+        on_time = int(self._on_time.sum())
+        overdue_open = int((~self._resolved & (self._remaining < np.timedelta64(0, 'us'))).sum())
+        return {
+            'orders': len(self._deadline),
+            'resolved': resolved,
+            'on_time': on_time,
+            'late': resolved - on_time,
+            'overdue_open': overdue_open,
+            'on_time_rate': on_time / resolved if resolved else 0.0,
+        }
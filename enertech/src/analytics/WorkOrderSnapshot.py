@@ -0,0 +1,210 @@
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from enertech.src.domain.MaintenanceType import MaintenanceType
+from enertech.src.domain.PriorityLevel import PriorityLevel
+from enertech.src.domain.Status import Status
+from enertech.src.domain.TimeUnit import TimeUnit
+from enertech.src.repository.WorkOrderRepository import WorkOrderRepository
+
+
+class WorkOrderSnapshot:
+    """
+    Copia en memoria, por columnas, de las órdenes de trabajo para tableros: un arreglo de NumPy por columna
+    (IDs, instantes datetime64[us] en UTC, tiempo estimado) y los enums como códigos enteros (su posición en el
+    enum). No guarda títulos ni descripciones: una orden ocupa unos 80 bytes en lugar de un objeto WorkOrder.
+    Los filtros (mask) y los conteos por grupo (count_by) son operaciones vectorizadas sobre todas las filas.
+    refresh() trae solo las órdenes modificadas desde la lectura anterior (columna updated_at) y quita las
+    eliminadas. Nunca modifica los arreglos ya publicados: arma columnas nuevas y las reemplaza todas juntas, así que
+    las consultas concurrentes (y los arreglos devueltos por column()) ven siempre una versión completa.
+    Requiere el extra opcional analytics (pip install -e .[analytics]).
+    """
+    # Columnas con código de enum y el enum de cada una
+    ENUM_COLUMNS = {'status': Status, 'priority': PriorityLevel, 'maintenance_type': MaintenanceType,
+                    'estimated_time_unit': TimeUnit}
+    # Columnas en el orden de WorkOrderRepository.snapshot_batches, con su tipo en memoria
+    _COLUMNS = (('id', np.int64), ('status', np.int8), ('priority', np.int8), ('maintenance_type', np.int8),
+                ('estimated_time_unit', np.int8), ('asset_id', np.int64), ('created_by', np.int64),
+                ('assigned_to', np.int64), ('estimated_time', np.int32), ('opened_at', 'datetime64[us]'),
+                ('resolved_at', 'datetime64[us]'), ('deadline_at', 'datetime64[us]'), ('updated_at', 'datetime64[us]'))
+
+    def __init__(self, repository: WorkOrderRepository, overlap: float = 60.0, batch_size: int = 50000):
+        """
+        :param repository: Repositorio de órdenes de trabajo.
+        :param overlap: Segundos que refresh() vuelve a leer antes de la última modificación vista. Una
+        transacción fija updated_at al escribir pero se ve recién al confirmar: el solapamiento cubre las
+        transacciones que tardan hasta ese tiempo en confirmarse.
+        :param batch_size: Filas leídas de la base por viaje.
+        """
+        self._repository = repository
+        self._overlap = timedelta(seconds=overlap)
+        self._batch_size = batch_size
+        self._lock = threading.Lock()
+        self._columns: Dict[str, np.ndarray] = {name: np.empty(0, dtype=dtype) for name, dtype in self._COLUMNS}
+        self._watermark: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._columns['id'])
+
+    @property
+    def watermark(self) -> Optional[datetime]:
+        """Última modificación (updated_at) vista, o None si no se cargó"""
+        return self._watermark
+
+    def column(self, name: str) -> np.ndarray:
+        """Arreglo de una columna (solo lectura), ordenado por ID como todas las demás"""
+        array = self._columns[name].view()
+        array.flags.writeable = False
+        return array
+
+    def load(self) -> int:
+        """
+        Carga todas las órdenes, reemplazando el contenido.
+        :return: Cantidad de órdenes cargadas.
+        """
+        columns = self._read(None)
+        with self._lock:
+            self._columns = columns
+            self._watermark = None
+            self._update_watermark(columns)
+        return len(self)
+
+    def refresh(self) -> Tuple[int, int]:
+        """
+        Trae las órdenes creadas o modificadas desde la última lectura y quita las eliminadas (si la cantidad de
+        órdenes en la base no coincide, compara los IDs). Si nunca se cargó, equivale a load().
+        :return: (órdenes agregadas o actualizadas, órdenes quitadas).
+        """
+        if self._watermark is None:
+            return self.load(), 0
+        changes = self._read(self._watermark - self._overlap)
+        with self._lock:
+            self._columns = WorkOrderSnapshot._upsert(self._columns, changes)
+            self._update_watermark(changes)
+        removed = 0
+        if self._repository.count_all() != len(self):
+            existing = np.array(self._repository.list_ids(), dtype=np.int64)
+            with self._lock:
+                keep = np.isin(self._columns['id'], existing, assume_unique=True)
+                removed = int(len(keep) - keep.sum())
+                if removed:
+                    self._columns = {name: values[keep] for name, values in self._columns.items()}
+        return len(changes['id']), removed
+
+    def mask(self, status=None, priority=None, maintenance_type=None, asset_id=None, assigned_to=None,
+             opened_between: Optional[Tuple[Optional[datetime], Optional[datetime]]] = None,
+             resolved: Optional[bool] = None) -> np.ndarray:
+        """
+        Filtro vectorizado: arreglo booleano con True en las órdenes que cumplen todas las condiciones dadas.
+        Cada condición acepta un valor o una lista de valores (enums del dominio o IDs); None no filtra.
+        :param opened_between: (desde, hasta) sobre opened_at, desde <= opened_at < hasta; cualquiera puede ser None.
+        :param resolved: True solo resueltas, False solo sin resolver.
+        """
+        columns = self._columns  # una sola versión durante todo el cálculo, aunque refresh() la reemplace
+        result = np.ones(len(columns['id']), dtype=bool)
+        for name, value in (('status', status), ('priority', priority), ('maintenance_type', maintenance_type)):
+            if value is not None:
+                result &= np.isin(columns[name], self.codes(name, value))
+        for name, value in (('asset_id', asset_id), ('assigned_to', assigned_to)):
+            if value is not None:
+                result &= np.isin(columns[name], np.atleast_1d(np.asarray(value, dtype=np.int64)))
+        if opened_between is not None:
+            lower, upper = opened_between
+            if lower is not None:
+                result &= columns['opened_at'] >= WorkOrderSnapshot._to_datetime64(lower)
+            if upper is not None:
+                result &= columns['opened_at'] < WorkOrderSnapshot._to_datetime64(upper)
+        if resolved is not None:
+            result &= np.isnat(columns['resolved_at']) != resolved
+        return result
+
+    def count_by(self, *names: str, mask: Optional[np.ndarray] = None) -> Dict:
+        """
+        Cantidad de órdenes por valor de una o más columnas (ej.: count_by('status') o
+        count_by('asset_id', 'priority', mask=snapshot.mask(resolved=False))).
+        Cada columna se pasa a códigos 0..n-1 (los enums ya lo están; las de IDs con np.unique), los códigos se
+        combinan en un único entero por orden y se cuentan con np.bincount.
+        :return: Diccionario valor: cantidad con los enums del dominio como claves (tuplas si hay varias columnas);
+        solo incluye los valores con al menos una orden.
+        """
+        if not names:
+            raise ValueError("Indique al menos una columna")
+        columns = self._columns  # una sola versión durante todo el cálculo, aunque refresh() la reemplace
+        if mask is not None and len(mask) != len(columns['id']):
+            raise ValueError("mask no corresponde a la versión actual de la copia (se refrescó después de armarla)")
+        rows = len(columns['id']) if mask is None else int(mask.sum())
+        labels, combined, total = [], np.zeros(rows, dtype=np.int64), 1
+        for name in names:
+            values = columns[name] if mask is None else columns[name][mask]
+            if name in self.ENUM_COLUMNS:
+                labels.append(list(self.ENUM_COLUMNS[name]))
+            else:
+                distinct, values = np.unique(values, return_inverse=True)
+                labels.append(distinct.tolist())
+            combined = combined * len(labels[-1]) + values
+            total *= len(labels[-1])
+        # Con muchas combinaciones posibles (varias columnas de IDs) se cuentan solo las presentes
+        if total <= max(len(combined), 1 << 16):
+            counts = np.bincount(combined, minlength=total)
+            keys = np.nonzero(counts)[0]
+            counts = counts[keys]
+        else:
+            keys, counts = np.unique(combined, return_counts=True)
+        sizes = [len(column_labels) for column_labels in labels]
+        groups = np.stack(np.unravel_index(keys, sizes), axis=1) if len(keys) else np.empty((0, len(names)), dtype=int)
+        result = {}
+        for group, count in zip(groups.tolist(), counts.tolist()):
+            key = tuple(column_labels[code] for column_labels, code in zip(labels, group))
+            result[key if len(names) > 1 else key[0]] = count
+        return result
+
+    def codes(self, name: str, values) -> np.ndarray:
+        """Códigos de uno o más valores de enum de la columna name"""
+        members = list(self.ENUM_COLUMNS[name])
+        values = values if isinstance(values, (list, tuple, set)) else [values]
+        return np.array([members.index(self.ENUM_COLUMNS[name](value)) for value in values], dtype=np.int8)
+
+    def _read(self, modified_since: Optional[datetime]) -> Dict[str, np.ndarray]:
+        # Arma las columnas lote por lote: cada lote es un arreglo int64 de filas x columnas
+        parts = [np.array(rows, dtype=np.int64)
+                 for rows in self._repository.snapshot_batches(modified_since, self._batch_size)]
+        table = np.concatenate(parts) if parts else np.empty((0, len(self._COLUMNS)), dtype=np.int64)
+        table = table[np.argsort(table[:, 0], kind='stable')]
+        # Cada columna se copia a un arreglo propio para no retener la tabla completa en memoria
+        return {name: (np.ascontiguousarray(table[:, position]).view('datetime64[us]') if dtype == 'datetime64[us]'
+                       else table[:, position].astype(dtype))
+                for position, (name, dtype) in enumerate(self._COLUMNS)}
+
+    @staticmethod
+    def _upsert(columns: Dict[str, np.ndarray], changes: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        # Devuelve columnas nuevas: las órdenes ya presentes se reemplazan en una copia, las nuevas se agregan y se
+        # reordena por ID. Las columnas recibidas no se modifican
+        ids = columns['id']
+        positions = np.searchsorted(ids, changes['id'])
+        found = positions < len(ids)
+        found[found] = ids[positions[found]] == changes['id'][found]
+        updated = {}
+        for name, values in columns.items():
+            values = values.copy()
+            values[positions[found]] = changes[name][found]
+            updated[name] = values
+        if found.all():
+            return updated
+        new = ~found
+        merged = {name: np.concatenate([values, changes[name][new]]) for name, values in updated.items()}
+        order = np.argsort(merged['id'], kind='stable')
+        return {name: values[order] for name, values in merged.items()}
+
+    def _update_watermark(self, columns: Dict[str, np.ndarray]):
+        if len(columns['updated_at']):
+            latest = columns['updated_at'].max().astype('datetime64[us]').item().replace(tzinfo=timezone.utc)
+            if self._watermark is None or latest > self._watermark:
+                self._watermark = latest
+
+    @staticmethod
+    def _to_datetime64(moment: datetime) -> np.datetime64:
+        # NumPy no admite zonas horarias: se pasa a UTC sin zona (las fechas sin zona se toman como locales)
+        return np.datetime64(moment.astimezone(timezone.utc).replace(tzinfo=None), 'us')
@@ -0,0 +1,88 @@
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import AsyncIterator, Optional
+
+import psycopg
+from psycopg_pool import AsyncConnectionPool
+
+from enertech.src.AppLogger import AppLogger
+
+
+class AsyncDatabaseManager:
+    def __init__(self, db_config: dict, min_pool_size: int = 1, max_pool_size: int = 10,
+                 health_check_interval: float = 30.0, checkout_timeout: float = 30.0):
+        """
+        Variante asíncrona (asyncio) de DatabaseManager, basada en psycopg 3. Usa los mismos parámetros de
+        conexión; la creación de la base de datos y del esquema sigue a cargo de DatabaseManager.initialize().
+        :param db_config: Parámetros de conexión (host, port, user, password, dbname).
+        :param min_pool_size: Conexiones abiertas al inicializar (warm-up).
+        :param max_pool_size: Máximo de conexiones simultáneas.
+        :param health_check_interval: Segundos de inactividad tras los cuales se verifica una conexión antes de prestarla.
+        :param checkout_timeout: Segundos máximos de espera por una conexión libre.
+        """
+        self._db_config = db_config
+        self._health_check_interval = health_check_interval
+        self._last_used = {}  # id(conexión) -> instante en que se devolvió al pool
+        self._pool = AsyncConnectionPool(kwargs=db_config, min_size=min_pool_size, max_size=max_pool_size,
+                                         timeout=checkout_timeout, check=self._check_connection,
+                                         reset=self._mark_returned, open=False)
+        # conexión de la unidad de trabajo abierta en la tarea actual
+        self._uow_conn: ContextVar[Optional[psycopg.AsyncConnection]] = ContextVar(
+            f"async_uow_conn_{id(self)}", default=None)
+        self._log = AppLogger.setup_logger(AsyncDatabaseManager.__name__)
+
+    async def initialize(self):
+        """Abre el pool y espera a que estén listas las conexiones iniciales (warm-up)"""
+        await self._pool.open(wait=True)
+        self._log.info(f"Pool asíncrono abierto para {self._db_config.get('dbname')}.")
+
+    async def close(self):
+        """Cierra el pool de conexiones"""
+        await self._pool.close()
+        self._log.info("Pool asíncrono cerrado.")
+
+    @asynccontextmanager
+    async def connection(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        """
+        Presta una conexión del pool. Al salir del bloque confirma la transacción (commit), o la revierte
+        (rollback) si ocurrió una excepción, y devuelve la conexión al pool sin cerrarla.
+        Dentro de una unidad de trabajo (unit_of_work) devuelve la conexión de esa unidad y no hace commit.
+        Uso: ``async with db_manager.connection() as conn, conn.cursor() as cursor: ...``
+        """
+        bound_conn = self._uow_conn.get()
+        if bound_conn is not None:
+            yield bound_conn
+            return
+        async with self._pool.connection() as conn:
+            yield conn
+
+    @asynccontextmanager
+    async def unit_of_work(self) -> AsyncIterator[psycopg.AsyncConnection]:
+        """
+        Abre una unidad de trabajo: las llamadas a los repositorios dentro del bloque (en la misma tarea)
+        comparten una conexión y una única transacción. Las unidades anidadas se unen a la externa.
+        Uso: ``async with db_manager.unit_of_work(): ...``
+        """
+        bound_conn = self._uow_conn.get()
+        if bound_conn is not None:
+            yield bound_conn
+            return
+        async with self.connection() as conn:
+            token = self._uow_conn.set(conn)
+            try:
+                yield conn
+            finally:
+                self._uow_conn.reset(token)
+
+    async def _check_connection(self, conn: psycopg.AsyncConnection):
+        """Verifica con un SELECT 1 las conexiones que estuvieron inactivas más de health_check_interval"""
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self._health_check_interval:
+            return
+        self._last_used.pop(id(conn), None)
+        await AsyncConnectionPool.check_connection(conn)
+
+    async def _mark_returned(self, conn: psycopg.AsyncConnection):
+        """Registra el momento en que la conexión vuelve al pool"""
+        self._last_used[id(conn)] = time.monotonic()
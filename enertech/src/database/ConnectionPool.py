@@ -0,0 +1,118 @@
+import threading
+import time
+
+import psycopg2
+from psycopg2 import pool
+
+from enertech.src.AppLogger import AppLogger
+
+
+class ConnectionPool:
+    def __init__(self, db_config: dict, min_size: int = 1, max_size: int = 10,
+                 health_check_interval: float = 30.0, checkout_timeout: float = 30.0):
+        """
+        Pool de conexiones a PostgreSQL con verificación de salud al prestar una conexión.
+        :param db_config: Parámetros de conexión para psycopg2.connect.
+        :param min_size: Conexiones que se abren al iniciar el pool (warm-up) y que se mantienen abiertas.
+        :param max_size: Máximo de conexiones prestadas al mismo tiempo.
+        :param health_check_interval: Segundos de inactividad a partir de los cuales se verifica la conexión
+        con un ``SELECT 1`` antes de prestarla.
+        :param checkout_timeout: Segundos máximos de espera por una conexión libre.
+        """
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError("El tamaño del pool debe cumplir 0 <= min_size <= max_size y max_size >= 1")
+        self._db_config = db_config
+        self._min_size = min_size
+        self._max_size = max_size
+        self._health_check_interval = health_check_interval
+        self._checkout_timeout = checkout_timeout
+        self._pool = None  # se crea con open()
+        self._slots = threading.BoundedSemaphore(max_size)  # limita las conexiones prestadas a max_size
+        self._last_used = {}  # id(conexión) -> instante en que se devolvió al pool
+        self._lock = threading.Lock()
+        self._log = AppLogger.setup_logger(ConnectionPool.__name__)
+
+    @property
+    def is_open(self) -> bool:
+        return self._pool is not None
+
+    def open(self):
+        """Crea el pool abriendo min_size conexiones (warm-up). No hace nada si ya está abierto"""
+        with self._lock:
+            if self._pool is not None:
+                return
+            self._pool = pool.ThreadedConnectionPool(self._min_size, self._max_size, **self._db_config)
+            self._log.info(f"Pool de conexiones abierto para {self._db_config.get('dbname')} "
+                           f"(min={self._min_size}, max={self._max_size}).")
+
+    def close(self):
+        """Cierra todas las conexiones del pool"""
+        with self._lock:
+            if self._pool is None:
+                return
+            self._pool.closeall()
+            self._pool = None
+            self._last_used.clear()
+            self._log.info("Pool de conexiones cerrado.")
+
+    def acquire(self) -> psycopg2.extensions.connection:
+        """
+        Presta una conexión sana del pool, esperando como máximo checkout_timeout segundos.
+        :return: Conexión lista para usar. Debe devolverse con release().
+        :raises PoolError: Si no se libera ninguna conexión a tiempo.
+        """
+        if self._pool is None:
+            self.open()
+        if not self._slots.acquire(timeout=self._checkout_timeout):
+            raise pool.PoolError(f"No hay conexiones disponibles luego de esperar {self._checkout_timeout}s")
+        try:
+            return self._checkout_healthy()
+        except Exception:
+            self._slots.release()
+            raise
+
+    def release(self, conn: psycopg2.extensions.connection, discard: bool = False):
+        """
+        Devuelve una conexión al pool. Las conexiones cerradas o marcadas con discard se descartan.
+        :param conn: Conexión obtenida con acquire().
+        :param discard: True para cerrar la conexión en lugar de reutilizarla.
+        """
+        try:
+            if self._pool is None:  # el pool se cerró mientras la conexión estaba prestada
+                conn.close()
+            elif discard or conn.closed:
+                self._discard(conn)
+            else:
+                self._last_used[id(conn)] = time.monotonic()
+                self._pool.putconn(conn)
+        finally:
+            self._slots.release()
+
+    def _checkout_healthy(self) -> psycopg2.extensions.connection:
+        """Obtiene conexiones del pool hasta encontrar una sana, descartando las caídas"""
+        for _ in range(self._max_size + 1):
+            conn = self._pool.getconn()
+            if self._is_healthy(conn):
+                return conn
+            self._log.warning("Se descartó una conexión inválida del pool.")
+            self._discard(conn)
+        raise psycopg2.OperationalError("No se pudo obtener una conexión válida del pool")
+
+    def _is_healthy(self, conn: psycopg2.extensions.connection) -> bool:
+        """Verifica la conexión con un SELECT 1 solo si estuvo inactiva más de health_check_interval"""
+        if conn.closed:
+            return False
+        last_used = self._last_used.get(id(conn))
+        if last_used is not None and time.monotonic() - last_used < self._health_check_interval:
+            return True
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except psycopg2.Error:
+            return False
+
+    def _discard(self, conn: psycopg2.extensions.connection):
+        self._last_used.pop(id(conn), None)
+        self._pool.putconn(conn, close=True)
@@ -1,87 +1,217 @@
-import os
+import itertools
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Callable, Iterator, List, Optional, Tuple
+
 import psycopg2
-from psycopg2 import DatabaseError
 
 from enertech.src.AppLogger import AppLogger
+from enertech.src.database.ConnectionPool import ConnectionPool
+from enertech.src.database.InstrumentedCursor import InstrumentedCursor
+from enertech.src.database.MigrationError import MigrationError
+from enertech.src.database.MigrationRunner import MigrationRunner
+from enertech.src.database.QueryStats import QueryStats
+from enertech.src.database.Replica import Replica
 
 
 class DatabaseManager:
-    def __init__(self, db_config: dict):
+    def __init__(self, db_config: dict, min_pool_size: int = 1, max_pool_size: int = 10,
+                 health_check_interval: float = 30.0, checkout_timeout: float = 30.0,
+                 replica_configs: Optional[List[dict]] = None, max_replica_lag: float = 5.0,
+                 read_your_writes_window: float = 5.0, instrument_queries: bool = True,
+                 slow_query_threshold: float = 0.5):
+        """
+        Gestor de la base de datos. Las consultas de los repositorios usan conexiones prestadas por un pool.
+        Es seguro compartirlo entre hilos y tareas asyncio: cada llamada a connection() usa su propia
+        conexión y la unidad de trabajo abierta se guarda por hilo/tarea, nunca en estado compartido.
+        :param db_config: Parámetros de conexión para psycopg2.connect.
+        :param min_pool_size: Conexiones abiertas al inicializar (warm-up).
+        :param max_pool_size: Máximo de conexiones simultáneas.
+        :param health_check_interval: Segundos de inactividad tras los cuales se verifica una conexión antes de prestarla.
+        :param checkout_timeout: Segundos máximos de espera por una conexión libre.
+        :param replica_configs: Parámetros de conexión de las réplicas de lectura (streaming replication).
+        Conviene incluir connect_timeout para no esperar a una réplica caída.
+        :param max_replica_lag: Retraso máximo (segundos) de una réplica para leer de ella; si lo supera se lee del primario.
+        :param read_your_writes_window: Segundos después de una escritura durante los que las lecturas del mismo
+        hilo o tarea van al primario, para que vean lo que se acaba de escribir.
+        :param instrument_queries: True para medir cada consulta (ver query_stats y dump_query_stats).
+        :param slow_query_threshold: Segundos a partir de los cuales una consulta va al log de consultas lentas.
+        """
         self._db_config = db_config
-        self._conn = None  # se establece con initialize()
+        self._query_stats = QueryStats(slow_query_threshold) if instrument_queries else None
+        self._pool = ConnectionPool(self._pool_config(db_config), min_size=min_pool_size, max_size=max_pool_size,
+                                    health_check_interval=health_check_interval,
+                                    checkout_timeout=checkout_timeout)
+        self._replicas = [Replica(config, ConnectionPool(self._pool_config(config), min_size=min_pool_size, max_size=max_pool_size,
+                                                         health_check_interval=health_check_interval,
+                                                         checkout_timeout=checkout_timeout))
+                          for config in replica_configs or []]
+        self._next_replica = itertools.count()
+        self._max_replica_lag = max_replica_lag
+        self._read_your_writes_window = read_your_writes_window
+        # momento de la última escritura confirmada y forzado de primario, por hilo o tarea
+        self._last_write_at: ContextVar[float] = ContextVar(f"last_write_at_{id(self)}", default=float('-inf'))
+        self._force_primary: ContextVar[bool] = ContextVar(f"force_primary_{id(self)}", default=False)
+        # conexión de la unidad de trabajo abierta en el hilo o tarea actual
+        self._uow_conn: ContextVar[Optional[psycopg2.extensions.connection]] = ContextVar(
+            f"uow_conn_{id(self)}", default=None)
+        # funciones a ejecutar al terminar la unidad de trabajo abierta, con True si solo van tras un commit
+        # (ver after_transaction y after_commit)
+        self._uow_callbacks: ContextVar[Optional[List[Tuple[Callable[[], None], bool]]]] = ContextVar(
+            f"uow_callbacks_{id(self)}", default=None)
         self._log = AppLogger.setup_logger(DatabaseManager.__name__)
 
-    def _establish_connection(self):
-        """Establece la conexión a la base de datos usando la conexion global"""
+    @contextmanager
+    def connection(self, readonly: bool = False) -> Iterator[psycopg2.extensions.connection]:
+        """
+        Presta una conexión del pool. Al salir del bloque confirma la transacción (commit), o la revierte
+        (rollback) si ocurrió una excepción, y devuelve la conexión al pool sin cerrarla.
+        Uso: ``with db_manager.connection() as conn, conn.cursor() as cursor: ...``
+        Dentro de una unidad de trabajo (unit_of_work) devuelve la conexión de esa unidad y no hace commit:
+        la transacción se confirma una sola vez al cerrar la unidad de trabajo.
+        :param readonly: True si el bloque solo lee; se atiende con una réplica si hay alguna disponible, con
+        retraso aceptable, y no hubo escrituras recientes en este hilo o tarea (ni se pidió use_primary()).
+        """
+        bound_conn = self._uow_conn.get()
+        if bound_conn is not None:
+            yield bound_conn
+            return
+        connection_pool, conn = self._acquire(readonly)
         try:
-            self._conn = psycopg2.connect(**self._db_config)
-            self._log.info(f"Conexión establecida a la base de datos {self._db_config['dbname']}.")
-        except psycopg2.OperationalError as e:
-            self._log.error(f"Error al conectar a la base de datos: {e}", exc_info=True)
-            raise
-        except Exception as e:
-            self._log.exception(f"Error inesperado al establecer conexión: {e}", exc_info=True)
+            yield conn
+            conn.commit()
+        except BaseException:
+            self._rollback_quietly(conn)
             raise
+        finally:
+            connection_pool.release(conn)
+        if not readonly:
+            self._last_write_at.set(time.monotonic())
 
-    def get_connection(self) -> psycopg2.extensions.connection:
-        """Devuelve la conexión a la base de datos, estableciéndola si no está activa"""
-        if self._conn is None or self._conn.closed:
-            self._establish_connection()
-        return self._conn
-
-    def commit_transaction(self):
+    @contextmanager
+    def unit_of_work(self) -> Iterator[psycopg2.extensions.connection]:
         """
-        Realiza un commit de la transacción actual en la conexión activa.
-        Si falla, hace rollback y muestra el error.
+        Abre una unidad de trabajo: todas las llamadas a los repositorios dentro del bloque (en el mismo hilo o tarea)
+        comparten una conexión y una única transacción, que se confirma al salir o se revierte completa si
+        ocurre una excepción. Las unidades anidadas se unen a la transacción de la unidad externa.
+        Uso: ``with db_manager.unit_of_work(): ...``
         """
+        bound_conn = self._uow_conn.get()
+        if bound_conn is not None:
+            yield bound_conn
+            return
+        callbacks = []
+        callbacks_token = self._uow_callbacks.set(callbacks)
+        committed = False
         try:
-            self._conn.commit()  # Confirmar todos los cambios pendientes
-            self._log.debug("Commit realizado correctamente.")
-        except DatabaseError as e:
-            self._log.exception(f"Error al hacer commit: {e}", exc_info=True)
-            self._conn.rollback()  # Revertir cambios en caso de error
-
-    def close_connection(self):
-        """Cierra la conexión a la base de datos"""
-        if self._conn is not None:
-            self._conn.close()
-            self._log.info("Conexión a la base de datos cerrada.")
+            with self.connection() as conn:
+                token = self._uow_conn.set(conn)
+                try:
+                    yield conn
+                finally:
+                    self._uow_conn.reset(token)
+            committed = True
+        finally:
+            self._uow_callbacks.reset(callbacks_token)
+            for callback, commit_only in callbacks:
+                if committed or not commit_only:
+                    callback()
+
+    def after_transaction(self, callback: Callable[[], None]):
+        """
+        Ejecuta callback cuando termina la transacción actual, se haya confirmado o revertido: al cerrar la unidad
+        de trabajo abierta en este hilo o tarea, o en el momento si no hay ninguna (cada connection() ya confirmó).
+        Sirve, por ejemplo, para invalidar cachés de modo que no conserven datos de una transacción revertida.
+        """
+        self._defer(callback, commit_only=False)
+
+    def after_commit(self, callback: Callable[[], None]):
+        """
+        Como after_transaction, pero callback solo se ejecuta si la transacción se confirmó. Sirve para reflejar en
+        estructuras en memoria cambios que no deben aplicarse si la unidad de trabajo se revierte.
+        """
+        self._defer(callback, commit_only=True)
+
+    def _defer(self, callback: Callable[[], None], commit_only: bool):
+        callbacks = self._uow_callbacks.get()
+        if callbacks is None:
+            callback()
         else:
-            self._log.info("No hay conexión activa para cerrar.")
+            callbacks.append((callback, commit_only))
 
-    def _read_sql_file(self, file_path) -> str:
-        """Lee el contenido de un archivo SQL y devuelve su contenido como una cadena"""
+    @contextmanager
+    def use_primary(self) -> Iterator[None]:
+        """
+        Fuerza que las lecturas del bloque (en el mismo hilo o tarea) se hagan en el primario.
+        Uso: ``with db_manager.use_primary(): repository.get_by_id(...)``
+        """
+        token = self._force_primary.set(True)
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                return file.read()
-        except IOError as e:
-            self._log.exception(f"Error al leer el archivo {file_path}: {e}")
-            raise
+            yield
+        finally:
+            self._force_primary.reset(token)
+
+    @property
+    def query_stats(self) -> Optional[QueryStats]:
+        """Estadísticas de las consultas ejecutadas, o None si se creó con instrument_queries=False"""
+        return self._query_stats
+
+    def dump_query_stats(self, sort_by: str = 'total_ms', limit: int = 20) -> str:
+        """
+        Registra en el log y devuelve el reporte de las consultas que más tiempo consumen.
+        :param sort_by: Campo de orden: total_ms, count, avg_ms, max_ms, rows.
+        :param limit: Cantidad de consultas del reporte.
+        """
+        if self._query_stats is None:
+            return ""
+        report = self._query_stats.report(sort_by, limit)
+        self._log.info(f"Estadísticas de consultas:\n{report}")
+        return report
+
+    def _pool_config(self, db_config: dict) -> dict:
+        # Las conexiones de los pools usan el cursor instrumentado; las temporales (creación de la base y
+        # migraciones) no se miden
+        if self._query_stats is None:
+            return db_config
+        return {**db_config, 'cursor_factory': InstrumentedCursor.bind(self._query_stats)}
 
-    def _execute_sql_commands(self, sql_commands):
-        """Ejecuta comandos SQL"""
+    def _acquire(self, readonly: bool) -> Tuple[ConnectionPool, psycopg2.extensions.connection]:
+        """Elige el servidor de la consulta: una réplica (en turnos) para las lecturas, si corresponde, o el primario"""
+        if self._query_stats is None:
+            return self._acquire_from_pools(readonly)
+        started = time.perf_counter()
         try:
-            # Dividir los comandos eliminando espacios y líneas vacías
-            commands = [cmd.strip() for cmd in sql_commands.split(';') if cmd.strip()]
-            with self._conn.cursor() as cursor:
-                for command in commands:
-                    if command:
-                        try:
-                            # muestra los primeros 100 caracteres
-                            self._log.debug(f"Ejecutando comando: {command[:100]}...")
-                            cursor.execute(command)
-                            self._log.debug("Comando SQL ejecutado exitosamente.")
-                        except psycopg2.Error as e:
-                            self._conn.rollback()
-                            self._log.error(f"Error al ejecutar comando SQL: {command[:100]}...")
-                            self._log.exception(f"Detalle del error: {e}", exc_info=True)
-                            raise
-
-                self._conn.commit()
-                self._log.debug("Todos los comandos SQL se ejecutaron correctamente.")
-        except Exception as e:
-            self._log.exception(f"Error inesperado: {e}", exc_info=True)
-            raise
+            return self._acquire_from_pools(readonly)
+        finally:
+            self._query_stats.record_wait(time.perf_counter() - started)
+
+    def _acquire_from_pools(self, readonly: bool) -> Tuple[ConnectionPool, psycopg2.extensions.connection]:
+        if readonly and self._replicas and not self._primary_required():
+            start = next(self._next_replica)
+            for offset in range(len(self._replicas)):
+                replica = self._replicas[(start + offset) % len(self._replicas)]
+                conn = replica.try_acquire(self._max_replica_lag)
+                if conn is not None:
+                    return replica.pool, conn
+        return self._pool, self._pool.acquire()
+
+    def _primary_required(self) -> bool:
+        return (self._force_primary.get()
+                or time.monotonic() - self._last_write_at.get() < self._read_your_writes_window)
+
+    def _rollback_quietly(self, conn: psycopg2.extensions.connection):
+        """Revierte la transacción sin ocultar la excepción original si el rollback también falla"""
+        try:
+            conn.rollback()
+        except psycopg2.Error as e:
+            self._log.error(f"Error al hacer rollback: {e}", exc_info=True)
+
+    def close(self):
+        """Cierra los pools de conexiones del primario y de las réplicas"""
+        self._pool.close()
+        for replica in self._replicas:
+            replica.close()
 
     def _database_exists(self) -> bool:
         """Verifica si la DB existe (usa conexión temporal con autocommit)"""
@@ -116,39 +246,23 @@ class DatabaseManager:
         finally:
             temp_conn.close()
 
-    def _create_schema(self):
-        """Crea las tablas e índices (usa transacciones explícitas)"""
-        try:
-            # obtener la ruta del archivo create_tables.sql
-            create_tables_file = os.path.join(os.path.dirname(__file__), 'create_tables.sql')
-            if os.path.exists(create_tables_file):  # verificar si el archivo existe
-                sql_commands = self._read_sql_file(create_tables_file)  # Leer el contenido del archivo
-                self._execute_sql_commands(sql_commands)  # Ejecutar los comandos SQL extraídos del archivo
-                self._log.info("tablas creadas exitosamente.")
-
-            # obtener la ruta del archivo create_indexes.sql
-            create_indexes_file = os.path.join(os.path.dirname(__file__), 'create_indexes.sql')
-            if os.path.exists(create_indexes_file):  # verificar si el archivo existe
-                sql_commands = self._read_sql_file(create_indexes_file)  # Leer el contenido del archivo
-                self._execute_sql_commands(sql_commands)  # Ejecutar los comandos SQL extraídos del archivo
-                self._log.info("índices creadas exitosamente.")
-        except IOError as e:
-            self._log.exception(f"Error al leer el archivo: {e}", exc_info=True)
-            raise
-
     def initialize(self):
+        """Crea la base de datos si no existe, aplica las migraciones pendientes y abre el pool"""
         try:
             if not self._database_exists():
                 self._create_database()  # Crear la base de datos (usa conexión temporal)
-                self._establish_connection()  # Establecer conexión después de crear la base de datos
-                self._create_schema() # crea las tablas y los índices
-                self._log.info(f"Base de datos {self._db_config['dbname']} inicializada correctamente.")
-                self.close_connection() # cierra la conexión
             else:
                 self._log.info(f"La base de datos {self._db_config['dbname']} ya existe.")
+            MigrationRunner(self._db_config).migrate()  # crea o actualiza las tablas y los índices
+            self._pool.open()  # abre las conexiones iniciales del pool (warm-up)
+            for replica in self._replicas:
+                replica.open()
+            self._log.info(f"Base de datos {self._db_config['dbname']} inicializada correctamente.")
         except psycopg2.OperationalError as e:
             self._log.critical(f"Error de conexión: {e}", exc_info=True)
         except psycopg2.Error as e:
             self._log.error(f"Error de PostgresSQL: {e}", exc_info=True)
+        except MigrationError as e:
+            self._log.critical(f"Error al migrar el esquema: {e}", exc_info=True)
         except Exception as e:
             self._log.exception(f"Error inesperado: {e}")
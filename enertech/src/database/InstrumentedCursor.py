@@ -0,0 +1,40 @@
+import time
+
+import psycopg2.extensions
+
+from enertech.src.database.QueryStats import QueryStats
+
+
+class InstrumentedCursor(psycopg2.extensions.cursor):
+    """
+    Cursor de psycopg2 que mide cada execute/executemany/copy_expert y lo registra en un QueryStats.
+    Se usa como cursor_factory de las conexiones del pool; cada DatabaseManager crea su subclase con bind().
+    En los cursores del servidor (con nombre) se mide la apertura del cursor, no la lectura de las filas.
+    """
+    _stats: QueryStats = None
+
+    @staticmethod
+    def bind(stats: QueryStats) -> type:
+        """Devuelve una subclase que registra en stats"""
+        return type('InstrumentedCursor', (InstrumentedCursor,), {'_stats': stats})
+
+    def execute(self, query, vars=None):
+        started = time.perf_counter()
+        try:
+            return super().execute(query, vars)
+        finally:
+            self._stats.record_query(query, vars, time.perf_counter() - started, max(self.rowcount, 0))
+
+    def executemany(self, query, vars_list):
+        started = time.perf_counter()
+        try:
+            return super().executemany(query, vars_list)
+        finally:
+            self._stats.record_query(query, None, time.perf_counter() - started, max(self.rowcount, 0))
+
+    def copy_expert(self, sql, file, size=8192):
+        started = time.perf_counter()
+        try:
+            return super().copy_expert(sql, file, size)
+        finally:
+            self._stats.record_query(sql, None, time.perf_counter() - started, max(self.rowcount, 0))
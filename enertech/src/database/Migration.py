@@ -0,0 +1,122 @@
+import hashlib
+import os
+import re
+from typing import Optional
+
+from enertech.src.database.MigrationError import MigrationError
+
+
+class Migration:
+    """
+    Migración de esquema leída de un archivo NNNN_descripcion.sql.
+    Si la primera línea es '-- migrate: no-transaction' la migración se ejecuta fuera de una transacción,
+    sentencia por sentencia (necesario para CREATE INDEX CONCURRENTLY).
+    """
+    _FILE_NAME = re.compile(r'^(\d{4})_([a-z0-9_]+)\.sql$')
+    NO_TRANSACTION_MARKER = '-- migrate: no-transaction'
+
+    def __init__(self, version: int, name: str, sql: str):
+        self._version = version
+        self._name = name
+        self._sql = sql
+        self._checksum = hashlib.sha256(sql.encode('utf-8')).hexdigest()
+        self._transactional = not sql.lstrip().startswith(Migration.NO_TRANSACTION_MARKER)
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def sql(self) -> str:
+        return self._sql
+
+    @property
+    def checksum(self) -> str:
+        return self._checksum
+
+    @property
+    def transactional(self) -> bool:
+        return self._transactional
+
+    def __str__(self):
+        return f"{self._version:04d}_{self._name}"
+
+    @staticmethod
+    def from_file(path: str) -> Optional['Migration']:
+        """
+        Lee una migración de un archivo.
+        :param path: Ruta del archivo.
+        :return: Migration, o None si el nombre del archivo no sigue el formato NNNN_descripcion.sql.
+        """
+        match = Migration._FILE_NAME.match(os.path.basename(path))
+        if not match:
+            return None
+        try:
+            with open(path, 'r', encoding='utf-8') as file:
+                sql = file.read()
+        except IOError as e:
+            raise MigrationError(f"No se pudo leer la migración {path}: {e}") from e
+        return Migration(int(match.group(1)), match.group(2), sql)
+
+    def statements(self) -> list[str]:
+        """
+        Divide el SQL en sentencias. Respeta los ';' dentro de cadenas, identificadores entre comillas,
+        comentarios y bloques $tag$...$tag$. Solo se usa en las migraciones sin transacción, las demás se
+        envían completas en un único viaje al servidor.
+        """
+        statements = []
+        current = []
+        sql = self._sql
+        i = 0
+        while i < len(sql):
+            char = sql[i]
+            if sql.startswith('--', i):
+                end = sql.find('\n', i)
+                end = len(sql) if end == -1 else end
+                current.append(sql[i:end])
+                i = end
+                continue
+            if sql.startswith('/*', i):
+                end = sql.find('*/', i + 2)
+                end = len(sql) if end == -1 else end + 2
+                current.append(sql[i:end])
+                i = end
+                continue
+            if char in ("'", '"'):
+                end = i + 1
+                while end < len(sql):
+                    if sql[end] == char:
+                        if sql.startswith(char * 2, end):  # comilla escapada duplicándola
+                            end += 2
+                            continue
+                        break
+                    end += 1
+                current.append(sql[i:end + 1])
+                i = end + 1
+                continue
+            dollar_tag = re.match(r'\$[A-Za-z_]*\$', sql[i:]) if char == '$' else None
+            if dollar_tag:
+                tag = dollar_tag.group(0)
+                end = sql.find(tag, i + len(tag))
+                end = len(sql) if end == -1 else end + len(tag)
+                current.append(sql[i:end])
+                i = end
+                continue
+            if char == ';':
+                statements.append(''.join(current))
+                current = []
+            else:
+                current.append(char)
+            i += 1
+        statements.append(''.join(current))
+        return [statement.strip() for statement in statements if Migration._has_code(statement)]
+
+    @staticmethod
+    def _has_code(statement: str) -> bool:
+        # Una sentencia formada solo por comentarios no se envía
+        without_comments = re.sub(r'--[^\n]*|/\*.*?\*/', '', statement, flags=re.S)
+        return bool(without_comments.strip())
@@ -0,0 +1,3 @@
+class MigrationError(Exception):
+    """Error de la ejecución de migraciones: archivo inválido, checksum modificado o falla de un paso"""
+    pass
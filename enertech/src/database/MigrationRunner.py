@@ -0,0 +1,203 @@
+import argparse
+import os
+import sys
+import time
+from typing import List, Optional, Tuple
+
+import psycopg2
+
+from enertech.src.AppLogger import AppLogger
+from enertech.src.database.Migration import Migration
+from enertech.src.database.MigrationError import MigrationError
+
+
+class MigrationRunner:
+    """
+    Aplica las migraciones de esquema (database/migrations/NNNN_descripcion.sql) que falten en la base de datos,
+    en orden de versión, registrando cada una en la tabla schema_migrations con su checksum.
+    Una migración ya aplicada no se puede modificar: si su checksum cambió, migrate() falla sin aplicar nada.
+    """
+    _MIGRATIONS_DIR = os.path.join(os.path.dirname(__file__), 'migrations')
+    # Clave del advisory lock que evita que dos procesos migren la misma base a la vez
+    _LOCK_KEY = 4_210_812
+
+    def __init__(self, db_config: dict, migrations_dir: Optional[str] = None):
+        """
+        :param db_config: Parámetros de conexión para psycopg2.connect. La base de datos debe existir.
+        :param migrations_dir: Carpeta con los archivos de migración; por defecto database/migrations.
+        """
+        self._db_config = db_config
+        self._migrations_dir = migrations_dir or MigrationRunner._MIGRATIONS_DIR
+        self._log = AppLogger.setup_logger(MigrationRunner.__name__)
+
+    def load_migrations(self) -> List[Migration]:
+        """Lee los archivos de migración ordenados por versión"""
+        migrations = []
+        for file_name in sorted(os.listdir(self._migrations_dir)):
+            migration = Migration.from_file(os.path.join(self._migrations_dir, file_name))
+            if migration is not None:
+                migrations.append(migration)
+        versions = [migration.version for migration in migrations]
+        duplicated = sorted({version for version in versions if versions.count(version) > 1})
+        if duplicated:
+            raise MigrationError(f"Versiones de migración repetidas: {duplicated}")
+        return migrations
+
+    def status(self) -> List[Tuple[Migration, Optional[str]]]:
+        """
+        Estado de cada migración.
+        :return: Lista de (migración, estado) donde estado es 'applied', 'modified' (aplicada pero con otro
+        checksum) o None si está pendiente.
+        """
+        migrations = self.load_migrations()
+        conn = self._connect()
+        try:
+            applied = self._applied_checksums(conn)
+        finally:
+            conn.close()
+        result = []
+        for migration in migrations:
+            checksum = applied.get(migration.version)
+            if checksum is None:
+                result.append((migration, None))
+            else:
+                result.append((migration, 'applied' if checksum == migration.checksum else 'modified'))
+        return result
+
+    def migrate(self, target: Optional[int] = None) -> List[Migration]:
+        """
+        Aplica las migraciones pendientes hasta la versión target (inclusive), o todas si target es None.
+        Las migraciones transaccionales se aplican junto con su registro en schema_migrations en una única
+        transacción. Las marcadas como no-transaction se ejecutan sentencia por sentencia en autocommit y se
+        registran al terminar; si fallan a mitad de camino se vuelven a ejecutar completas en el próximo
+        migrate(), por lo que sus sentencias deben ser idempotentes (IF NOT EXISTS).
+        :param target: Última versión a aplicar.
+        :return: Migraciones aplicadas.
+        """
+        migrations = self.load_migrations()
+        conn = self._connect()
+        applied_now = []
+        try:
+            with conn.cursor() as cursor:
+                cursor.execute("SELECT pg_advisory_lock(%s)", (MigrationRunner._LOCK_KEY,))
+            try:
+                self._ensure_migrations_table(conn)
+                applied = self._applied_checksums(conn)
+                self._verify_checksums(migrations, applied)
+                for migration in migrations:
+                    if migration.version in applied or (target is not None and migration.version > target):
+                        continue
+                    self._apply(conn, migration)
+                    applied_now.append(migration)
+            finally:
+                with conn.cursor() as cursor:
+                    cursor.execute("SELECT pg_advisory_unlock(%s)", (MigrationRunner._LOCK_KEY,))
+        finally:
+            conn.close()
+        if applied_now:
+            self._log.info(f"Migraciones aplicadas: {', '.join(str(migration) for migration in applied_now)}")
+        else:
+            self._log.info("El esquema está actualizado.")
+        return applied_now
+
+    def _apply(self, conn: psycopg2.extensions.connection, migration: Migration):
+        """Aplica una migración y la registra en schema_migrations"""
+        self._log.info(f"Aplicando migración {migration}...")
+        started = time.monotonic()
+        try:
+            if migration.transactional:
+                conn.autocommit = False
+                try:
+                    with conn.cursor() as cursor:
+                        cursor.execute(migration.sql)
+                        self._record(cursor, migration, started)
+                    conn.commit()
+                except BaseException:
+                    conn.rollback()
+                    raise
+                finally:
+                    conn.autocommit = True
+            else:
+                with conn.cursor() as cursor:
+                    for statement in migration.statements():
+                        self._log.debug(f"Ejecutando: {statement[:100]}...")
+                        cursor.execute(statement)
+                    self._record(cursor, migration, started)
+        except psycopg2.Error as e:
+            hint = "" if migration.transactional else (
+                " Si quedó un índice inválido (pg_index.indisvalid = false) hay que eliminarlo antes de reintentar, "
+                "porque IF NOT EXISTS lo daría por creado.")
+            raise MigrationError(f"Falló la migración {migration}: {e}.{hint}") from e
+
+    @staticmethod
+    def _record(cursor: psycopg2.extensions.cursor, migration: Migration, started: float):
+        cursor.execute("INSERT INTO schema_migrations (version, name, checksum, execution_ms) VALUES (%s, %s, %s, %s)",
+                       (migration.version, migration.name, migration.checksum,
+                        int((time.monotonic() - started) * 1000)))
+
+    @staticmethod
+    def _verify_checksums(migrations: List[Migration], applied: dict):
+        modified = [str(migration) for migration in migrations
+                    if migration.version in applied and applied[migration.version] != migration.checksum]
+        if modified:
+            raise MigrationError(f"Migraciones ya aplicadas fueron modificadas: {', '.join(modified)}. "
+                                 f"Los cambios de esquema deben ir en una migración nueva.")
+
+    @staticmethod
+    def _ensure_migrations_table(conn: psycopg2.extensions.connection):
+        with conn.cursor() as cursor:
+            cursor.execute("""
+                           CREATE TABLE IF NOT EXISTS schema_migrations
+                           (
+                               version      INTEGER PRIMARY KEY,
+                               name         VARCHAR(255)             NOT NULL,
+                               checksum     CHAR(64)                 NOT NULL,
+                               applied_at   TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP,
+                               execution_ms INTEGER                  NOT NULL
+                           )
+                           """)
+
+    @staticmethod
+    def _applied_checksums(conn: psycopg2.extensions.connection) -> dict:
+        with conn.cursor() as cursor:
+            cursor.execute("SELECT to_regclass('schema_migrations') IS NOT NULL")
+            if not cursor.fetchone()[0]:
+                return {}
+            cursor.execute("SELECT version, checksum FROM schema_migrations")
+            return dict(cursor.fetchall())
+
+    def _connect(self) -> psycopg2.extensions.connection:
+        # Conexión propia (fuera del pool) en autocommit: CREATE INDEX CONCURRENTLY no admite transacciones
+        conn = psycopg2.connect(**self._db_config)
+        conn.autocommit = True
+        return conn
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada: python -m enertech.src.database.MigrationRunner [status|migrate] [--target N]"""
+    parser = argparse.ArgumentParser(description="Migraciones del esquema de la base de datos de EnerTech")
+    parser.add_argument('command', choices=['status', 'migrate'], nargs='?', default='migrate')
+    parser.add_argument('--target', type=int, help="Última versión a aplicar (por defecto, todas)")
+    parser.add_argument('--host', default=os.environ.get('PGHOST', 'localhost'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PGPORT', 5432)))
+    parser.add_argument('--user', default=os.environ.get('PGUSER', 'postgres'))
+    parser.add_argument('--dbname', default=os.environ.get('PGDATABASE', 'enertech_db'))
+    args = parser.parse_args(argv)
+    # La contraseña se toma de PGPASSWORD o ~/.pgpass, para no dejarla en el historial de comandos
+    db_config = {'host': args.host, 'port': args.port, 'user': args.user, 'dbname': args.dbname}
+    runner = MigrationRunner(db_config)
+    try:
+        if args.command == 'status':
+            for migration, state in runner.status():
+                print(f"{str(migration):<45} {state or 'pending'}")
+        else:
+            applied = runner.migrate(args.target)
+            print(f"{len(applied)} migraciones aplicadas.")
+    except (MigrationError, psycopg2.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,191 @@
+import bisect
+import re
+import sys
+import threading
+from collections import Counter
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+
+from enertech.src.AppLogger import AppLogger
+
+
+class QueryStats:
+    """
+    Estadísticas de las consultas ejecutadas por un DatabaseManager: por cada sentencia normalizada (literales
+    reemplazados por ?) cuenta ejecuciones, tiempo total y máximo, filas y un histograma de latencias, además del
+    método de repositorio que la originó. También acumula la espera por conexiones libres del pool.
+    Las consultas que superan slow_query_threshold se registran en el log de consultas lentas, sin los valores
+    de los parámetros (solo su tipo y tamaño).
+    """
+    # Límites superiores (ms) de los intervalos del histograma; el último intervalo no tiene límite
+    BUCKETS_MS = (1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000)
+    _PACKAGE = 'enertech.src.'
+    # Módulos que solo arman o ejecutan SQL por cuenta de otro; el origen es quien los llamó
+    _HELPER_MODULES = ('database.InstrumentedCursor', 'database.QueryStats', 'repository.Criteria',
+                       'repository.BulkCopy', 'repository.Projection')
+
+    def __init__(self, slow_query_threshold: float = 0.5):
+        """
+        :param slow_query_threshold: Segundos a partir de los cuales una consulta se considera lenta.
+        """
+        self._slow_query_threshold = slow_query_threshold
+        self._lock = threading.Lock()
+        self._queries: Dict[str, dict] = {}
+        self._wait = QueryStats._new_entry()
+        self._slow_log = AppLogger.setup_logger('SlowQueryLog')
+
+    @property
+    def slow_query_threshold(self) -> float:
+        return self._slow_query_threshold
+
+    def record_query(self, sql: Any, params: Any, duration: float, rows: int):
+        """
+        Registra una ejecución.
+        :param sql: Sentencia tal como se envió al cursor (con marcadores %s).
+        :param params: Parámetros de la sentencia (solo se usan, redactados, en el log de consultas lentas).
+        :param duration: Duración en segundos.
+        :param rows: Filas devueltas o afectadas.
+        """
+        # execute_values y mogrify entregan la sentencia ya armada como bytes
+        statement = QueryStats.normalize(sql.decode() if isinstance(sql, bytes) else str(sql))
+        source = QueryStats._caller()
+        with self._lock:
+            entry = self._queries.get(statement)
+            if entry is None:
+                entry = self._queries[statement] = QueryStats._new_entry()
+                entry['sources'] = Counter()
+            QueryStats._add(entry, duration)
+            entry['rows'] += rows
+            entry['sources'][source] += 1
+        if duration >= self._slow_query_threshold:
+            self._slow_log.warning(f"Consulta lenta ({duration * 1000:.1f} ms, {rows} filas, {source}): "
+                                   f"{statement} -- parámetros: {QueryStats.redact(params)}")
+
+    def record_wait(self, duration: float):
+        """Registra el tiempo de espera (segundos) por una conexión del pool"""
+        with self._lock:
+            QueryStats._add(self._wait, duration)
+
+    def snapshot(self, sort_by: str = 'total_ms', limit: Optional[int] = None) -> dict:
+        """
+        Copia de las estadísticas acumuladas.
+        :param sort_by: Campo por el que se ordenan las consultas (de mayor a menor): total_ms, count, max_ms, rows...
+        :param limit: Cantidad máxima de consultas a devolver.
+        :return: {'queries': [...], 'connection_wait': {...}, 'buckets_ms': [...]}; los percentiles son el límite
+        superior del intervalo del histograma que los contiene.
+        """
+        with self._lock:
+            queries = [{'statement': statement, **QueryStats._summary(entry),
+                        'rows': entry['rows'], 'sources': dict(entry['sources'])}
+                       for statement, entry in self._queries.items()]
+            connection_wait = QueryStats._summary(self._wait)
+        queries.sort(key=lambda query: query[sort_by], reverse=True)
+        return {'queries': queries[:limit] if limit else queries, 'connection_wait': connection_wait,
+                'buckets_ms': list(QueryStats.BUCKETS_MS)}
+
+    def report(self, sort_by: str = 'total_ms', limit: int = 20) -> str:
+        """Tabla de texto con las consultas que más tiempo consumen, para logs o consola"""
+        stats = self.snapshot(sort_by, limit)
+        lines = [f"{'total ms':>10} {'count':>8} {'avg ms':>8} {'p95 ms':>8} {'max ms':>9} {'rows':>10}  origen / consulta"]
+        for query in stats['queries']:
+            top_source = max(query['sources'], key=query['sources'].get)
+            lines.append(f"{query['total_ms']:>10.1f} {query['count']:>8} {query['avg_ms']:>8.2f} "
+                         f"{QueryStats._format_bound(query['p95_ms']):>8} {query['max_ms']:>9.1f} {query['rows']:>10}  "
+                         f"{top_source}: {query['statement'][:120]}")
+        wait = stats['connection_wait']
+        lines.append(f"Espera por conexiones: {wait['count']} préstamos, {wait['total_ms']:.1f} ms en total, "
+                     f"máximo {wait['max_ms']:.1f} ms")
+        return '\n'.join(lines)
+
+    def reset(self):
+        """Descarta las estadísticas acumuladas"""
+        with self._lock:
+            self._queries.clear()
+            self._wait = QueryStats._new_entry()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def normalize(sql: str) -> str:
+        """Reemplaza literales por ? y compacta los espacios, para agrupar las ejecuciones de una misma sentencia"""
+        sql = re.sub(r"'(?:[^']|'')*'", '?', sql)
+        sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+        sql = re.sub(r'\(\s*\?(?:\s*,\s*\?)+\s*\)', '(?, ...)', sql)  # listas IN (...) de largo variable
+        sql = re.sub(r'\((?:\?|\?, \.\.\.)\)(?:\s*,\s*\((?:\?|\?, \.\.\.)\))+', '(?, ...), ...', sql)  # VALUES de varias filas
+        sql = re.sub(r'criteria_[0-9a-f]{32}', 'criteria_?', sql)  # nombres de cursores del servidor
+        return re.sub(r'\s+', ' ', sql).strip().rstrip(';').strip()
+
+    @staticmethod
+    def redact(params: Any) -> Any:
+        """Reemplaza los valores de los parámetros por su tipo (y tamaño), sin exponer datos"""
+        if params is None:
+            return None
+        if isinstance(params, dict):
+            return {key: QueryStats._redact_value(value) for key, value in params.items()}
+        if isinstance(params, (list, tuple)):
+            return [QueryStats._redact_value(value) for value in params]
+        return QueryStats._redact_value(params)
+
+    @staticmethod
+    def _redact_value(value: Any) -> str:
+        if value is None:
+            return 'NULL'
+        if isinstance(value, (str, bytes, list, tuple)):
+            return f"<{type(value).__name__}:{len(value)}>"
+        return f"<{type(value).__name__}>"
+
+    @staticmethod
+    def _caller() -> str:
+        """
+        Método que originó la consulta (Clase.método): normalmente un repositorio, o el pool en los chequeos de
+        conexión. Como cada módulo contiene una clase con su mismo nombre, el módulo identifica la clase.
+        """
+        frame = sys._getframe(2)
+        while frame is not None:
+            module = frame.f_globals.get('__name__', '')
+            if module.startswith(QueryStats._PACKAGE):
+                relative = module[len(QueryStats._PACKAGE):]
+                if relative not in QueryStats._HELPER_MODULES:
+                    return f"{relative.rsplit('.', 1)[-1]}.{frame.f_code.co_name}"
+            frame = frame.f_back
+        return '?'
+
+    @staticmethod
+    def _new_entry() -> dict:
+        return {'count': 0, 'total': 0.0, 'max': 0.0, 'rows': 0, 'histogram': [0] * (len(QueryStats.BUCKETS_MS) + 1)}
+
+    @staticmethod
+    def _add(entry: dict, duration: float):
+        entry['count'] += 1
+        entry['total'] += duration
+        entry['max'] = max(entry['max'], duration)
+        entry['histogram'][bisect.bisect_left(QueryStats.BUCKETS_MS, duration * 1000)] += 1
+
+    @staticmethod
+    def _summary(entry: dict) -> dict:
+        count = entry['count']
+        return {
+            'count': count,
+            'total_ms': entry['total'] * 1000,
+            'avg_ms': entry['total'] * 1000 / count if count else 0.0,
+            'max_ms': entry['max'] * 1000,
+            'p50_ms': QueryStats._percentile(entry['histogram'], count, 0.50),
+            'p95_ms': QueryStats._percentile(entry['histogram'], count, 0.95),
+            'p99_ms': QueryStats._percentile(entry['histogram'], count, 0.99),
+            'histogram': list(entry['histogram']),
+        }
+
+    @staticmethod
+    def _percentile(histogram: List[int], count: int, fraction: float) -> float:
+        if not count:
+            return 0.0
+        threshold = fraction * count
+        accumulated = 0
+        for index, bucket_count in enumerate(histogram):
+            accumulated += bucket_count
+            if accumulated >= threshold:
+                return float(QueryStats.BUCKETS_MS[index]) if index < len(QueryStats.BUCKETS_MS) else float('inf')
+        return float('inf')
+
+    @staticmethod
+    def _format_bound(value: float) -> str:
+        return '>' + str(QueryStats.BUCKETS_MS[-1]) if value == float('inf') else f"{value:.0f}"
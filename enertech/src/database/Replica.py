@@ -0,0 +1,103 @@
+import time
+from typing import Optional
+
+import psycopg2
+from psycopg2 import pool
+
+from enertech.src.AppLogger import AppLogger
+from enertech.src.database.ConnectionPool import ConnectionPool
+
+
+class Replica:
+    """
+    Réplica de solo lectura con su propio pool de conexiones. Recuerda su último retraso (lag) medido y,
+    si deja de responder, queda fuera de servicio unos segundos antes de volver a intentarlo.
+    """
+    # Consulta del retraso en segundos; es 0 si ya se aplicó todo lo recibido (el primario puede estar inactivo)
+    _LAG_QUERY = """
+                 SELECT CASE
+                            WHEN NOT pg_is_in_recovery() THEN 0
+                            WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                            ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+                            END
+                 """
+
+    def __init__(self, db_config: dict, connection_pool: ConnectionPool, lag_check_interval: float = 1.0,
+                 retry_after: float = 10.0):
+        """
+        :param db_config: Parámetros de conexión de la réplica (solo para los mensajes de log).
+        :param connection_pool: Pool de conexiones a la réplica.
+        :param lag_check_interval: Segundos durante los que se reutiliza el último retraso medido.
+        :param retry_after: Segundos que la réplica queda fuera de servicio tras un error de conexión.
+        """
+        self._name = f"{db_config.get('host')}:{db_config.get('port', 5432)}"
+        self._pool = connection_pool
+        self._lag_check_interval = lag_check_interval
+        self._retry_after = retry_after
+        self._lag = 0.0
+        self._lag_checked_at = float('-inf')
+        self._down_until = 0.0
+        self._log = AppLogger.setup_logger(Replica.__name__)
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def pool(self) -> ConnectionPool:
+        return self._pool
+
+    @property
+    def lag(self) -> float:
+        """Último retraso medido, en segundos"""
+        return self._lag
+
+    def open(self):
+        """Abre el pool; si la réplica no responde queda fuera de servicio en lugar de impedir el inicio"""
+        try:
+            self._pool.open()
+        except psycopg2.Error as e:
+            self._mark_down(e)
+
+    def close(self):
+        self._pool.close()
+
+    def try_acquire(self, max_lag: float) -> Optional[psycopg2.extensions.connection]:
+        """
+        Presta una conexión si la réplica está disponible y su retraso no supera max_lag.
+        :param max_lag: Retraso máximo aceptado, en segundos.
+        :return: Conexión (a devolver con pool.release) o None si hay que leer de otro servidor.
+        """
+        now = time.monotonic()
+        if now < self._down_until:
+            return None
+        if now - self._lag_checked_at < self._lag_check_interval and self._lag > max_lag:
+            return None
+        try:
+            conn = self._pool.acquire()
+        except (pool.PoolError, psycopg2.Error) as e:
+            self._mark_down(e)
+            return None
+        if now - self._lag_checked_at >= self._lag_check_interval:
+            try:
+                self._measure_lag(conn)
+            except psycopg2.Error as e:
+                self._pool.release(conn, discard=True)
+                self._mark_down(e)
+                return None
+            if self._lag > max_lag:
+                self._log.warning(f"Réplica {self._name} con {self._lag:.1f}s de retraso; se lee del primario.")
+                self._pool.release(conn)
+                return None
+        return conn
+
+    def _measure_lag(self, conn: psycopg2.extensions.connection):
+        with conn.cursor() as cursor:
+            cursor.execute(Replica._LAG_QUERY)
+            self._lag = float(cursor.fetchone()[0])
+        conn.rollback()
+        self._lag_checked_at = time.monotonic()
+
+    def _mark_down(self, error: Exception):
+        self._down_until = time.monotonic() + self._retry_after
+        self._log.warning(f"Réplica {self._name} no disponible por {self._retry_after}s: {error}")
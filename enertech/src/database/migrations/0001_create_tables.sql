@@ -1,5 +1,5 @@
 -- Create ADMIN table
-CREATE TABLE admins
+CREATE TABLE IF NOT EXISTS admins
 (
     id         SERIAL PRIMARY KEY,
     first_name VARCHAR(100)        NOT NULL,
@@ -12,7 +12,7 @@ CREATE TABLE admins
 );
 
 -- Create TECHNICIAN table
-CREATE TABLE technicians
+CREATE TABLE IF NOT EXISTS technicians
 (
     id                SERIAL PRIMARY KEY,
     first_name        VARCHAR(100)        NOT NULL,
@@ -25,7 +25,7 @@ CREATE TABLE technicians
 );
 
 -- Create SUPERVISOR table
-CREATE TABLE supervisors
+CREATE TABLE IF NOT EXISTS supervisors
 (
     id            SERIAL PRIMARY KEY,
     first_name    VARCHAR(100)        NOT NULL,
@@ -38,7 +38,7 @@ CREATE TABLE supervisors
 );
 
 -- Create INDUSTRIAL_ASSET table
-CREATE TABLE industrial_assets
+CREATE TABLE IF NOT EXISTS industrial_assets
 (
     id               SERIAL PRIMARY KEY,
     acquisition_date DATE         NOT NULL,
@@ -48,7 +48,7 @@ CREATE TABLE industrial_assets
 );
 
 -- Create WORK_ORDER table
-CREATE TABLE work_orders
+CREATE TABLE IF NOT EXISTS work_orders
 (
     id                  SERIAL PRIMARY KEY,
     title               VARCHAR(255)             NOT NULL,
@@ -66,4 +66,4 @@ CREATE TABLE work_orders
     description         TEXT                     NOT NULL,
     closure_comments    TEXT                     NOT NULL DEFAULT ''
     CHECK (resolved_at IS NULL OR resolved_at >= opened_at)
-);
\ No newline at end of file
+);
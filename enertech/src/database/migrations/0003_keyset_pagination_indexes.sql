@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- Indexes for keyset pagination (sort column + id as tie-breaker).
+-- Built CONCURRENTLY so live databases keep accepting writes on the tables.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_work_orders_opened_at_id ON work_orders (opened_at, id);
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_industrial_assets_acquisition_date_id ON industrial_assets (acquisition_date, id);
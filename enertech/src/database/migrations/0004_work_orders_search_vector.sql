@@ -0,0 +1,7 @@
+-- Full-text search document for work orders (title > description > closure comments).
+-- Adding a stored generated column rewrites work_orders once.
+ALTER TABLE work_orders
+    ADD COLUMN IF NOT EXISTS search_vector TSVECTOR GENERATED ALWAYS AS (
+        setweight(to_tsvector('spanish', title), 'A') ||
+        setweight(to_tsvector('spanish', description), 'B') ||
+        setweight(to_tsvector('spanish', closure_comments), 'C')) STORED;
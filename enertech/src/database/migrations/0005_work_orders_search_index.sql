@@ -0,0 +1,2 @@
+-- migrate: no-transaction
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_work_orders_search ON work_orders USING GIN (search_vector);
@@ -0,0 +1,5 @@
+-- migrate: no-transaction
+-- Carga de trabajo de los técnicos (órdenes IN_PROGRESS por técnico): índice parcial que solo contiene las órdenes
+-- en curso, así el conteo de la asignación lee a lo sumo max_active_orders entradas por técnico.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_work_orders_in_progress_assigned_to
+    ON work_orders (assigned_to) WHERE status = 'IN_PROGRESS';
@@ -0,0 +1,49 @@
+-- Vencimiento guardado de cada orden (deadline_at = opened_at + estimated_time en horas, días de 24 h o semanas de
+-- 168 h, igual que el despacho y OpenWorkOrderIndex) y marca de orden vencida sin resolver (overdue).
+-- resolved_on_time pasa a admitir NULL: NULL significa "todavía sin calcular" y lo completa OverdueSweeper.
+ALTER TABLE work_orders
+    ADD COLUMN IF NOT EXISTS deadline_at TIMESTAMP WITH TIME ZONE,
+    ADD COLUMN IF NOT EXISTS overdue     BOOLEAN NOT NULL DEFAULT FALSE,
+    ALTER COLUMN resolved_on_time DROP NOT NULL,
+    ALTER COLUMN resolved_on_time DROP DEFAULT;
+
+-- Mantiene deadline_at al insertar o cambiar apertura o tiempo estimado. Si cambia el vencimiento o la resolución,
+-- overdue y resolved_on_time se vuelven a calcular en el próximo barrido.
+CREATE OR REPLACE FUNCTION work_orders_set_deadline() RETURNS TRIGGER AS
+$$
+BEGIN
+    NEW.deadline_at := NEW.opened_at + NEW.estimated_time * CASE NEW.estimated_time_unit
+                                                                WHEN 'HOURS' THEN INTERVAL '1 hour'
+                                                                WHEN 'DAYS' THEN INTERVAL '24 hours'
+                                                                ELSE INTERVAL '168 hours' END;
+    IF TG_OP = 'INSERT' THEN
+        NEW.overdue := FALSE;
+        NEW.resolved_on_time := NULL;
+    ELSE
+        IF NEW.deadline_at IS DISTINCT FROM OLD.deadline_at THEN
+            NEW.overdue := FALSE;
+        END IF;
+        IF NEW.deadline_at IS DISTINCT FROM OLD.deadline_at OR NEW.resolved_at IS DISTINCT FROM OLD.resolved_at THEN
+            NEW.resolved_on_time := NULL;
+        END IF;
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_work_orders_deadline ON work_orders;
+CREATE TRIGGER trg_work_orders_deadline
+    BEFORE INSERT OR UPDATE OF opened_at, estimated_time, estimated_time_unit, resolved_at ON work_orders
+    FOR EACH ROW
+EXECUTE FUNCTION work_orders_set_deadline();
+
+-- Completa las filas existentes (el disparador solo actúa sobre las escrituras nuevas)
+UPDATE work_orders
+SET deadline_at      = opened_at + estimated_time * CASE estimated_time_unit
+                                                        WHEN 'HOURS' THEN INTERVAL '1 hour'
+                                                        WHEN 'DAYS' THEN INTERVAL '24 hours'
+                                                        ELSE INTERVAL '168 hours' END,
+    resolved_on_time = NULL;
+
+ALTER TABLE work_orders
+    ALTER COLUMN deadline_at SET NOT NULL;
@@ -0,0 +1,19 @@
+-- migrate: no-transaction
+-- Barrido de vencidas: solo las órdenes abiertas todavía no marcadas, por vencimiento; el barrido lee únicamente las
+-- que ya vencieron.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_work_orders_pending_overdue
+    ON work_orders (deadline_at)
+    WHERE NOT overdue AND status IN ('UNASSIGNED', 'IN_PROGRESS', 'REOPENED', 'WAITING_PARTS', 'ON_HOLD');
+
+-- Resueltas a las que falta calcular resolved_on_time (normalmente muy pocas)
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_work_orders_pending_on_time
+    ON work_orders (id)
+    WHERE resolved_at IS NOT NULL AND resolved_on_time IS NULL;
+
+-- Orden de atención del despacho (prioridad, vencimiento, id) sobre las órdenes sin asignar: claim_unassigned lee
+-- las primeras filas del índice en lugar de ordenar todas las pendientes. La expresión de prioridad debe coincidir
+-- con WorkOrderRepository._PRIORITY_RANK_SQL.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_work_orders_unassigned_dispatch
+    ON work_orders ((CASE priority WHEN 'CRITICAL' THEN 0 WHEN 'URGENT' THEN 1 WHEN 'HIGH' THEN 2 WHEN 'MEDIUM' THEN 3
+                                   WHEN 'LOW' THEN 4 END), deadline_at, id)
+    WHERE status = 'UNASSIGNED';
@@ -0,0 +1,121 @@
+-- Indicadores de confiabilidad precalculados (MTTR y MTBF) por activo y por tipo de activo y ubicación.
+-- Una falla es una orden CORRECTIVE no cancelada. Se guardan sumas y conteos (no promedios) para que los
+-- totales por grupo sean exactos: MTTR = total_repair_seconds / repairs, MTBF = total_uptime_seconds / uptime_gaps.
+
+-- Por activo. asset_type y location son los del activo al momento del cálculo (sirven para saber qué grupos
+-- recalcular si el activo cambia de tipo o ubicación). Sin clave foránea: la fila de un activo eliminado se
+-- borra en el próximo refresco.
+CREATE TABLE IF NOT EXISTS asset_reliability
+(
+    asset_id             INTEGER PRIMARY KEY,
+    asset_type           VARCHAR(100)             NOT NULL,
+    location             VARCHAR(255)             NOT NULL,
+    failures             INTEGER                  NOT NULL,
+    repairs              INTEGER                  NOT NULL,
+    total_repair_seconds DOUBLE PRECISION         NOT NULL,
+    uptime_gaps          INTEGER                  NOT NULL,
+    total_uptime_seconds DOUBLE PRECISION         NOT NULL,
+    last_failure_at      TIMESTAMP WITH TIME ZONE,
+    refreshed_at         TIMESTAMP WITH TIME ZONE NOT NULL
+);
+
+-- Por grupo: dimension es 'asset_type' o 'location' y group_key el valor del grupo
+CREATE TABLE IF NOT EXISTS asset_group_reliability
+(
+    dimension            VARCHAR(20)              NOT NULL,
+    group_key            VARCHAR(255)             NOT NULL,
+    assets               INTEGER                  NOT NULL,
+    failures             INTEGER                  NOT NULL,
+    repairs              INTEGER                  NOT NULL,
+    total_repair_seconds DOUBLE PRECISION         NOT NULL,
+    uptime_gaps          INTEGER                  NOT NULL,
+    total_uptime_seconds DOUBLE PRECISION         NOT NULL,
+    last_failure_at      TIMESTAMP WITH TIME ZONE,
+    refreshed_at         TIMESTAMP WITH TIME ZONE NOT NULL,
+    PRIMARY KEY (dimension, group_key)
+);
+
+-- Para recalcular solo los grupos de los activos modificados
+CREATE INDEX IF NOT EXISTS idx_asset_reliability_asset_type ON asset_reliability (asset_type);
+CREATE INDEX IF NOT EXISTS idx_asset_reliability_location ON asset_reliability (location);
+
+-- Activos con cambios desde el último refresco (ReliabilityRepository.refresh los consume).
+-- Las escrituras marcan con ON CONFLICT DO UPDATE, que bloquea la fila hasta el commit: el refresco saltea las filas
+-- bloqueadas (SKIP LOCKED), así nunca consume la marca de un cambio que todavía no puede ver.
+CREATE TABLE IF NOT EXISTS asset_reliability_dirty
+(
+    asset_id  INTEGER PRIMARY KEY,
+    marked_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Disparadores por sentencia con tablas de transición: una carga masiva (COPY) marca cada activo una sola vez.
+-- Los activos se marcan ordenados por ID para que dos transacciones no se bloqueen en orden inverso.
+CREATE OR REPLACE FUNCTION work_orders_mark_assets_dirty() RETURNS TRIGGER AS
+$$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO asset_reliability_dirty (asset_id)
+        SELECT DISTINCT asset_id FROM new_rows ORDER BY asset_id
+        ON CONFLICT (asset_id) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+    ELSIF TG_OP = 'DELETE' THEN
+        INSERT INTO asset_reliability_dirty (asset_id)
+        SELECT DISTINCT asset_id FROM old_rows ORDER BY asset_id
+        ON CONFLICT (asset_id) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+    ELSE
+        -- Solo los cambios que afectan los indicadores: asignar o despachar órdenes no marca el activo
+        INSERT INTO asset_reliability_dirty (asset_id)
+        SELECT DISTINCT changed.asset_id
+        FROM new_rows n
+                 JOIN old_rows o ON o.id = n.id
+                 CROSS JOIN LATERAL (VALUES (n.asset_id), (o.asset_id)) AS changed (asset_id)
+        WHERE (n.asset_id, n.maintenance_type, n.status = 'CANCELLED', n.opened_at, n.resolved_at)
+                  IS DISTINCT FROM (o.asset_id, o.maintenance_type, o.status = 'CANCELLED', o.opened_at, o.resolved_at)
+        ORDER BY changed.asset_id
+        ON CONFLICT (asset_id) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_work_orders_reliability_insert ON work_orders;
+CREATE TRIGGER trg_work_orders_reliability_insert
+    AFTER INSERT ON work_orders
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+EXECUTE FUNCTION work_orders_mark_assets_dirty();
+
+DROP TRIGGER IF EXISTS trg_work_orders_reliability_update ON work_orders;
+CREATE TRIGGER trg_work_orders_reliability_update
+    AFTER UPDATE ON work_orders
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT
+EXECUTE FUNCTION work_orders_mark_assets_dirty();
+
+DROP TRIGGER IF EXISTS trg_work_orders_reliability_delete ON work_orders;
+CREATE TRIGGER trg_work_orders_reliability_delete
+    AFTER DELETE ON work_orders
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT
+EXECUTE FUNCTION work_orders_mark_assets_dirty();
+
+-- Un activo nuevo, eliminado o que cambia de tipo o ubicación también cambia los totales de sus grupos
+CREATE OR REPLACE FUNCTION industrial_assets_mark_dirty() RETURNS TRIGGER AS
+$$
+BEGIN
+    INSERT INTO asset_reliability_dirty (asset_id)
+    VALUES (CASE WHEN TG_OP = 'DELETE' THEN OLD.id ELSE NEW.id END)
+    ON CONFLICT (asset_id) DO UPDATE SET marked_at = EXCLUDED.marked_at;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_industrial_assets_reliability ON industrial_assets;
+CREATE TRIGGER trg_industrial_assets_reliability
+    AFTER INSERT OR DELETE OR UPDATE OF asset_type, location ON industrial_assets
+    FOR EACH ROW
+EXECUTE FUNCTION industrial_assets_mark_dirty();
+
+-- El primer refresco calcula todos los activos existentes
+INSERT INTO asset_reliability_dirty (asset_id)
+SELECT id FROM industrial_assets
+ON CONFLICT DO NOTHING;
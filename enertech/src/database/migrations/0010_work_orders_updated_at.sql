@@ -0,0 +1,21 @@
+-- Última modificación de cada orden, para refrescar copias en memoria de forma incremental (WorkOrderSnapshot).
+-- Las filas existentes toman la hora de la migración sin reescribir la tabla (valor por defecto estable); las
+-- nuevas y las modificadas toman clock_timestamp(), la hora real de la escritura dentro de la transacción.
+ALTER TABLE work_orders
+    ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE NOT NULL DEFAULT now();
+ALTER TABLE work_orders
+    ALTER COLUMN updated_at SET DEFAULT clock_timestamp();
+
+CREATE OR REPLACE FUNCTION work_orders_touch_updated_at() RETURNS TRIGGER AS
+$$
+BEGIN
+    NEW.updated_at := clock_timestamp();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_work_orders_updated_at ON work_orders;
+CREATE TRIGGER trg_work_orders_updated_at
+    BEFORE UPDATE ON work_orders
+    FOR EACH ROW
+EXECUTE FUNCTION work_orders_touch_updated_at();
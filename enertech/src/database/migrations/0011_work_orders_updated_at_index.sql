@@ -0,0 +1,3 @@
+-- migrate: no-transaction
+-- Refresco incremental: solo las órdenes modificadas desde la última lectura
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_work_orders_updated_at ON work_orders (updated_at);
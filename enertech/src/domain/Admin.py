@@ -6,6 +6,8 @@ from enertech.src.domain.User import User
 
 # La clase Admin hereda de la clase User y representa a un usuario administrador 
 class Admin(User):
+    __slots__ = ('_department',)
+
     def __init__(self, first_name: str, last_name: str, email: str, password: str, department: str):
         # Llama al constructor de la clase padre User 
         super().__init__(first_name, last_name, email, password)
@@ -0,0 +1,36 @@
+class AssetImportReport:
+    """
+    Resumen de una importación masiva de activos industriales.
+    Solo guarda contadores: los rechazos se informan fila por fila a medida que ocurren,
+    para que la memoria usada no dependa del tamaño del archivo.
+    """
+
+    def __init__(self):
+        self._accepted = 0
+        self._rejected = 0
+
+    @property
+    def accepted(self) -> int:
+        """Cantidad de filas válidas cargadas en la base de datos"""
+        return self._accepted
+
+    @accepted.setter
+    def accepted(self, value: int):
+        self._accepted = value
+
+    @property
+    def rejected(self) -> int:
+        """Cantidad de filas rechazadas por datos inválidos"""
+        return self._rejected
+
+    @rejected.setter
+    def rejected(self, value: int):
+        self._rejected = value
+
+    @property
+    def total(self) -> int:
+        """Cantidad de filas leídas del archivo"""
+        return self._accepted + self._rejected
+
+    def __str__(self):
+        return f"AssetImportReport(total={self.total}, accepted={self.accepted}, rejected={self.rejected})"
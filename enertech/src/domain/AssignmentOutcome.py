@@ -0,0 +1,20 @@
+from enum import Enum
+
+
+class AssignmentOutcome(Enum):
+    """
+    Enumerador que representa el resultado de asignar una orden de trabajo a un técnico.
+    Valores:
+    - ASSIGNED: La orden quedó asignada al técnico y en curso.
+    - ORDER_NOT_FOUND: La orden no existe.
+    - ORDER_NOT_ASSIGNABLE: La orden ya está en curso, resuelta o cancelada (otro supervisor pudo asignarla antes).
+    - TECHNICIAN_NOT_FOUND: El técnico no existe.
+    - TECHNICIAN_INACTIVE: El técnico está dado de baja.
+    - TECHNICIAN_AT_CAPACITY: El técnico ya tiene su máximo de órdenes en curso.
+    """
+    ASSIGNED = 'ASSIGNED'
+    ORDER_NOT_FOUND = 'ORDER_NOT_FOUND'
+    ORDER_NOT_ASSIGNABLE = 'ORDER_NOT_ASSIGNABLE'
+    TECHNICIAN_NOT_FOUND = 'TECHNICIAN_NOT_FOUND'
+    TECHNICIAN_INACTIVE = 'TECHNICIAN_INACTIVE'
+    TECHNICIAN_AT_CAPACITY = 'TECHNICIAN_AT_CAPACITY'
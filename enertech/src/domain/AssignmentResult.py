@@ -0,0 +1,52 @@
+from typing import Optional
+
+from enertech.src.domain.AssignmentOutcome import AssignmentOutcome
+from enertech.src.domain.Status import Status
+from enertech.src.domain.WorkOrder import WorkOrder
+
+
+class AssignmentResult:
+    """
+    Resultado de una asignación atómica. Los conflictos (orden ya tomada, técnico sin capacidad...) se informan
+    como valores y no como excepciones, para que quien asigna en paralelo decida si reintenta con otro técnico.
+    """
+
+    def __init__(self, outcome: AssignmentOutcome, work_order: Optional[WorkOrder] = None,
+                 active_orders: Optional[int] = None, max_active_orders: Optional[int] = None,
+                 order_status: Optional[Status] = None):
+        self._outcome = outcome
+        self._work_order = work_order
+        self._active_orders = active_orders
+        self._max_active_orders = max_active_orders
+        self._order_status = order_status
+
+    @property
+    def outcome(self) -> AssignmentOutcome:
+        return self._outcome
+
+    @property
+    def assigned(self) -> bool:
+        return self._outcome is AssignmentOutcome.ASSIGNED
+
+    @property
+    def work_order(self) -> Optional[WorkOrder]:
+        """Orden actualizada, solo si se asignó"""
+        return self._work_order
+
+    @property
+    def active_orders(self) -> Optional[int]:
+        """Órdenes en curso del técnico al momento de la asignación (sin contar la nueva)"""
+        return self._active_orders
+
+    @property
+    def max_active_orders(self) -> Optional[int]:
+        return self._max_active_orders
+
+    @property
+    def order_status(self) -> Optional[Status]:
+        """Estado que tenía la orden cuando no se pudo asignar por ORDER_NOT_ASSIGNABLE"""
+        return self._order_status
+
+    def __str__(self):
+        return (f"AssignmentResult({self.outcome.value}, work_order={self.work_order.id if self.work_order else None}, "
+                f"active_orders={self.active_orders}, max_active_orders={self.max_active_orders})")
@@ -0,0 +1,39 @@
+class DispatchReport:
+    """
+    Resumen de una ejecución del despacho automático: cuántas órdenes asignó, en cuántos lotes y en cuánto tiempo.
+    """
+
+    def __init__(self):
+        self._batches = 0
+        self._assigned = 0
+        self._elapsed_seconds = 0.0
+
+    @property
+    def batches(self) -> int:
+        """Cantidad de lotes confirmados (cada uno en su propia transacción)"""
+        return self._batches
+
+    @property
+    def assigned(self) -> int:
+        """Cantidad de órdenes asignadas"""
+        return self._assigned
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self._elapsed_seconds
+
+    @elapsed_seconds.setter
+    def elapsed_seconds(self, value: float):
+        self._elapsed_seconds = value
+
+    @property
+    def orders_per_second(self) -> float:
+        return self._assigned / self._elapsed_seconds if self._elapsed_seconds else 0.0
+
+    def add_batch(self, assigned: int):
+        self._batches += 1
+        self._assigned += assigned
+
+    def __str__(self):
+        return (f"DispatchReport(assigned={self.assigned}, batches={self.batches}, "
+                f"elapsed={self.elapsed_seconds:.2f}s, orders_per_second={self.orders_per_second:.0f})")
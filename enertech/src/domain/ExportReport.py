@@ -0,0 +1,53 @@
+class ExportReport:
+    """
+    Resumen de una exportación de órdenes de trabajo: archivo generado, formato, filas y duración.
+    """
+
+    def __init__(self, path: str, file_format: str):
+        self._path = path
+        self._file_format = file_format
+        self._rows = 0
+        self._row_groups = 0
+        self._elapsed_seconds = 0.0
+
+    @property
+    def path(self) -> str:
+        return self._path
+
+    @property
+    def file_format(self) -> str:
+        """'csv' o 'parquet'"""
+        return self._file_format
+
+    @property
+    def rows(self) -> int:
+        return self._rows
+
+    @rows.setter
+    def rows(self, value: int):
+        self._rows = value
+
+    @property
+    def row_groups(self) -> int:
+        """Grupos de filas escritos (solo Parquet)"""
+        return self._row_groups
+
+    @row_groups.setter
+    def row_groups(self, value: int):
+        self._row_groups = value
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self._elapsed_seconds
+
+    @elapsed_seconds.setter
+    def elapsed_seconds(self, value: float):
+        self._elapsed_seconds = value
+
+    @property
+    def rows_per_second(self) -> float:
+        return self._rows / self._elapsed_seconds if self._elapsed_seconds else 0.0
+
+    def __str__(self):
+        return (f"ExportReport(path={self.path}, format={self.file_format}, rows={self.rows}, "
+                f"elapsed={self.elapsed_seconds:.2f}s, rows_per_second={self.rows_per_second:.0f})")
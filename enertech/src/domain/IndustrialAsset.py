@@ -2,6 +2,8 @@ from datetime import date
 
 
 class IndustrialAsset:
+    __slots__ = ('_id', '_asset_type', '_model', '_location', '_acquisition_date')
+
     def __init__(self, asset_type: str = None, model: str = None, location: str = None, acquisition_date: date = None):
         self._id = None
         self._asset_type = asset_type
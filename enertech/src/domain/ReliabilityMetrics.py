@@ -0,0 +1,83 @@
+from datetime import datetime, timedelta
+from typing import Optional
+
+
+class ReliabilityMetrics:
+    """
+    Indicadores de confiabilidad precalculados de un activo o de un grupo de activos (tipo o ubicación).
+    Una falla es una orden de mantenimiento correctivo no cancelada.
+      - MTTR (tiempo medio de reparación): promedio de resolved_at - opened_at de las fallas resueltas.
+      - MTBF (tiempo medio entre fallas): promedio del tiempo en servicio entre la resolución de una falla y la
+        apertura de la siguiente del mismo activo.
+    """
+    ASSET = 'asset'
+    ASSET_TYPE = 'asset_type'
+    LOCATION = 'location'
+
+    def __init__(self, dimension: str, key, assets: int, failures: int, repairs: int, total_repair_seconds: float,
+                 uptime_gaps: int, total_uptime_seconds: float, last_failure_at: Optional[datetime],
+                 refreshed_at: datetime):
+        """
+        :param dimension: ASSET, ASSET_TYPE o LOCATION.
+        :param key: ID del activo, o tipo o ubicación del grupo.
+        :param assets: Cantidad de activos incluidos (1 para un activo).
+        :param failures: Cantidad de fallas.
+        :param repairs: Fallas ya resueltas.
+        :param total_repair_seconds: Suma de los tiempos de reparación, en segundos.
+        :param uptime_gaps: Intervalos en servicio medidos entre fallas consecutivas.
+        :param total_uptime_seconds: Suma de esos intervalos, en segundos.
+        :param last_failure_at: Apertura de la última falla, o None si no hubo.
+        :param refreshed_at: Momento en que se calcularon los valores.
+        """
+        self._dimension = dimension
+        self._key = key
+        self._assets = assets
+        self._failures = failures
+        self._repairs = repairs
+        self._total_repair_seconds = total_repair_seconds
+        self._uptime_gaps = uptime_gaps
+        self._total_uptime_seconds = total_uptime_seconds
+        self._last_failure_at = last_failure_at
+        self._refreshed_at = refreshed_at
+
+    @property
+    def dimension(self) -> str:
+        return self._dimension
+
+    @property
+    def key(self):
+        return self._key
+
+    @property
+    def assets(self) -> int:
+        return self._assets
+
+    @property
+    def failures(self) -> int:
+        return self._failures
+
+    @property
+    def repairs(self) -> int:
+        return self._repairs
+
+    @property
+    def last_failure_at(self) -> Optional[datetime]:
+        return self._last_failure_at
+
+    @property
+    def refreshed_at(self) -> datetime:
+        return self._refreshed_at
+
+    @property
+    def mttr(self) -> Optional[timedelta]:
+        """Tiempo medio de reparación, o None si no hay fallas resueltas"""
+        return timedelta(seconds=self._total_repair_seconds / self._repairs) if self._repairs else None
+
+    @property
+    def mtbf(self) -> Optional[timedelta]:
+        """Tiempo medio entre fallas, o None si no hay dos fallas consecutivas con la primera resuelta"""
+        return timedelta(seconds=self._total_uptime_seconds / self._uptime_gaps) if self._uptime_gaps else None
+
+    def __str__(self):
+        return (f"ReliabilityMetrics({self.dimension}={self.key}, assets={self.assets}, failures={self.failures}, "
+                f"mttr={self.mttr}, mtbf={self.mtbf})")
@@ -6,6 +6,8 @@ from enertech.src.domain.User import User
 
 # La clase Supervisor hereda de la clase User y representa a un usuario con rol de supervisor
 class Supervisor(User):
+    __slots__ = ('_assigned_area',)
+
     def __init__(self, first_name: str, last_name: str, email: str, password: str, assigned_area: str):
         # Llama al constructor de la clase padre User
         super().__init__(first_name, last_name, email, password)
@@ -0,0 +1,46 @@
+class SweepReport:
+    """
+    Resumen de un barrido de OverdueSweeper: órdenes marcadas como vencidas, órdenes resueltas a las que se les
+    calculó resolved_on_time, sentencias ejecutadas y duración.
+    """
+
+    def __init__(self):
+        self._flagged_overdue = 0
+        self._resolved_checked = 0
+        self._statements = 0
+        self._elapsed_seconds = 0.0
+
+    @property
+    def flagged_overdue(self) -> int:
+        """Órdenes abiertas marcadas como vencidas (overdue)"""
+        return self._flagged_overdue
+
+    @property
+    def resolved_checked(self) -> int:
+        """Órdenes resueltas a las que se les completó resolved_on_time"""
+        return self._resolved_checked
+
+    @property
+    def statements(self) -> int:
+        """Cantidad de UPDATE ejecutados (uno por lote)"""
+        return self._statements
+
+    @property
+    def elapsed_seconds(self) -> float:
+        return self._elapsed_seconds
+
+    @elapsed_seconds.setter
+    def elapsed_seconds(self, value: float):
+        self._elapsed_seconds = value
+
+    def add_flagged(self, count: int):
+        self._statements += 1
+        self._flagged_overdue += count
+
+    def add_resolved(self, count: int):
+        self._statements += 1
+        self._resolved_checked += count
+
+    def __str__(self):
+        return (f"SweepReport(flagged_overdue={self.flagged_overdue}, resolved_checked={self.resolved_checked}, "
+                f"statements={self.statements}, elapsed={self.elapsed_seconds:.2f}s)")
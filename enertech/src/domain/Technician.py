@@ -6,6 +6,8 @@ from enertech.src.domain.User import User
 
 # La clase Technician hereda de la clase User y representa a un técnico en la aplicación
 class Technician(User):
+    __slots__ = ('_max_active_orders',)
+
     def __init__(self, first_name: str, last_name: str, email: str, password: str, max_active_orders: int):
         # Llama al constructor de la clase padre User
         super().__init__(first_name, last_name, email, password)
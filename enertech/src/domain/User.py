@@ -3,6 +3,8 @@ from abc import ABC, abstractmethod  # Abstract Base Class for User
 
 
 class User(ABC):
+    __slots__ = ('_id', '_first_name', '_last_name', '_email', '_password', '_active', '_role')
+
     def __init__(self, first_name: str, last_name: str, email: str, password: str):
         self._id = None  # ID will be set by the database
         self._first_name = first_name
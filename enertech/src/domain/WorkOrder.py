@@ -24,6 +24,9 @@ class WorkOrder:
       - fecha de creación (asignada automáticamente)
       - estado actual (asignado según la presencia o ausencia de un técnico)
     """
+    __slots__ = ('_id', '_title', '_created_by', '_asset_id', '_maintenance_type', '_priority', '_status',
+                 '_estimated_time', '_estimated_time_unit', '_description', '_assigned_to', '_opened_at',
+                 '_resolved_at', '_closure_comments')
 
     def __init__(
             self,
@@ -0,0 +1,114 @@
+from typing import List, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from enertech.src.repository.ColumnKind import ColumnKind
+
+
+class ParquetExportWriter:
+    """
+    Escribe filas en un archivo Parquet por lotes, en grupos de filas (row groups) de tamaño fijo: guarda en
+    memoria a lo sumo un grupo más el lote recibido, sin importar el total de filas.
+    Las filas llegan como las devuelve WorkOrderRepository.export_batches: TIMESTAMP como microsegundos desde la
+    época Unix y DATE como días desde la época, que se convierten a columnas de Arrow sin crear objetos Python.
+    Las columnas ENUM se guardan con codificación de diccionario.
+    Requiere el extra opcional export (pip install -e .[export]).
+    """
+    _ARROW_TYPES = {
+        ColumnKind.ID: pa.int64(),
+        ColumnKind.INTEGER: pa.int64(),
+        ColumnKind.TEXT: pa.string(),
+        ColumnKind.ENUM: pa.dictionary(pa.int32(), pa.string()),
+        ColumnKind.BOOLEAN: pa.bool_(),
+        ColumnKind.DATE: pa.date32(),
+        ColumnKind.TIMESTAMP: pa.timestamp('us', tz='UTC'),
+    }
+
+    def __init__(self, path: str, columns: Sequence[Tuple[str, ColumnKind]], row_group_size: int = 100000,
+                 compression: str = 'zstd'):
+        """
+        :param path: Ruta del archivo a crear.
+        :param columns: Nombre y tipo de cada columna, en el orden de las filas.
+        :param row_group_size: Filas por grupo; grupos más grandes comprimen mejor y usan más memoria.
+        :param compression: Códec de compresión de Parquet ('zstd', 'snappy', 'gzip' o 'none').
+        """
+        if not isinstance(row_group_size, int) or row_group_size <= 0:
+            raise ValueError("row_group_size debe ser un número entero positivo")
+        self._kinds = [kind for _, kind in columns]
+        self._schema = pa.schema([pa.field(name, ParquetExportWriter._ARROW_TYPES[kind]) for name, kind in columns])
+        self._row_group_size = row_group_size
+        self._writer = pq.ParquetWriter(path, self._schema, compression=compression)
+        self._pending: List[pa.RecordBatch] = []
+        self._pending_rows = 0
+        self._rows = 0
+        self._row_groups = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    @property
+    def rows(self) -> int:
+        """Filas escritas hasta ahora (incluye las que esperan completar un grupo)"""
+        return self._rows
+
+    @property
+    def row_groups(self) -> int:
+        return self._row_groups
+
+    def write_rows(self, rows: Sequence[tuple]):
+        """Agrega un lote de filas; escribe los grupos que se completen"""
+        if not rows:
+            return
+        columns = list(zip(*rows))
+        arrays = [ParquetExportWriter._to_array(values, kind) for values, kind in zip(columns, self._kinds)]
+        self._pending.append(pa.RecordBatch.from_arrays(arrays, schema=self._schema))
+        self._pending_rows += len(rows)
+        self._rows += len(rows)
+        if self._pending_rows >= self._row_group_size:
+            self._flush(final=False)
+
+    def close(self):
+        """Escribe el último grupo (incompleto) y cierra el archivo"""
+        if self._writer is None:
+            return
+        self._flush(final=True)
+        self._writer.close()
+        self._writer = None
+
+    def abort(self):
+        """Cierra el archivo sin escribir las filas pendientes; el archivo queda incompleto y hay que descartarlo"""
+        if self._writer is None:
+            return
+        self._pending = []
+        self._pending_rows = 0
+        self._writer.close()
+        self._writer = None
+
+    def _flush(self, final: bool):
+        # Escribe grupos completos de row_group_size filas y deja el resto para el próximo lote
+        table = pa.Table.from_batches(self._pending, schema=self._schema)
+        full = self._pending_rows if final else self._pending_rows - self._pending_rows % self._row_group_size
+        for start in range(0, full, self._row_group_size):
+            self._writer.write_table(table.slice(start, min(self._row_group_size, full - start)),
+                                     row_group_size=self._row_group_size)
+            self._row_groups += 1
+        remainder = table.slice(full)
+        self._pending = remainder.combine_chunks().to_batches() if remainder.num_rows else []
+        self._pending_rows = remainder.num_rows
+
+    @staticmethod
+    def _to_array(values: Sequence, kind: ColumnKind) -> pa.Array:
+        if kind == ColumnKind.TIMESTAMP:
+            return pa.array(values, pa.int64()).cast(ParquetExportWriter._ARROW_TYPES[kind])
+        if kind == ColumnKind.DATE:
+            return pa.array(values, pa.int32()).cast(pa.date32())
+        if kind == ColumnKind.ENUM:
+            return pa.array(values, pa.string()).dictionary_encode()
+        return pa.array(values, ParquetExportWriter._ARROW_TYPES[kind])
@@ -1,19 +1,25 @@
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from enertech.src.database.DatabaseManager import DatabaseManager
 from enertech.src.domain.Admin import Admin
 from enertech.src.domain.UserRole import UserRole
 from enertech.src.repository.BaseUserRepository import BaseUserRepository
 from enertech.src.repository.Criteria import Criteria
+from enertech.src.repository.EntityCache import EntityCache
+from enertech.src.repository.Page import Page
 
 
 # Repositorio para manejar operaciones de base de datos para administradores (Admin)
 class AdminRepository(BaseUserRepository):
-    def __init__(self, db_manager: DatabaseManager):
+    # Columnas que se leen para construir la entidad, en el orden que espera el mapeo de filas
+    _COLUMNS = ('id', 'first_name', 'last_name', 'email', 'password', 'rol', 'active', 'department')
+
+    def __init__(self, db_manager: DatabaseManager, cache: Optional[EntityCache] = None):
         """
         Constructor que inicializa el repositorio con un gestor de base de datos.
         :param db_manager: Instancia de DatabaseManager para manejar conexiones a la base de datos.
+        :param cache: Caché opcional para get_by_id y get_by_email; update y delete invalidan sus entradas.
         """
-        super().__init__(db_manager)
+        super().__init__(db_manager, cache)
 
     def save(self, admin: Admin) -> Admin:
         """
@@ -26,7 +32,7 @@ class AdminRepository(BaseUserRepository):
                 VALUES (%s, %s, %s, %s, %s, %s,
                         %s) RETURNING id, first_name, last_name, email, password, rol, active, department; \
                 """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (
                 admin.first_name,
                 admin.last_name,
@@ -36,9 +42,7 @@ class AdminRepository(BaseUserRepository):
                 admin.is_active,
                 admin.department
             ))
-            self._db_manager.commit_transaction()
             result = cursor.fetchone()
-            self._db_manager.close_connection()
         return self._row_to_entity(result) if result else None
 
     def update(self, admin: Admin) -> Optional[Admin]:
@@ -58,7 +62,7 @@ class AdminRepository(BaseUserRepository):
                     department = %s
                 WHERE id = %s RETURNING id, first_name, last_name, email, password, rol, active, department; \
                 """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (
                 admin.first_name,
                 admin.last_name,
@@ -69,9 +73,8 @@ class AdminRepository(BaseUserRepository):
                 admin.department,
                 admin.id
             ))
-            self._db_manager.commit_transaction()
             result = cursor.fetchone()
-            self._db_manager.close_connection()
+        self._evict(admin.id)
         return self._row_to_entity(result) if result else None
 
     def get_by_id(self, admin_id: int) -> Optional[Admin]:
@@ -80,12 +83,14 @@ class AdminRepository(BaseUserRepository):
         :param admin_id: ID del administrador a buscar.
         :return: Admin si se encuentra, None si no existe.
         """
-        query = "SELECT * FROM admins WHERE id = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
-            cursor.execute(query, (admin_id,))
-            row = cursor.fetchone()
-            self._db_manager.close_connection()
-        return self._row_to_entity(row) if row else None
+        def load() -> Optional[Admin]:
+            query = f"SELECT {', '.join(self._COLUMNS)} FROM admins WHERE id = %s"
+            with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+                cursor.execute(query, (admin_id,))
+                row = cursor.fetchone()
+            return self._row_to_entity(row) if row else None
+
+        return self._cached(admin_id, load)
 
     def get_by_email(self, email: str) -> Optional[Admin]:
         """
@@ -93,12 +98,14 @@ class AdminRepository(BaseUserRepository):
         :param email: Correo electrónico del administrador a buscar.
         :return: Admin si se encuentra, None si no existe.
         """
-        query = "SELECT * FROM admins WHERE email = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
-            cursor.execute(query, (email,))
-            row = cursor.fetchone()
-            self._db_manager.close_connection()
-        return self._row_to_entity(row) if row else None
+        def load() -> Optional[Admin]:
+            query = f"SELECT {', '.join(self._COLUMNS)} FROM admins WHERE email = %s"
+            with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+                cursor.execute(query, (email,))
+                row = cursor.fetchone()
+            return self._row_to_entity(row) if row else None
+
+        return self._cached(('email', email), load)
 
     def email_exist(self, email: str) -> bool:
         """
@@ -107,9 +114,8 @@ class AdminRepository(BaseUserRepository):
         :return: True si el correo existe, False en caso contrario.
         """
         query = "SELECT 1 FROM admins WHERE email = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
             cursor.execute(query, (email,))
-            self._db_manager.close_connection()
             return cursor.fetchone() is not None
 
     def list_by_criteria(self, criteria: dict) -> List[Admin]:
@@ -119,9 +125,35 @@ class AdminRepository(BaseUserRepository):
         :return: Lista de Admin que cumplen con los criterios, o None si no hay resultados.
         """
         _TABLE_NAME = "admins"
-        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria)
+        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria, self._COLUMNS)
         return [self._row_to_entity(result) for result in results]
 
+    def iter_by_criteria(self, criteria: dict, itersize: int = 2000) -> Iterator[Admin]:
+        """
+        Igual que list_by_criteria, pero devuelve los administradores de a uno con un cursor del lado del servidor.
+        :param criteria: Diccionario con los criterios de búsqueda (ejemplo: {'active': True}).
+        :param itersize: Cantidad de filas traídas del servidor en cada viaje.
+        :return: Generador de Admin que cumplen con los criterios.
+        """
+        _TABLE_NAME = "admins"
+        for row in Criteria.iter_by_criteria(_TABLE_NAME, self._db_manager, criteria, itersize,
+                                             self._COLUMNS):
+            yield self._row_to_entity(row)
+
+    def page_by_criteria(self, criteria: dict, page_size: int = 50,
+                         after: Optional[str] = None) -> Page[Admin]:
+        """
+        Igual que list_by_criteria, pero de a una página por vez con paginación por keyset.
+        :param criteria: Diccionario con los criterios de búsqueda.
+        :param page_size: Cantidad máxima de resultados por página.
+        :param after: next_cursor de la página anterior; None para la primera página.
+        :return: Page de Admin y el cursor de la página siguiente.
+        """
+        _TABLE_NAME = "admins"
+        page = Criteria.page_by_criteria(_TABLE_NAME, self._db_manager, criteria, page_size,
+                                         'id', after, self._COLUMNS)
+        return Page([self._row_to_entity(row) for row in page.items], page.next_cursor)
+
     def delete(self, admin_id: int) -> bool:
         """
         Elimina un administrador por ID.
@@ -129,11 +161,10 @@ class AdminRepository(BaseUserRepository):
         :return: True si se eliminó correctamente, False si no se encontró el registro.
         """
         query = "DELETE FROM admins WHERE id = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (admin_id,))
-            self._db_manager.commit_transaction()
             result = cursor.rowcount
-            self._db_manager.close_connection()
+        self._evict(admin_id)
         return result > 0
 
     @staticmethod
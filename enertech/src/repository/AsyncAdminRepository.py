@@ -0,0 +1,11 @@
+from enertech.src.repository.AsyncBaseUserRepository import AsyncBaseUserRepository
+from enertech.src.repository.AdminRepository import AdminRepository
+
+
+# Repositorio asíncrono para administradores (Admin), equivalente a AdminRepository
+class AsyncAdminRepository(AsyncBaseUserRepository):
+    _TABLE_NAME = "admins"
+    _EXTRA_COLUMN = "department"
+
+    # Mismo mapeo fila -> entidad que el repositorio síncrono
+    _row_to_entity = staticmethod(AdminRepository._row_to_entity)
@@ -0,0 +1,153 @@
+from abc import ABC, abstractmethod
+from typing import List, Optional
+
+from enertech.src.database.AsyncDatabaseManager import AsyncDatabaseManager
+from enertech.src.domain.User import User
+from enertech.src.repository.Criteria import Criteria
+
+
+class AsyncBaseUserRepository(ABC):
+    """
+    Base asíncrona para los repositorios de usuarios. Las tablas admins, supervisors y technicians solo difieren
+    en su última columna, así que las subclases definen _TABLE_NAME, _EXTRA_COLUMN y _row_to_entity.
+    """
+    _TABLE_NAME: str = None
+    _EXTRA_COLUMN: str = None  # columna propia del rol (department, assigned_area, max_active_orders)
+
+    def __init__(self, db_manager: AsyncDatabaseManager):
+        self._db_manager = db_manager
+
+    def unit_of_work(self):
+        """Abre una unidad de trabajo compartida por todos los repositorios del mismo AsyncDatabaseManager"""
+        return self._db_manager.unit_of_work()
+
+    @property
+    def _columns(self) -> str:
+        return f"id, first_name, last_name, email, password, rol, active, {self._EXTRA_COLUMN}"
+
+    async def save(self, user: User) -> Optional[User]:
+        """
+        Inserta un nuevo usuario en la base de datos y devuelve la entidad creada con el ID asignado.
+        :param user: Usuario con los datos a insertar.
+        :return: Usuario con los datos insertados, incluyendo el ID generado.
+        """
+        query = f"""
+                INSERT INTO {self._TABLE_NAME} (first_name, last_name, email, password, rol, active, {self._EXTRA_COLUMN})
+                VALUES (%s, %s, %s, %s, %s, %s, %s) RETURNING {self._columns};
+                """
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (
+                user.first_name,
+                user.last_name,
+                user.email,
+                user.password,
+                user.role.value,
+                user.is_active,
+                getattr(user, self._EXTRA_COLUMN)
+            ))
+            result = await cursor.fetchone()
+        return self._row_to_entity(result) if result else None
+
+    async def update(self, user: User) -> Optional[User]:
+        """
+        Actualiza un usuario existente y devuelve la entidad actualizada.
+        :param user: Usuario con los datos actualizados.
+        :return: Usuario actualizado, o None si no se encontró el registro.
+        """
+        query = f"""
+                UPDATE {self._TABLE_NAME}
+                SET first_name = %s,
+                    last_name  = %s,
+                    email      = %s,
+                    password   = %s,
+                    rol        = %s,
+                    active     = %s,
+                    {self._EXTRA_COLUMN} = %s
+                WHERE id = %s RETURNING {self._columns};
+                """
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (
+                user.first_name,
+                user.last_name,
+                user.email,
+                user.password,
+                user.role.value,
+                user.is_active,
+                getattr(user, self._EXTRA_COLUMN),
+                user.id
+            ))
+            result = await cursor.fetchone()
+        return self._row_to_entity(result) if result else None
+
+    async def get_by_id(self, user_id: int) -> Optional[User]:
+        """
+        Busca y devuelve un usuario por su ID.
+        :param user_id: ID del usuario a buscar.
+        :return: Usuario si se encuentra, None si no existe.
+        """
+        query = f"SELECT {self._columns} FROM {self._TABLE_NAME} WHERE id = %s"
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (user_id,))
+            row = await cursor.fetchone()
+        return self._row_to_entity(row) if row else None
+
+    async def get_by_email(self, email: str) -> Optional[User]:
+        """
+        Busca y devuelve un usuario por su correo electrónico.
+        :param email: Correo electrónico del usuario a buscar.
+        :return: Usuario si se encuentra, None si no existe.
+        """
+        query = f"SELECT {self._columns} FROM {self._TABLE_NAME} WHERE email = %s"
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (email,))
+            row = await cursor.fetchone()
+        return self._row_to_entity(row) if row else None
+
+    async def email_exist(self, email: str) -> bool:
+        """
+        Verifica si un correo electrónico ya está registrado.
+        :param email: Correo electrónico a verificar.
+        :return: True si el correo existe, False en caso contrario.
+        """
+        query = f"SELECT 1 FROM {self._TABLE_NAME} WHERE email = %s"
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (email,))
+            return await cursor.fetchone() is not None
+
+    async def exists_by_credentials(self, email: str, password: str) -> bool:
+        """
+        Verifica si existe un usuario con las credenciales proporcionadas.
+        :param email: Correo electrónico del usuario.
+        :param password: Contraseña del usuario.
+        :return: True si existe el usuario con esas credenciales, False en caso contrario.
+        """
+        query = f"SELECT 1 FROM {self._TABLE_NAME} WHERE email = %s AND password = %s"
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (email, password))
+            return await cursor.fetchone() is not None
+
+    async def list_by_criteria(self, criteria: dict) -> List[User]:
+        """
+        Lista usuarios que cumplan con ciertos criterios de búsqueda.
+        :param criteria: Diccionario con los criterios de búsqueda (ejemplo: {'active': True}).
+        :return: Lista de usuarios que cumplen con los criterios.
+        """
+        results = await Criteria.list_by_criteria_async(self._TABLE_NAME, self._db_manager, criteria,
+                                                        self._columns.split(', '))
+        return [self._row_to_entity(result) for result in results]
+
+    async def delete(self, user_id: int) -> bool:
+        """
+        Elimina un usuario por ID.
+        :param user_id: ID del usuario a eliminar.
+        :return: True si se eliminó correctamente, False si no se encontró el registro.
+        """
+        query = f"DELETE FROM {self._TABLE_NAME} WHERE id = %s"
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (user_id,))
+            return cursor.rowcount > 0
+
+    @staticmethod
+    @abstractmethod
+    def _row_to_entity(row) -> User:
+        pass
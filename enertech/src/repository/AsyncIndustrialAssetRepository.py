@@ -0,0 +1,96 @@
+from typing import Optional, List
+from enertech.src.database.AsyncDatabaseManager import AsyncDatabaseManager
+from enertech.src.domain.IndustrialAsset import IndustrialAsset
+from enertech.src.repository.Criteria import Criteria
+from enertech.src.repository.IndustrialAssetRepository import IndustrialAssetRepository
+
+
+class AsyncIndustrialAssetRepository:
+    def __init__(self, db_manager: AsyncDatabaseManager):
+        self._db_manager = db_manager
+
+    def unit_of_work(self):
+        """Abre una unidad de trabajo compartida por todos los repositorios del mismo AsyncDatabaseManager"""
+        return self._db_manager.unit_of_work()
+
+    async def save(self, asset: IndustrialAsset) -> IndustrialAsset:
+        """
+        Guarda un objeto IndustrialAsset y retorna todos sus datos
+        Args:
+            asset: Objeto IndustrialAsset con los atributos: [asset_type, model, location, acquisition_date]
+        Returns:
+            Objeto IndustrialAsset con sus datos completos.
+        """
+        query = """
+                INSERT INTO INDUSTRIAL_ASSETS (asset_type, model, location, acquisition_date)
+                VALUES (%s, %s, %s, %s) RETURNING id, asset_type, model, location, acquisition_date;
+                """
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (asset.asset_type, asset.model, asset.location, asset.acquisition_date))
+            result = await cursor.fetchone()
+        return self._row_to_entity(result)
+
+    async def update(self, asset: IndustrialAsset) -> IndustrialAsset | None:
+        """
+        Actualiza un IndustrialAsset en la base de datos solo si hay cambios reales.
+        Args:
+            asset: Objeto IndustrialAsset con el ID y uno o más campos modificados.
+        Returns:
+            Objeto IndustrialAsset actualizado o None si no hay cambios que realizar.
+        """
+        column_names = ['asset_type', 'model', 'location', 'acquisition_date']
+        fields = [field for field in column_names if getattr(asset, field, None) is not None]
+        if not fields:
+            return None
+        query = f"""
+                    UPDATE INDUSTRIAL_ASSETS
+                    SET {', '.join(f"{field} = %s" for field in fields)}
+                    WHERE id = %s
+                    AND ({' OR '.join(f"{field} <> %s" for field in fields)})
+                    RETURNING id, asset_type, model, location, acquisition_date;
+                """
+        values = [getattr(asset, field) for field in fields]
+        params = values + [asset.id] + values
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, params)
+            result = await cursor.fetchone()
+        return self._row_to_entity(result) if result else None
+
+    async def get_by_id(self, asset_id: int) -> Optional[IndustrialAsset]:
+        """
+        Obtiene un activo industrial por ID.
+        Args:
+            asset_id: ID del activo industrial a buscar.
+        Returns:
+            Activo industrial encontrado o None si no existe.
+        """
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(f"SELECT {', '.join(self._COLUMNS)} FROM INDUSTRIAL_ASSETS WHERE id = %s", (asset_id,))
+            row = await cursor.fetchone()
+        return self._row_to_entity(row) if row else None
+
+    async def list_by_criteria(self, filters: dict) -> List[IndustrialAsset]:
+        """
+        Obtiene assets industriales con filtros opcionales.
+        Args:
+            filters: Diccionario con filtros columna : valor (ej.: {'asset_type': 'turbina', 'location': 'planta 1'})
+        Returns:
+            Lista de IndustrialAsset que cumplen con los filtros (o todos si no hay filtros)
+        """
+        _TABLE_NAME = "INDUSTRIAL_ASSETS"
+        results = await Criteria.list_by_criteria_async(_TABLE_NAME, self._db_manager, filters,
+                                                        self._COLUMNS)
+        return [self._row_to_entity(result) for result in results]
+
+    async def delete(self, asset_id: int) -> None:
+        """
+        Elimina permanentemente un activo por ID.
+        Args:
+            asset_id: ID del activo industrial a eliminar.
+        """
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute("DELETE FROM INDUSTRIAL_ASSETS WHERE id = %s", (asset_id,))
+
+    # Mismo mapeo fila -> entidad que el repositorio síncrono
+    _COLUMNS = IndustrialAssetRepository._COLUMNS
+    _row_to_entity = staticmethod(IndustrialAssetRepository._row_to_entity)
@@ -0,0 +1,11 @@
+from enertech.src.repository.AsyncBaseUserRepository import AsyncBaseUserRepository
+from enertech.src.repository.SupervisorRepository import SupervisorRepository
+
+
+# Repositorio asíncrono para supervisores (Supervisor), equivalente a SupervisorRepository
+class AsyncSupervisorRepository(AsyncBaseUserRepository):
+    _TABLE_NAME = "supervisors"
+    _EXTRA_COLUMN = "assigned_area"
+
+    # Mismo mapeo fila -> entidad que el repositorio síncrono
+    _row_to_entity = staticmethod(SupervisorRepository._map_to_supervisor)
@@ -0,0 +1,11 @@
+from enertech.src.repository.AsyncBaseUserRepository import AsyncBaseUserRepository
+from enertech.src.repository.TechnicianRepository import TechnicianRepository
+
+
+# Repositorio asíncrono para técnicos (Technician), equivalente a TechnicianRepository
+class AsyncTechnicianRepository(AsyncBaseUserRepository):
+    _TABLE_NAME = "technicians"
+    _EXTRA_COLUMN = "max_active_orders"
+
+    # Mismo mapeo fila -> entidad que el repositorio síncrono
+    _row_to_entity = staticmethod(TechnicianRepository._row_to_entity)
@@ -0,0 +1,101 @@
+from typing import Optional, List
+from enertech.src.database.AsyncDatabaseManager import AsyncDatabaseManager
+from enertech.src.domain.WorkOrder import WorkOrder
+from enertech.src.repository.Criteria import Criteria
+from enertech.src.repository.WorkOrderRepository import WorkOrderRepository
+
+
+# Repositorio asíncrono para órdenes de trabajo (WorkOrder), equivalente a WorkOrderRepository
+class AsyncWorkOrderRepository:
+    def __init__(self, db_manager: AsyncDatabaseManager):
+        # Constructor que recibe un gestor asíncrono de base de datos
+        self._db_manager = db_manager
+
+    def unit_of_work(self):
+        """Abre una unidad de trabajo compartida por todos los repositorios del mismo AsyncDatabaseManager"""
+        return self._db_manager.unit_of_work()
+
+    async def save(self, order: WorkOrder) -> WorkOrder:
+        # Inserta una nueva orden de trabajo y devuelve la entidad creada con el ID asignado
+        query = """
+                INSERT INTO WORK_ORDERS (title, assigned_to, created_by, asset_id, maintenance_type, priority, status,
+                                         opened_at, estimated_time, estimated_time_unit, description)
+                VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s) RETURNING id, title, assigned_to, created_by, asset_id, maintenance_type, priority, status, opened_at, 
+                resolved_at, estimated_time, estimated_time_unit, resolved_on_time, description, closure_comments; \
+                """
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (order.title, order.assigned_to, order.created_by, order.asset_id,
+                                         order.maintenance_type.value, order.priority.value, order.status.value,
+                                         order.opened_at, order.estimated_time,
+                                         order.estimated_time_unit.value, order.description))
+            row = await cursor.fetchone()
+        return self._row_to_entity(row)
+
+    async def update(self, order: WorkOrder) -> Optional[WorkOrder]:
+        # Actualiza una orden de trabajo existente y devuelve la entidad actualizada
+        query = """
+                UPDATE WORK_ORDERS
+                SET title               = %s,
+                    created_by          = %s,
+                    asset_id            = %s,
+                    maintenance_type    = %s,
+                    priority            = %s,
+                    estimated_time      = %s,
+                    estimated_time_unit = %s,
+                    description         = %s,
+                    assigned_to         = %s,
+                    opened_at           = %s,
+                    resolved_at         = %s,
+                    closure_comments    = %s,
+                    status              = %s
+                WHERE id = %s RETURNING id, title, assigned_to, created_by, asset_id, maintenance_type, priority, status, opened_at, 
+                resolved_at, estimated_time, estimated_time_unit, resolved_on_time, description, closure_comments; \
+                """
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (
+                order.title,
+                order.created_by,
+                order.asset_id,
+                order.maintenance_type.value,
+                order.priority.value,
+                order.estimated_time,
+                order.estimated_time_unit.value,
+                order.description,
+                order.assigned_to,
+                order.opened_at,
+                order.resolved_at,
+                order.closure_comments,
+                order.status.value,
+                order.id
+            ))
+            row = await cursor.fetchone()
+        return self._row_to_entity(row) if row else None
+
+    async def get_by_id(self, order_id: int) -> Optional[WorkOrder]:
+        # Busca y devuelve una orden de trabajo por su ID, o None si no existe
+        query = f"SELECT {', '.join(self._COLUMNS)} FROM WORK_ORDERS WHERE id = %s"
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (order_id,))
+            row = await cursor.fetchone()
+        return self._row_to_entity(row) if row else None
+
+    async def list_by_criteria(self, criteria: dict) -> List[WorkOrder]:
+        """
+        Lista las órdenes de trabajo que cumplan con ciertos criterios de búsqueda (filtros)
+        :param criteria: Diccionario con valores de tipo columna: valor. Ej.: {'created_by': '1', 'assigned_to': 5}
+        :return: Lista de órdenes filtrada. Si no aplican filtros, devuelve todos los registros de la tabla.
+        """
+        _TABLE_NAME = "WORK_ORDERS"
+        results = await Criteria.list_by_criteria_async(_TABLE_NAME, self._db_manager, criteria,
+                                                        self._COLUMNS)
+        return [self._row_to_entity(result) for result in results]
+
+    async def delete(self, order_id: int) -> None:
+        """Elimina una orden de trabajo por ID"""
+        query = "DELETE FROM WORK_ORDERS WHERE id = %s"
+        async with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            await cursor.execute(query, (order_id,))
+
+    # Mismo mapeo fila -> entidad que el repositorio síncrono
+    _COLUMNS = WorkOrderRepository._COLUMNS
+    _row_to_entity = staticmethod(WorkOrderRepository._row_to_entity)
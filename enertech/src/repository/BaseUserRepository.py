@@ -1,13 +1,41 @@
 from abc import ABC, abstractmethod
-from typing import List
+from contextlib import AbstractContextManager
+from typing import Callable, Iterator, List, Optional
 
 from enertech.src.database.DatabaseManager import DatabaseManager
 from enertech.src.domain.User import User
+from enertech.src.repository.EntityCache import EntityCache
+from enertech.src.repository.Page import Page
 
 
 class BaseUserRepository(ABC):
-    def __init__(self, db_manager: DatabaseManager):
+    def __init__(self, db_manager: DatabaseManager, cache: Optional[EntityCache] = None):
         self._db_manager = db_manager
+        self._cache = cache
+
+    @property
+    def cache(self) -> Optional[EntityCache]:
+        return self._cache
+
+    def _cached(self, key, loader: Callable[[], Optional[User]]) -> Optional[User]:
+        """[USO INTERNO] Busca un usuario por ID o por ('email', email) en la caché, si hay, o con loader"""
+        if self._cache is None:
+            return loader()
+        # Lo que se guarda en caché se lee del primario: una réplica atrasada podría devolver una fila ya
+        # invalidada por otro hilo y la caché la conservaría durante todo el TTL
+        with self._db_manager.use_primary():
+            return self._cache.get_or_load(key, loader, lambda user: (('email', user.email),))
+
+    def _evict(self, user_id: int):
+        """[USO INTERNO] Invalida un usuario modificado ahora y otra vez al terminar la transacción"""
+        if self._cache is not None and user_id is not None:
+            # La segunda invalidación descarta lo que se haya leído dentro de una unidad de trabajo revertida
+            self._cache.invalidate(user_id)
+            self._db_manager.after_transaction(lambda: self._cache.invalidate(user_id))
+
+    def unit_of_work(self) -> AbstractContextManager:
+        """Abre una unidad de trabajo compartida por todos los repositorios del mismo DatabaseManager"""
+        return self._db_manager.unit_of_work()
 
     @abstractmethod
     def save(self, user: User) -> User:
@@ -36,3 +64,11 @@ class BaseUserRepository(ABC):
     @abstractmethod
     def list_by_criteria(self, filters: dict) -> List[User]:
         pass
+
+    @abstractmethod
+    def iter_by_criteria(self, filters: dict, itersize: int = 2000) -> Iterator[User]:
+        pass
+
+    @abstractmethod
+    def page_by_criteria(self, filters: dict, page_size: int = 50, after: Optional[str] = None) -> Page[User]:
+        pass
@@ -0,0 +1,43 @@
+import csv
+import io
+from itertools import islice
+from typing import Any, Iterable, Sequence
+
+import psycopg2
+
+
+class BulkCopy:
+    # Representación de NULL en el COPY; así una cadena vacía sigue siendo una cadena vacía
+    _NULL = r'\N'
+
+    def __init__(self):
+        pass
+
+    @staticmethod
+    def copy_rows(cursor: psycopg2.extensions.cursor, table_name: str, columns: Sequence[str],
+                  rows: Iterable[Sequence[Any]], chunk_size: int = 10_000) -> int:
+        """
+        Carga filas en una tabla con COPY ... FROM STDIN (formato CSV), enviándolas en bloques de chunk_size
+        filas para que la memoria usada no dependa del total de filas.
+        :param cursor: Cursor de la conexión (la transacción la confirma quien lo abrió).
+        :param table_name: Tabla destino.
+        :param columns: Columnas destino, en el mismo orden que los valores de cada fila.
+        :param rows: Iterable de filas; los valores None se cargan como NULL.
+        :param chunk_size: Cantidad de filas por cada COPY.
+        :return: Cantidad de filas cargadas.
+        """
+        query = (f"COPY {table_name} ({', '.join(columns)}) "
+                 f"FROM STDIN WITH (FORMAT csv, NULL '{BulkCopy._NULL}')")
+        rows = iter(rows)
+        total = 0
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            buffer = io.StringIO()
+            writer = csv.writer(buffer, lineterminator='\n')
+            writer.writerows([BulkCopy._NULL if value is None else value for value in row] for row in chunk)
+            buffer.seek(0)
+            cursor.copy_expert(query, buffer)
+            total += len(chunk)
+        return total
@@ -0,0 +1,22 @@
+from enum import Enum
+
+
+class ColumnKind(Enum):
+    """
+    Tipo lógico de una columna filtrable, usado por Criteria para decidir cómo compilar cada filtro.
+    Valores:
+    - ID: Clave primaria o foránea (igualdad).
+    - ENUM: Valor de un enumerador del dominio guardado como texto (igualdad).
+    - BOOLEAN: Verdadero/falso (igualdad).
+    - INTEGER: Número entero (igualdad o rango).
+    - DATE: Fecha (igualdad o rango).
+    - TIMESTAMP: Fecha y hora (igualdad o rango).
+    - TEXT: Texto libre (búsqueda parcial sin distinguir mayúsculas).
+    """
+    ID = 'ID'
+    ENUM = 'ENUM'
+    BOOLEAN = 'BOOLEAN'
+    INTEGER = 'INTEGER'
+    DATE = 'DATE'
+    TIMESTAMP = 'TIMESTAMP'
+    TEXT = 'TEXT'
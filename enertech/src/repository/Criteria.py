@@ -1,16 +1,49 @@
-from typing import Any, List
+import uuid
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Iterator, List, Optional, Sequence, Tuple, TYPE_CHECKING
 
 from enertech.src.AppLogger import AppLogger
 from enertech.src.database.DatabaseManager import DatabaseManager
+from enertech.src.repository.ColumnKind import ColumnKind
+from enertech.src.repository.Page import Page
+
+if TYPE_CHECKING:  # psycopg (v3) solo es necesario para la capa asíncrona
+    from enertech.src.database.AsyncDatabaseManager import AsyncDatabaseManager
 
 
 class Criteria:
     _logger = AppLogger.setup_logger(__name__)
+    _OPERATORS = ('eq', 'in', 'range', 'prefix', 'contains')
+    _RANGE_KINDS = (ColumnKind.ID, ColumnKind.INTEGER, ColumnKind.DATE, ColumnKind.TIMESTAMP)
+    _USER_COLUMNS = {'id': ColumnKind.ID, 'first_name': ColumnKind.TEXT, 'last_name': ColumnKind.TEXT,
+                     'email': ColumnKind.TEXT, 'rol': ColumnKind.ENUM, 'active': ColumnKind.BOOLEAN}
+    # Columnas filtrables de cada tabla (las que no figuran, como password, no se pueden usar como criterio)
+    _TABLE_COLUMNS = {
+        'work_orders': {
+            'id': ColumnKind.ID, 'title': ColumnKind.TEXT, 'assigned_to': ColumnKind.ID,
+            'created_by': ColumnKind.ID, 'asset_id': ColumnKind.ID, 'maintenance_type': ColumnKind.ENUM,
+            'priority': ColumnKind.ENUM, 'status': ColumnKind.ENUM, 'opened_at': ColumnKind.TIMESTAMP,
+            'resolved_at': ColumnKind.TIMESTAMP, 'estimated_time': ColumnKind.INTEGER,
+            'estimated_time_unit': ColumnKind.ENUM, 'resolved_on_time': ColumnKind.BOOLEAN,
+            'description': ColumnKind.TEXT, 'closure_comments': ColumnKind.TEXT,
+            'deadline_at': ColumnKind.TIMESTAMP, 'overdue': ColumnKind.BOOLEAN, 'updated_at': ColumnKind.TIMESTAMP,
+        },
+        'industrial_assets': {
+            'id': ColumnKind.ID, 'acquisition_date': ColumnKind.DATE, 'location': ColumnKind.TEXT,
+            'model': ColumnKind.TEXT, 'asset_type': ColumnKind.TEXT,
+        },
+        'admins': {**_USER_COLUMNS, 'department': ColumnKind.TEXT},
+        'supervisors': {**_USER_COLUMNS, 'assigned_area': ColumnKind.TEXT},
+        'technicians': {**_USER_COLUMNS, 'max_active_orders': ColumnKind.INTEGER},
+    }
+
     def __init__(self):
         pass
 
     @staticmethod
-    def list_by_criteria(table_name: str, db_connection: DatabaseManager, criteria: dict) -> List[Any]:
+    def list_by_criteria(table_name: str, db_connection: DatabaseManager, criteria: dict,
+                         columns: Optional[Sequence[str]] = None) -> List[Any]:
         """
         Permite obtener los resultados de una tabla en determinada base de datos. Si aplican filtros (criterio),
         devuelve los resultados filtrados, caso contrario devuelve todos los resultados o devuelve una lista
@@ -18,29 +51,229 @@ class Criteria:
         :param table_name: Nombre de la tabla en la base de datos a buscar.
         :param db_connection: Conexión de la base de datos.
         :param criteria: Criterios de filtrado, ej.: {'columna_en_la_tabla': 'valor_en_la_columna'}. Por defecto None.
+        :param columns: Columnas a leer, en el orden en que se devuelven; None para todas.
         :return: Lista de tuplas con los resultados según sí aplica filtros o no. Retorna None si no hay resultados.
         """
-        base_query = f"SELECT * FROM {table_name}"
+        base_query, params = Criteria.build_query(table_name, criteria, columns)
+        with db_connection.connection(readonly=True) as conn, conn.cursor() as cursor:
+            Criteria._logger.debug(f"Executing query: {base_query} with params: {params}")
+            cursor.execute(base_query, params)
+            results = cursor.fetchall()
+        return results
 
-        where_clauses = []
-        params = []
+    @staticmethod
+    def iter_by_criteria(table_name: str, db_connection: DatabaseManager, criteria: dict,
+                         itersize: int = 2000, columns: Optional[Sequence[str]] = None) -> Iterator[Any]:
+        """
+        Igual que list_by_criteria, pero devuelve los resultados de a uno usando un cursor del lado del servidor
+        (cursor con nombre): las filas se traen en lotes de itersize, así la memoria usada no depende de la
+        cantidad de resultados. La conexión queda prestada hasta terminar de recorrer el generador.
+        :param table_name: Nombre de la tabla en la base de datos a buscar.
+        :param db_connection: Conexión de la base de datos.
+        :param criteria: Criterios de filtrado, ej.: {'columna_en_la_tabla': 'valor_en_la_columna'}.
+        :param itersize: Cantidad de filas traídas del servidor en cada viaje.
+        :param columns: Columnas a leer, en el orden en que se devuelven; None para todas.
+        :return: Generador de tuplas con los resultados.
+        """
+        base_query, params = Criteria.build_query(table_name, criteria, columns)
+        with db_connection.connection(readonly=True) as conn, \
+                conn.cursor(name=f"criteria_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = itersize
+            Criteria._logger.debug(f"Streaming query: {base_query} with params: {params}")
+            cursor.execute(base_query, params)
+            yield from cursor
 
-        if criteria:
-            for field, value in criteria.items():
-                if value is not None:
-                    if isinstance(value, int):
-                        where_clauses.append(f"{field} = %s")
-                        params.append(value)
-                    else:
-                        where_clauses.append(f"{field} ILIKE %s")  # ILIKE para case-insensitive
-                        params.append(f"%{value}%")  # Wildcards para búsqueda parcial
+    @staticmethod
+    async def list_by_criteria_async(table_name: str, db_connection: "AsyncDatabaseManager",
+                                     criteria: dict, columns: Optional[Sequence[str]] = None) -> List[Any]:
+        """
+        Versión asíncrona de list_by_criteria, con los mismos filtros y resultados.
+        :param table_name: Nombre de la tabla en la base de datos a buscar.
+        :param db_connection: Gestor asíncrono de la base de datos.
+        :param criteria: Criterios de filtrado, ej.: {'columna_en_la_tabla': 'valor_en_la_columna'}.
+        :param columns: Columnas a leer, en el orden en que se devuelven; None para todas.
+        :return: Lista de tuplas con los resultados.
+        """
+        base_query, params = Criteria.build_query(table_name, criteria, columns)
+        async with db_connection.connection() as conn, conn.cursor() as cursor:
+            Criteria._logger.debug(f"Executing query: {base_query} with params: {params}")
+            await cursor.execute(base_query, params)
+            return await cursor.fetchall()
 
-        if where_clauses:
-            base_query += " WHERE " + " AND ".join(where_clauses)
+    @staticmethod
+    def page_by_criteria(table_name: str, db_connection: DatabaseManager, criteria: dict, page_size: int = 50,
+                         sort_key: str = 'id', after: Optional[str] = None,
+                         columns: Optional[Sequence[str]] = None) -> Page[Any]:
+        """
+        Devuelve una página de resultados usando paginación por keyset (seek): en lugar de OFFSET se filtra
+        por (sort_key, id) > (valores de la última fila de la página anterior), así cualquier página cuesta lo
+        mismo que la primera si existe un índice sobre (sort_key, id).
+        :param table_name: Nombre de la tabla en la base de datos a buscar.
+        :param db_connection: Conexión de la base de datos.
+        :param criteria: Criterios de filtrado, ej.: {'columna_en_la_tabla': 'valor_en_la_columna'}.
+        :param page_size: Cantidad máxima de filas por página.
+        :param sort_key: Columna de orden (no nula). El id se agrega como desempate.
+        :param after: Cursor opaco devuelto en next_cursor de la página anterior; None para la primera página.
+        :param columns: Columnas a leer; deben incluir el id y la columna de orden. None para todas.
+        :return: Page con las tuplas de la página y el cursor de la siguiente.
+        """
+        if not isinstance(page_size, int) or page_size <= 0:
+            raise ValueError("page_size debe ser un entero positivo")
+        if sort_key not in Criteria._columns_of(table_name):
+            raise ValueError(f"Columna de orden inválida: {sort_key}")
+        where_clause, params = Criteria.build_where(table_name, criteria)
+        conditions = [where_clause] if where_clause else []
+        order_columns = ['id'] if sort_key == 'id' else [sort_key, 'id']
+        if columns is not None and not set(order_columns) <= set(columns):
+            raise ValueError(f"Las columnas leídas deben incluir {', '.join(order_columns)} para paginar")
+        if after is not None:
+            seek_values = Page.decode_cursor(after)
+            if len(seek_values) != len(order_columns):
+                raise ValueError("El cursor no corresponde a la columna de orden indicada")
+            conditions.append(f"({', '.join(order_columns)}) > ({', '.join(['%s'] * len(order_columns))})")
+            params.extend(seek_values)
+        base_query = f"SELECT {Criteria._select_list(columns)} FROM {Criteria._normalize_table(table_name)}"
+        if conditions:
+            base_query += " WHERE " + " AND ".join(conditions)
+        base_query += f" ORDER BY {', '.join(order_columns)} LIMIT %s"
+        params.append(page_size + 1)  # una fila extra indica si hay página siguiente
 
-        with db_connection.get_connection().cursor() as cursor:
+        with db_connection.connection(readonly=True) as conn, conn.cursor() as cursor:
             Criteria._logger.debug(f"Executing query: {base_query} with params: {params}")
             cursor.execute(base_query, params)
-            results = cursor.fetchall()
-            db_connection.close_connection()
-        return results
+            rows = cursor.fetchall()
+            column_names = [column.name for column in cursor.description]
+        if len(rows) <= page_size:
+            return Page(rows)
+        rows = rows[:page_size]
+        last_row = rows[-1]
+        next_cursor = Page.encode_cursor([last_row[column_names.index(column)] for column in order_columns])
+        return Page(rows, next_cursor)
+
+    @staticmethod
+    def build_query(table_name: str, criteria: dict,
+                    columns: Optional[Sequence[str]] = None) -> Tuple[str, List[Any]]:
+        """
+        Construye la consulta SELECT con sus parámetros a partir de los criterios de filtrado.
+        :param table_name: Nombre de la tabla en la base de datos a buscar.
+        :param criteria: Criterios de filtrado, ej.: {'columna_en_la_tabla': 'valor_en_la_columna'}.
+        :param columns: Columnas a leer (las define el repositorio, no se toman de la entrada del usuario); None para todas.
+        :return: Tupla (consulta, parámetros).
+        """
+        where_clause, params = Criteria.build_where(table_name, criteria)
+        base_query = f"SELECT {Criteria._select_list(columns)} FROM {Criteria._normalize_table(table_name)}"
+        if where_clause:
+            base_query += " WHERE " + where_clause
+        return base_query, params
+
+    @staticmethod
+    def build_where(table_name: str, criteria: dict) -> Tuple[str, List[Any]]:
+        """
+        Compila los criterios a una condición WHERE (sin la palabra WHERE) según el tipo de cada columna.
+        Cada valor puede ser un valor simple o un diccionario con un único operador:
+        - {'eq': valor}: igualdad. Es el operador por defecto salvo en columnas de texto.
+        - {'in': [valores]}: igualdad contra cualquiera de los valores (= ANY).
+        - {'range': (desde, hasta)}: desde <= columna < hasta; cualquiera de los extremos puede ser None.
+        - {'prefix': texto}: el texto empieza con el valor (solo columnas de texto).
+        - {'contains': texto}: el texto contiene el valor (solo columnas de texto, operador por defecto).
+        Los enums del dominio se convierten a su valor. Los criterios con valor None se ignoran.
+        :param table_name: Nombre de la tabla en la base de datos a buscar.
+        :param criteria: Criterios de filtrado.
+        :return: Tupla (condición, parámetros); la condición es una cadena vacía si no hay filtros.
+        """
+        columns = Criteria._columns_of(table_name)
+        shape = []
+        params = []
+        for column, value in (criteria or {}).items():
+            kind = columns.get(column)
+            if kind is None:
+                raise ValueError(f"No se puede filtrar {Criteria._normalize_table(table_name)} por la columna '{column}'")
+            if value is None:
+                continue
+            operator, operand = Criteria._split_operator(column, kind, value)
+            if operator == 'range':
+                lower, upper = operand
+                shape.append((column, operator, lower is not None, upper is not None))
+                params.extend(Criteria._to_db_value(bound) for bound in operand if bound is not None)
+            elif operator == 'in':
+                shape.append((column, operator))
+                params.append([Criteria._to_db_value(item) for item in operand])
+            elif operator == 'prefix':
+                shape.append((column, operator))
+                params.append(f"{Criteria._escape_like(operand)}%")
+            elif operator == 'contains':
+                shape.append((column, operator))
+                params.append(f"%{Criteria._escape_like(operand)}%")
+            else:
+                shape.append((column, operator))
+                params.append(Criteria._to_db_value(operand))
+        return Criteria._compile_where(tuple(shape)), params
+
+    @staticmethod
+    @lru_cache(maxsize=256)
+    def _compile_where(shape: Tuple[tuple, ...]) -> str:
+        # El SQL depende solo de la forma de los criterios (columnas y operadores), no de los valores,
+        # así que se compila una vez por forma y se reutiliza
+        clauses = []
+        for column, operator, *bounds in shape:
+            if operator == 'range':
+                has_lower, has_upper = bounds
+                if has_lower:
+                    clauses.append(f"{column} >= %s")
+                if has_upper:
+                    clauses.append(f"{column} < %s")
+            elif operator == 'in':
+                clauses.append(f"{column} = ANY(%s)")
+            elif operator in ('prefix', 'contains'):
+                clauses.append(f"{column} ILIKE %s")  # ILIKE para case-insensitive
+            else:
+                clauses.append(f"{column} = %s")
+        return " AND ".join(clauses)
+
+    @staticmethod
+    def _split_operator(column: str, kind: ColumnKind, value: Any) -> Tuple[str, Any]:
+        """[USO INTERNO] Separa el operador del valor de un criterio y valida que aplique al tipo de la columna"""
+        if isinstance(value, dict):
+            if len(value) != 1:
+                raise ValueError(f"El criterio de '{column}' debe tener un único operador")
+            operator, operand = next(iter(value.items()))
+        else:
+            operator, operand = ('contains' if kind == ColumnKind.TEXT else 'eq'), value
+        if operator not in Criteria._OPERATORS:
+            raise ValueError(f"Operador desconocido para '{column}': {operator}")
+        if operator in ('prefix', 'contains') and kind != ColumnKind.TEXT:
+            raise ValueError(f"El operador {operator} solo aplica a columnas de texto ('{column}' es {kind.value})")
+        if operator == 'range':
+            if kind not in Criteria._RANGE_KINDS:
+                raise ValueError(f"El operador range no aplica a '{column}' ({kind.value})")
+            if not isinstance(operand, (tuple, list)) or len(operand) != 2 or operand == (None, None):
+                raise ValueError(f"range de '{column}' debe ser (desde, hasta) con al menos un extremo")
+            operand = tuple(operand)
+        if operator == 'in' and not isinstance(operand, (list, tuple, set, frozenset)):
+            raise ValueError(f"in de '{column}' debe ser una lista de valores")
+        return operator, operand
+
+    @staticmethod
+    def _columns_of(table_name: str) -> dict:
+        table = Criteria._normalize_table(table_name)
+        columns = Criteria._TABLE_COLUMNS.get(table)
+        if columns is None:
+            raise ValueError(f"Tabla sin metadatos de columnas: {table}")
+        return columns
+
+    @staticmethod
+    def _select_list(columns: Optional[Sequence[str]]) -> str:
+        return '*' if columns is None else ', '.join(columns)
+
+    @staticmethod
+    def _normalize_table(table_name: str) -> str:
+        return table_name.lower()
+
+    @staticmethod
+    def _to_db_value(value: Any) -> Any:
+        return value.value if isinstance(value, Enum) else value
+
+    @staticmethod
+    def _escape_like(value: Any) -> str:
+        # Los comodines escritos por el usuario se buscan literalmente
+        return str(value).replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
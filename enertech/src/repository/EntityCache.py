@@ -0,0 +1,116 @@
+import copy
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional, Tuple
+
+
+class EntityCache:
+    """
+    Caché en memoria de entidades por ID, con desalojo LRU y vencimiento (TTL), para filas que casi no cambian
+    (activos, supervisores, técnicos). Cada entidad se guarda una sola vez por ID; las búsquedas por otra clave
+    (ej.: ('email', ...)) usan alias que apuntan al ID, así que invalidar el ID invalida también sus alias.
+    Devuelve copias: modificar la entidad obtenida no altera la guardada hasta que se persiste y se invalida.
+    El TTL acota cuánto puede quedar desactualizada una entidad modificada por otro proceso.
+    """
+
+    def __init__(self, max_size: int = 1024, ttl: float = 300.0):
+        """
+        :param max_size: Cantidad máxima de entidades; al superarla se desaloja la usada hace más tiempo.
+        :param ttl: Segundos que una entidad se considera válida desde que se leyó de la base de datos.
+        """
+        if max_size <= 0:
+            raise ValueError("max_size debe ser un entero positivo")
+        self._max_size = max_size
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._entries: OrderedDict[Any, Tuple[Any, float, Tuple[Hashable, ...]]] = OrderedDict()
+        self._aliases: Dict[Hashable, Any] = {}
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+        self._invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """
+        Busca una entidad por ID o por alias.
+        :return: Copia de la entidad, o None si no está o venció.
+        """
+        with self._lock:
+            entity_id = self._aliases.get(key, key)
+            entry = self._entries.get(entity_id)
+            if entry is not None and entry[1] <= time.monotonic():
+                self._remove(entity_id)
+                self._expirations += 1
+                entry = None
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(entity_id)
+            self._hits += 1
+            return copy.copy(entry[0])
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Optional[Any]],
+                    aliases: Callable[[Any], Iterable[Hashable]] = lambda entity: ()) -> Optional[Any]:
+        """
+        Devuelve la entidad de la caché o, si no está, la lee con loader y la guarda (las ausencias no se guardan).
+        :param key: ID o alias buscado.
+        :param loader: Función que lee la entidad de la base de datos; devuelve None si no existe.
+        :param aliases: Función que devuelve los alias de la entidad leída.
+        :return: Copia de la entidad, o None si no existe.
+        """
+        entity = self.get(key)
+        if entity is not None:
+            return entity
+        entity = loader()
+        if entity is not None:
+            self.put(entity, aliases(entity))
+            entity = copy.copy(entity)
+        return entity
+
+    def put(self, entity: Any, aliases: Iterable[Hashable] = ()):
+        """Guarda una entidad (con ID) y sus alias, reemplazando la versión anterior si la había"""
+        aliases = tuple(aliases)
+        with self._lock:
+            self._remove(entity.id)
+            self._entries[entity.id] = (entity, time.monotonic() + self._ttl, aliases)
+            for alias in aliases:
+                self._aliases[alias] = entity.id
+            while len(self._entries) > self._max_size:
+                self._remove(next(iter(self._entries)))
+                self._evictions += 1
+
+    def invalidate(self, entity_id: Any):
+        """Descarta una entidad y sus alias (tras modificarla o eliminarla)"""
+        with self._lock:
+            if self._remove(entity_id):
+                self._invalidations += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+
+    def stats(self) -> dict:
+        """Métricas de uso: aciertos, fallos, desalojos por tamaño, vencimientos, invalidaciones y tamaño actual"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_ratio': self._hits / lookups if lookups else 0.0,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+                'invalidations': self._invalidations,
+                'size': len(self._entries),
+            }
+
+    def _remove(self, entity_id: Any) -> bool:
+        entry = self._entries.pop(entity_id, None)
+        if entry is None:
+            return False
+        for alias in entry[2]:
+            if self._aliases.get(alias) == entity_id:
+                del self._aliases[alias]
+        return True
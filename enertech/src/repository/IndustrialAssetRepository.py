@@ -1,12 +1,41 @@
-from typing import Optional, List
+from contextlib import AbstractContextManager
+from typing import Iterable, Iterator, Optional, List, Sequence
+import psycopg2
 from enertech.src.database.DatabaseManager import DatabaseManager
 from enertech.src.domain.IndustrialAsset import IndustrialAsset
+from enertech.src.repository.BulkCopy import BulkCopy
 from enertech.src.repository.Criteria import Criteria
+from enertech.src.repository.EntityCache import EntityCache
+from enertech.src.repository.Page import Page
+from enertech.src.repository.Projection import Projection
 
 
 class IndustrialAssetRepository:
-    def __init__(self, db_manager: DatabaseManager):
+    # Columnas que se leen para construir la entidad, en el orden que espera _row_to_entity
+    _COLUMNS = ('id', 'asset_type', 'model', 'location', 'acquisition_date')
+    # Proyecciones con nombre para los listados (ver list_projection)
+    _VIEWS = {
+        'summary': ('id', 'asset_type', 'model', 'location'),
+    }
+    # Columnas por las que se puede paginar (cada una tiene un índice compuesto con el id)
+    _SORT_KEYS = ('id', 'acquisition_date')
+
+    def __init__(self, db_manager: DatabaseManager, cache: Optional[EntityCache] = None):
+        """
+        Args:
+            db_manager: Gestor de la base de datos.
+            cache: Caché opcional para get_by_id; update y delete invalidan sus entradas.
+        """
         self._db_manager = db_manager
+        self._cache = cache
+
+    @property
+    def cache(self) -> Optional[EntityCache]:
+        return self._cache
+
+    def unit_of_work(self) -> AbstractContextManager:
+        """Abre una unidad de trabajo compartida por todos los repositorios del mismo DatabaseManager"""
+        return self._db_manager.unit_of_work()
 
     def save(self, asset: IndustrialAsset) -> IndustrialAsset:
         """
@@ -20,17 +49,37 @@ class IndustrialAssetRepository:
                 INSERT INTO INDUSTRIAL_ASSETS (asset_type, model, location, acquisition_date)
                 VALUES (%s, %s, %s, %s) RETURNING id, asset_type, model, location, acquisition_date;
                 """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(
                 query,
                 (asset.asset_type, asset.model, asset.location, asset.acquisition_date)
             )
-            self._db_manager.commit_transaction()
             result = cursor.fetchone()
             asset_saved = self._row_to_entity(result)
-            self._db_manager.close_connection()
         return asset_saved
 
+    def copy_many(self, assets: Iterable[IndustrialAsset]) -> int:
+        """
+        Carga muchos activos con COPY, sin devolver los IDs generados.
+        Dentro de una unidad de trabajo, varias llamadas forman parte de la misma transacción. Si COPY falla, solo
+        se deshace esta carga (SAVEPOINT) y la excepción se propaga: la transacción externa sigue utilizable.
+        Args:
+            assets: Activos a cargar.
+        Returns:
+            Cantidad de activos cargados.
+        """
+        column_names = ('asset_type', 'model', 'location', 'acquisition_date')
+        rows = ((asset.asset_type, asset.model, asset.location, asset.acquisition_date) for asset in assets)
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SAVEPOINT copy_many")
+            try:
+                copied = BulkCopy.copy_rows(cursor, 'INDUSTRIAL_ASSETS', column_names, rows)
+            except psycopg2.Error:
+                cursor.execute("ROLLBACK TO SAVEPOINT copy_many")
+                raise
+            cursor.execute("RELEASE SAVEPOINT copy_many")
+            return copied
+
     def update(self, asset: IndustrialAsset) -> IndustrialAsset | None:
         """
         Actualiza un IndustrialAsset en la base de datos solo si hay cambios reales.
@@ -68,14 +117,13 @@ class IndustrialAssetRepository:
         for field in column_names:
             if hasattr(asset, field) and getattr(asset, field) is not None:
                 params.append(getattr(asset, field))
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, params)
-            self._db_manager.commit_transaction()
             result = cursor.fetchone()
-            self._db_manager.close_connection()
             if not result:
                 return None
             asset_updated = self._row_to_entity(result)
+        self._evict(asset.id)
         return asset_updated
 
     def get_by_id(self, asset_id: int) -> Optional[IndustrialAsset]:
@@ -86,16 +134,22 @@ class IndustrialAssetRepository:
         Returns:
             Activo industrial encontrado o None si no existe.
         """
-        with self._db_manager.get_connection().cursor() as cursor:
-            cursor.execute(
-                "SELECT * FROM INDUSTRIAL_ASSETS WHERE id = %s",
-                (asset_id,)
-            )
-            row = cursor.fetchone()
-            self._db_manager.close_connection()
-            if row:
-                return self._row_to_entity(row)
-        return None
+        def load() -> Optional[IndustrialAsset]:
+            with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+                cursor.execute(
+                    f"SELECT {', '.join(self._COLUMNS)} FROM INDUSTRIAL_ASSETS WHERE id = %s",
+                    (asset_id,)
+                )
+                row = cursor.fetchone()
+                if row:
+                    return self._row_to_entity(row)
+            return None
+
+        if self._cache is None:
+            return load()
+        # Lo que se guarda en caché se lee del primario (ver BaseUserRepository._cached)
+        with self._db_manager.use_primary():
+            return self._cache.get_or_load(asset_id, load)
 
     def list_by_criteria(self, filters: dict) -> List[IndustrialAsset]:
         """
@@ -106,22 +160,91 @@ class IndustrialAssetRepository:
             Lista de IndustrialAsset que cumplen con los filtros (o todos si no hay filtros)
         """
         _TABLE_NAME = "INDUSTRIAL_ASSETS"
-        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, filters)
+        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, filters, self._COLUMNS)
         return [self._row_to_entity(result) for result in results]
 
+    def list_projection(self, filters: dict, projection: str | Sequence[str] = 'summary') -> List[tuple]:
+        """
+        Igual que list_by_criteria, pero lee solo las columnas de la proyección y devuelve modelos de lectura.
+        Args:
+            filters: Diccionario con filtros columna : valor.
+            projection: Nombre de una vista ('summary') o lista de columnas.
+        Returns:
+            Lista de namedtuple con un campo por columna.
+        """
+        _TABLE_NAME = "INDUSTRIAL_ASSETS"
+        view = Projection.resolve(projection, self._VIEWS, self._COLUMNS)
+        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, filters, view.fields)
+        return [view.to_model(result) for result in results]
+
+    def iter_by_criteria(self, filters: dict, itersize: int = 2000) -> Iterator[IndustrialAsset]:
+        """
+        Igual que list_by_criteria, pero devuelve los activos de a uno con un cursor del lado del servidor.
+        Args:
+            filters: Diccionario con filtros columna : valor.
+            itersize: Cantidad de filas traídas del servidor en cada viaje.
+        Returns:
+            Generador de IndustrialAsset que cumplen con los filtros.
+        """
+        _TABLE_NAME = "INDUSTRIAL_ASSETS"
+        for row in Criteria.iter_by_criteria(_TABLE_NAME, self._db_manager, filters, itersize,
+                                             self._COLUMNS):
+            yield self._row_to_entity(row)
+
+    def page_by_criteria(self, filters: dict, page_size: int = 50, sort_key: str = 'id',
+                         after: Optional[str] = None) -> Page[IndustrialAsset]:
+        """
+        Igual que list_by_criteria, pero de a una página por vez con paginación por keyset.
+        Args:
+            filters: Diccionario con filtros columna : valor.
+            page_size: Cantidad máxima de activos por página.
+            sort_key: Columna de orden, una de id, acquisition_date.
+            after: next_cursor de la página anterior; None para la primera página.
+        Returns:
+            Page de IndustrialAsset y el cursor de la página siguiente.
+        """
+        if sort_key not in self._SORT_KEYS:
+            raise ValueError(f"No se puede ordenar por {sort_key}")
+        _TABLE_NAME = "INDUSTRIAL_ASSETS"
+        page = Criteria.page_by_criteria(_TABLE_NAME, self._db_manager, filters, page_size,
+                                         sort_key, after, self._COLUMNS)
+        return Page([self._row_to_entity(row) for row in page.items], page.next_cursor)
+
+    def page_projection(self, filters: dict, projection: str | Sequence[str] = 'summary', page_size: int = 50,
+                        sort_key: str = 'id', after: Optional[str] = None) -> Page[tuple]:
+        """
+        Igual que page_by_criteria, pero con los modelos de lectura de list_projection.
+        La proyección debe incluir el id y la columna de orden.
+        """
+        if sort_key not in self._SORT_KEYS:
+            raise ValueError(f"No se puede ordenar por {sort_key}")
+        _TABLE_NAME = "INDUSTRIAL_ASSETS"
+        view = Projection.resolve(projection, self._VIEWS, self._COLUMNS)
+        page = Criteria.page_by_criteria(_TABLE_NAME, self._db_manager, filters, page_size,
+                                         sort_key, after, view.fields)
+        return Page([view.to_model(row) for row in page.items], page.next_cursor)
+
     def delete(self, asset_id: int) -> None:
         """
         Elimina permanentemente un activo por ID.
         Args:
             asset_id: ID del activo industrial a eliminar.
         """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(
                 "DELETE FROM INDUSTRIAL_ASSETS WHERE id = %s",
                 (asset_id,)
             )
-            self._db_manager.commit_transaction()
-            self._db_manager.close_connection()
+        self._evict(asset_id)
+
+    def _evict(self, asset_id: int):
+        """
+        [USO INTERNO] Invalida un activo modificado ahora y otra vez al terminar la transacción, para descartar
+        lo que se haya leído dentro de una unidad de trabajo que después se revierte.
+        """
+        if self._cache is not None and asset_id is not None:
+            self._cache.invalidate(asset_id)
+            self._db_manager.after_transaction(lambda: self._cache.invalidate(asset_id))
 
     @staticmethod
     def _row_to_entity(row) -> IndustrialAsset:
@@ -0,0 +1,68 @@
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, Generic, List, Optional, Sequence, TypeVar
+
+T = TypeVar('T')
+
+
+class Page(Generic[T]):
+    """
+    Página de resultados de una consulta paginada por keyset (seek).
+    next_cursor es un valor opaco que se pasa como 'after' para pedir la página siguiente;
+    es None cuando no hay más resultados.
+    """
+
+    def __init__(self, items: List[T], next_cursor: Optional[str] = None):
+        self._items = items
+        self._next_cursor = next_cursor
+
+    @property
+    def items(self) -> List[T]:
+        return self._items
+
+    @property
+    def next_cursor(self) -> Optional[str]:
+        return self._next_cursor
+
+    @property
+    def has_next(self) -> bool:
+        return self._next_cursor is not None
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._items)
+
+    @staticmethod
+    def encode_cursor(values: Sequence[Any]) -> str:
+        """Codifica los valores de la clave de orden de la última fila como un cursor opaco"""
+        encoded = [Page._encode_value(value) for value in values]
+        return base64.urlsafe_b64encode(json.dumps(encoded).encode('utf-8')).decode('ascii')
+
+    @staticmethod
+    def decode_cursor(cursor: str) -> List[Any]:
+        """Decodifica un cursor generado por encode_cursor"""
+        try:
+            encoded = json.loads(base64.urlsafe_b64decode(cursor.encode('ascii')))
+            return [Page._decode_value(value) for value in encoded]
+        except (ValueError, TypeError, KeyError) as e:
+            raise ValueError("Cursor de paginación inválido") from e
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        # Las fechas se guardan con una marca de tipo para reconstruirlas al decodificar
+        if isinstance(value, datetime):
+            return {'dt': value.isoformat()}
+        if isinstance(value, date):
+            return {'d': value.isoformat()}
+        return value
+
+    @staticmethod
+    def _decode_value(value: Any) -> Any:
+        if isinstance(value, dict):
+            if 'dt' in value:
+                return datetime.fromisoformat(value['dt'])
+            return date.fromisoformat(value['d'])
+        return value
@@ -0,0 +1,56 @@
+from collections import namedtuple
+from functools import lru_cache
+from typing import Any, Dict, Sequence, Tuple
+
+
+class Projection:
+    """
+    Subconjunto de columnas de una tabla (proyección) y el modelo de lectura liviano en que se devuelven sus filas:
+    una namedtuple con un campo por columna, sin construir la entidad del dominio. Los enums quedan como texto.
+    """
+
+    def __init__(self, fields: Sequence[str]):
+        self._fields = tuple(fields)
+        self._row_type = Projection._row_type_for(self._fields)
+
+    @property
+    def fields(self) -> Tuple[str, ...]:
+        return self._fields
+
+    @property
+    def row_type(self) -> type:
+        return self._row_type
+
+    def to_model(self, row: Sequence[Any]) -> tuple:
+        """Convierte una fila (en el orden de fields) en el modelo de lectura"""
+        return self._row_type._make(row)
+
+    @staticmethod
+    def resolve(projection: str | Sequence[str], views: Dict[str, Sequence[str]],
+                columns: Sequence[str]) -> 'Projection':
+        """
+        Obtiene la proyección pedida por un repositorio.
+        :param projection: Nombre de una vista del repositorio (ej.: 'summary') o lista de columnas.
+        :param views: Vistas con nombre definidas por el repositorio.
+        :param columns: Columnas que el repositorio permite leer.
+        :return: Projection con las columnas validadas.
+        """
+        if isinstance(projection, str):
+            if projection not in views:
+                raise ValueError(f"Vista desconocida: {projection}. Disponibles: {', '.join(views)}")
+            return Projection(views[projection])
+        fields = tuple(projection)
+        if not fields:
+            raise ValueError("La proyección debe tener al menos una columna")
+        unknown = [field for field in fields if field not in columns]
+        if unknown:
+            raise ValueError(f"Columnas desconocidas en la proyección: {', '.join(unknown)}")
+        if len(set(fields)) != len(fields):
+            raise ValueError("La proyección tiene columnas repetidas")
+        return Projection(fields)
+
+    @staticmethod
+    @lru_cache(maxsize=128)
+    def _row_type_for(fields: Tuple[str, ...]) -> type:
+        # Un tipo por conjunto de columnas, reutilizado entre consultas
+        return namedtuple('ReadModel', fields)
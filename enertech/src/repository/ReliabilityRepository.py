@@ -0,0 +1,153 @@
+from typing import List, Optional, Tuple
+
+from enertech.src.database.DatabaseManager import DatabaseManager
+from enertech.src.domain.MaintenanceType import MaintenanceType
+from enertech.src.domain.ReliabilityMetrics import ReliabilityMetrics
+from enertech.src.domain.Status import Status
+
+
+class ReliabilityRepository:
+    """
+    Tablas de resumen de confiabilidad (migración 0009): asset_reliability por activo y asset_group_reliability por
+    tipo de activo y ubicación. Los disparadores de work_orders e industrial_assets anotan en asset_reliability_dirty
+    los activos con cambios; refresh() recalcula solo esos activos y sus grupos.
+    """
+    # Un único refresco a la vez: los totales por grupo se calculan a partir de asset_reliability
+    _LOCK_KEY = 72_011_002
+    _METRIC_COLUMNS = ('failures', 'repairs', 'total_repair_seconds', 'uptime_gaps', 'total_uptime_seconds',
+                       'last_failure_at', 'refreshed_at')
+    _GROUP_DIMENSIONS = (ReliabilityMetrics.ASSET_TYPE, ReliabilityMetrics.LOCATION)
+
+    def __init__(self, db_manager: DatabaseManager):
+        self._db_manager = db_manager
+
+    def refresh(self, batch_size: int = 1000) -> Optional[Tuple[int, int]]:
+        """
+        Recalcula, en una transacción, hasta batch_size activos pendientes y los grupos a los que pertenecen (o
+        pertenecían, si cambiaron de tipo o ubicación). Las métricas de cada activo se calculan en la base con una
+        sola consulta agrupada sobre sus órdenes (índice idx_work_orders_asset_id).
+        :param batch_size: Máximo de activos por transacción.
+        :return: (activos recalculados, grupos recalculados), o None si otro refresco está en curso.
+        """
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT pg_try_advisory_xact_lock(%s)", (self._LOCK_KEY,))
+            if not cursor.fetchone()[0]:
+                return None
+            # Las marcas de transacciones sin confirmar están bloqueadas y quedan para el próximo refresco
+            cursor.execute("""
+                           DELETE FROM asset_reliability_dirty
+                           WHERE asset_id IN (SELECT asset_id
+                                              FROM asset_reliability_dirty
+                                              LIMIT %s FOR UPDATE SKIP LOCKED)
+                           RETURNING asset_id
+                           """, (batch_size,))
+            asset_ids = [row[0] for row in cursor.fetchall()]
+            if not asset_ids:
+                return 0, 0
+            cursor.execute("DELETE FROM asset_reliability WHERE asset_id = ANY(%s) RETURNING asset_type, location",
+                           (asset_ids,))
+            groups = set(cursor.fetchall())
+            cursor.execute(f"""
+                           WITH failures AS (
+                               SELECT asset_id, opened_at, resolved_at,
+                                      LAG(resolved_at) OVER (PARTITION BY asset_id ORDER BY opened_at, id)
+                                          AS previous_resolved_at
+                               FROM work_orders
+                               WHERE asset_id = ANY(%(ids)s)
+                                 AND maintenance_type = %(corrective)s
+                                 AND status <> %(cancelled)s
+                           ), per_asset AS (
+                               SELECT asset_id,
+                                      COUNT(*) AS failures,
+                                      COUNT(resolved_at) AS repairs,
+                                      COALESCE(SUM(EXTRACT(EPOCH FROM resolved_at - opened_at)), 0) AS total_repair,
+                                      COUNT(previous_resolved_at) AS uptime_gaps,
+                                      COALESCE(SUM(GREATEST(EXTRACT(EPOCH FROM opened_at - previous_resolved_at), 0)),
+                                               0) AS total_uptime,
+                                      MAX(opened_at) AS last_failure_at
+                               FROM failures
+                               GROUP BY asset_id
+                           )
+                           INSERT INTO asset_reliability (asset_id, asset_type, location,
+                                                          {', '.join(self._METRIC_COLUMNS)})
+                           SELECT a.id, a.asset_type, a.location,
+                                  COALESCE(p.failures, 0), COALESCE(p.repairs, 0), COALESCE(p.total_repair, 0),
+                                  COALESCE(p.uptime_gaps, 0), COALESCE(p.total_uptime, 0), p.last_failure_at, now()
+                           FROM industrial_assets a
+                                    LEFT JOIN per_asset p ON p.asset_id = a.id
+                           WHERE a.id = ANY(%(ids)s)
+                           RETURNING asset_type, location
+                           """, {'ids': asset_ids, 'corrective': MaintenanceType.CORRECTIVE.value,
+                                 'cancelled': Status.CANCELLED.value})
+            groups.update(cursor.fetchall())
+            asset_types = sorted({asset_type for asset_type, _ in groups})
+            locations = sorted({location for _, location in groups})
+            cursor.execute("""
+                           DELETE FROM asset_group_reliability
+                           WHERE (dimension = %s AND group_key = ANY(%s))
+                              OR (dimension = %s AND group_key = ANY(%s))
+                           """, (ReliabilityMetrics.ASSET_TYPE, asset_types, ReliabilityMetrics.LOCATION, locations))
+            sums = ("COUNT(*), SUM(failures), SUM(repairs), SUM(total_repair_seconds), SUM(uptime_gaps), "
+                    "SUM(total_uptime_seconds), MAX(last_failure_at), now()")
+            cursor.execute(f"""
+                           INSERT INTO asset_group_reliability (dimension, group_key, assets,
+                                                                {', '.join(self._METRIC_COLUMNS)})
+                           SELECT %s, asset_type, {sums}
+                           FROM asset_reliability
+                           WHERE asset_type = ANY(%s)
+                           GROUP BY asset_type
+                           UNION ALL
+                           SELECT %s, location, {sums}
+                           FROM asset_reliability
+                           WHERE location = ANY(%s)
+                           GROUP BY location
+                           """, (ReliabilityMetrics.ASSET_TYPE, asset_types, ReliabilityMetrics.LOCATION, locations))
+            return len(asset_ids), len(asset_types) + len(locations)
+
+    def count_pending(self) -> int:
+        """Cantidad de activos con cambios que todavía no se recalcularon"""
+        with self._db_manager.use_primary(), self._db_manager.connection(readonly=True) as conn, \
+                conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM asset_reliability_dirty")
+            return cursor.fetchone()[0]
+
+    def get_by_asset(self, asset_id: int) -> Optional[ReliabilityMetrics]:
+        """Indicadores de un activo, o None si todavía no se calcularon"""
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+            cursor.execute(f"SELECT asset_id, {', '.join(self._METRIC_COLUMNS)} "
+                           f"FROM asset_reliability WHERE asset_id = %s", (asset_id,))
+            row = cursor.fetchone()
+            return self._row_to_metrics(ReliabilityMetrics.ASSET, row) if row else None
+
+    def list_assets(self, order_by: str = 'mttr', limit: int = 20) -> List[ReliabilityMetrics]:
+        """
+        Activos con al menos una falla, de peor a mejor.
+        :param order_by: 'mttr' (mayor tiempo de reparación primero), 'mtbf' (menor tiempo entre fallas primero) o
+        'failures' (más fallas primero).
+        :param limit: Cantidad máxima de activos.
+        """
+        order = {
+            'mttr': "total_repair_seconds / NULLIF(repairs, 0) DESC NULLS LAST",
+            'mtbf': "total_uptime_seconds / NULLIF(uptime_gaps, 0) ASC NULLS LAST",
+            'failures': "failures DESC",
+        }.get(order_by)
+        if order is None:
+            raise ValueError("order_by debe ser 'mttr', 'mtbf' o 'failures'")
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+            cursor.execute(f"SELECT asset_id, {', '.join(self._METRIC_COLUMNS)} FROM asset_reliability "
+                           f"WHERE failures > 0 ORDER BY {order}, asset_id LIMIT %s", (limit,))
+            return [self._row_to_metrics(ReliabilityMetrics.ASSET, row) for row in cursor.fetchall()]
+
+    def list_groups(self, dimension: str) -> List[ReliabilityMetrics]:
+        """Indicadores de todos los grupos de una dimensión (ASSET_TYPE o LOCATION), ordenados por grupo"""
+        if dimension not in self._GROUP_DIMENSIONS:
+            raise ValueError(f"dimension debe ser uno de {self._GROUP_DIMENSIONS}")
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+            cursor.execute(f"SELECT group_key, assets, {', '.join(self._METRIC_COLUMNS)} "
+                           f"FROM asset_group_reliability WHERE dimension = %s ORDER BY group_key", (dimension,))
+            return [ReliabilityMetrics(dimension, *row) for row in cursor.fetchall()]
+
+    @staticmethod
+    def _row_to_metrics(dimension: str, row) -> ReliabilityMetrics:
+        # Fila (clave, columnas de _METRIC_COLUMNS) de asset_reliability: un solo activo
+        return ReliabilityMetrics(dimension, row[0], 1, *row[1:])
@@ -1,20 +1,26 @@
-from typing import Optional, List
+from typing import Iterator, Optional, List
 from enertech.src.database.DatabaseManager import DatabaseManager
 from enertech.src.domain.Supervisor import Supervisor
 from enertech.src.domain.UserRole import UserRole
 from enertech.src.repository.Criteria import Criteria
+from enertech.src.repository.EntityCache import EntityCache
+from enertech.src.repository.Page import Page
 
 from enertech.src.repository.BaseUserRepository import BaseUserRepository
 
 
 # Repositorio para manejar operaciones de base de datos para supervisores
 class SupervisorRepository(BaseUserRepository):
-    def __init__(self, db_manager: DatabaseManager):
+    # Columnas que se leen para construir la entidad, en el orden que espera el mapeo de filas
+    _COLUMNS = ('id', 'first_name', 'last_name', 'email', 'password', 'rol', 'active', 'assigned_area')
+
+    def __init__(self, db_manager: DatabaseManager, cache: Optional[EntityCache] = None):
         """
         Constructor que inicializa el repositorio con un gestor de base de datos.
         :param db_manager: Instancia de DatabaseManager para manejar conexiones a la base de datos.
+        :param cache: Caché opcional para get_by_id y get_by_email; update y delete invalidan sus entradas.
         """
-        super().__init__(db_manager)
+        super().__init__(db_manager, cache)
 
     def save(self, supervisor: Supervisor) -> Supervisor:
         """
@@ -27,7 +33,7 @@ class SupervisorRepository(BaseUserRepository):
                 VALUES (%s, %s, %s, %s, %s, %s,
                         %s) RETURNING id, first_name, last_name, email, password, rol, active, assigned_area; \
                 """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (
                 supervisor.first_name,
                 supervisor.last_name,
@@ -37,9 +43,7 @@ class SupervisorRepository(BaseUserRepository):
                 supervisor.is_active,
                 supervisor.assigned_area
             ))
-            self._db_manager.commit_transaction()
             result = cursor.fetchone()
-            self._db_manager.close_connection()
         return self._map_to_supervisor(result)
 
     def update(self, supervisor: Supervisor) -> Supervisor:
@@ -59,7 +63,7 @@ class SupervisorRepository(BaseUserRepository):
                     assigned_area = %s
                 WHERE id = %s RETURNING id, first_name, last_name, email, password, rol, active, assigned_area; \
                 """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (
                 supervisor.first_name,
                 supervisor.last_name,
@@ -70,9 +74,8 @@ class SupervisorRepository(BaseUserRepository):
                 supervisor.assigned_area,
                 supervisor.id
             ))
-            self._db_manager.commit_transaction()
             result = cursor.fetchone()
-            self._db_manager.close_connection()
+        self._evict(supervisor.id)
         return self._map_to_supervisor(result)
 
     def get_by_id(self, supervisor_id: int) -> Optional[Supervisor]:
@@ -81,25 +84,27 @@ class SupervisorRepository(BaseUserRepository):
         :param supervisor_id: ID del supervisor a buscar.
         :return: Supervisor si se encuentra, None si no existe.
         """
-        query = """
-                SELECT id,
-                       first_name,
-                       last_name,
-                       email,
-                       password,
-                       rol,
-                       active,
-                       assigned_area
-                FROM supervisors
-                WHERE id = %s; \
-                """
-        with self._db_manager.get_connection().cursor() as cursor:
-            cursor.execute(query, (supervisor_id,))
-            result = cursor.fetchone()
-            self._db_manager.close_connection()
-        if result:
-            return self._map_to_supervisor(result)
-        return None
+        def load() -> Optional[Supervisor]:
+            query = """
+                    SELECT id,
+                           first_name,
+                           last_name,
+                           email,
+                           password,
+                           rol,
+                           active,
+                           assigned_area
+                    FROM supervisors
+                    WHERE id = %s; \
+                    """
+            with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+                cursor.execute(query, (supervisor_id,))
+                result = cursor.fetchone()
+            if result:
+                return self._map_to_supervisor(result)
+            return None
+
+        return self._cached(supervisor_id, load)
 
     def email_exist(self, email: str) -> bool:
         """
@@ -108,10 +113,9 @@ class SupervisorRepository(BaseUserRepository):
         :return: True si el correo electrónico ya existe, False en caso contrario.
         """
         query = "SELECT COUNT(*) FROM supervisors WHERE email = %s;"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
             cursor.execute(query, (email,))
             count = cursor.fetchone()[0]
-            self._db_manager.close_connection()
         return count > 0
 
     def get_by_email(self, email: str) -> Optional[Supervisor]:
@@ -120,25 +124,27 @@ class SupervisorRepository(BaseUserRepository):
         :param email: Correo electrónico del supervisor a buscar.
         :return: Supervisor si se encuentra, None si no existe.
         """
-        query = """
-                SELECT id,
-                       first_name,
-                       last_name,
-                       email,
-                       password,
-                       rol,
-                       active,
-                       assigned_area
-                FROM supervisors
-                WHERE email = %s; \
-                """
-        with self._db_manager.get_connection().cursor() as cursor:
-            cursor.execute(query, (email,))
-            result = cursor.fetchone()
-            self._db_manager.close_connection()
-        if result:
-            return self._map_to_supervisor(result)
-        return None
+        def load() -> Optional[Supervisor]:
+            query = """
+                    SELECT id,
+                           first_name,
+                           last_name,
+                           email,
+                           password,
+                           rol,
+                           active,
+                           assigned_area
+                    FROM supervisors
+                    WHERE email = %s; \
+                    """
+            with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+                cursor.execute(query, (email,))
+                result = cursor.fetchone()
+            if result:
+                return self._map_to_supervisor(result)
+            return None
+
+        return self._cached(('email', email), load)
 
     def exists_by_credentials(self, email: str, password: str) -> bool:
         """
@@ -148,10 +154,9 @@ class SupervisorRepository(BaseUserRepository):
         :return: True si existe el supervisor con esas credenciales, False en caso contrario.
         """
         query = "SELECT COUNT(*) FROM supervisors WHERE email = %s AND password = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
             cursor.execute(query, (email, password))
             count = cursor.fetchone()[0]
-            self._db_manager.close_connection()
         return count > 0
 
     def list_by_criteria(self, criteria: dict) -> List[Supervisor]:
@@ -161,9 +166,35 @@ class SupervisorRepository(BaseUserRepository):
         :return: Lista de supervisores que cumplen con los criterios.
         """
         _TABLE_NAME = "SUPERVISORS"
-        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria)
+        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria, self._COLUMNS)
         return [self._map_to_supervisor(row) for row in results]
 
+    def iter_by_criteria(self, criteria: dict, itersize: int = 2000) -> Iterator[Supervisor]:
+        """
+        Igual que list_by_criteria, pero devuelve los supervisores de a uno con un cursor del lado del servidor.
+        :param criteria: Diccionario con los criterios de búsqueda.
+        :param itersize: Cantidad de filas traídas del servidor en cada viaje.
+        :return: Generador de supervisores que cumplen con los criterios.
+        """
+        _TABLE_NAME = "SUPERVISORS"
+        for row in Criteria.iter_by_criteria(_TABLE_NAME, self._db_manager, criteria, itersize,
+                                             self._COLUMNS):
+            yield self._map_to_supervisor(row)
+
+    def page_by_criteria(self, criteria: dict, page_size: int = 50,
+                         after: Optional[str] = None) -> Page[Supervisor]:
+        """
+        Igual que list_by_criteria, pero de a una página por vez con paginación por keyset.
+        :param criteria: Diccionario con los criterios de búsqueda.
+        :param page_size: Cantidad máxima de resultados por página.
+        :param after: next_cursor de la página anterior; None para la primera página.
+        :return: Page de Supervisor y el cursor de la página siguiente.
+        """
+        _TABLE_NAME = "SUPERVISORS"
+        page = Criteria.page_by_criteria(_TABLE_NAME, self._db_manager, criteria, page_size,
+                                         'id', after, self._COLUMNS)
+        return Page([self._map_to_supervisor(row) for row in page.items], page.next_cursor)
+
     def delete(self, supervisor_id: int) -> bool:
         """
         Elimina un supervisor por su ID.
@@ -171,12 +202,11 @@ class SupervisorRepository(BaseUserRepository):
         :return: True si se eliminó correctamente, False si no se encontró el registro.
         """
         query = "DELETE FROM supervisors WHERE id = %s;"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (supervisor_id,))
-            self._db_manager.commit_transaction()
             result = cursor.rowcount
-            self._db_manager.close_connection()
-            return result > 0
+        self._evict(supervisor_id)
+        return result > 0
 
     @staticmethod
     def _map_to_supervisor(db_result: tuple[any, ...]) -> Supervisor:
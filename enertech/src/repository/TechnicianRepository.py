@@ -1,19 +1,32 @@
-from typing import Optional, List
+from typing import Iterator, Optional, List, Sequence, Tuple
 from enertech.src.database.DatabaseManager import DatabaseManager
 from enertech.src.domain.Technician import Technician
 from enertech.src.domain.UserRole import UserRole
 from enertech.src.repository.BaseUserRepository import BaseUserRepository
 from enertech.src.repository.Criteria import Criteria
+from enertech.src.repository.EntityCache import EntityCache
+from enertech.src.repository.Page import Page
+from enertech.src.repository.Projection import Projection
 
 
 # Repositorio para manejar operaciones de base de datos para técnicos (Technician)
 class TechnicianRepository(BaseUserRepository):
-    def __init__(self, db_manager: DatabaseManager):
+    # Columnas que se leen para construir la entidad, en el orden que espera el mapeo de filas
+    _COLUMNS = ('id', 'first_name', 'last_name', 'email', 'password', 'rol', 'active', 'max_active_orders')
+    # Columnas que se pueden pedir en una proyección (la contraseña nunca se expone en un listado)
+    _PROJECTABLE_COLUMNS = tuple(column for column in _COLUMNS if column != 'password')
+    # Proyecciones con nombre para los listados (ver list_projection)
+    _VIEWS = {
+        'summary': ('id', 'first_name', 'last_name'),
+    }
+
+    def __init__(self, db_manager: DatabaseManager, cache: Optional[EntityCache] = None):
         """
         Constructor que inicializa el repositorio con un gestor de base de datos.
         :param db_manager: Instancia de DatabaseManager para manejar conexiones a la base de datos.
+        :param cache: Caché opcional para get_by_id y get_by_email; update y delete invalidan sus entradas.
         """
-        super().__init__(db_manager)
+        super().__init__(db_manager, cache)
 
     def save(self, technician: Technician) -> Technician:
         """
@@ -26,7 +39,7 @@ class TechnicianRepository(BaseUserRepository):
                 VALUES (%s, %s, %s, %s, %s, %s,
                         %s) RETURNING id, first_name, last_name, email, password, rol, active, max_active_orders; \
                 """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (
                 technician.first_name,
                 technician.last_name,
@@ -36,9 +49,7 @@ class TechnicianRepository(BaseUserRepository):
                 technician.is_active,
                 technician.max_active_orders
             ))
-            self._db_manager.commit_transaction()
             result = cursor.fetchone()
-            self._db_manager.close_connection()
         return self._row_to_entity(result) if result else None
 
     def update(self, technician: Technician) -> Optional[Technician]:
@@ -58,7 +69,7 @@ class TechnicianRepository(BaseUserRepository):
                     max_active_orders = %s
                 WHERE id = %s RETURNING id, first_name, last_name, email, password, rol, active, max_active_orders; \
                 """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (
                 technician.first_name,
                 technician.last_name,
@@ -68,9 +79,8 @@ class TechnicianRepository(BaseUserRepository):
                 technician.is_active,
                 technician.max_active_orders,
                 technician.id))
-            self._db_manager.commit_transaction()
             result = cursor.fetchone()
-            self._db_manager.close_connection()
+        self._evict(technician.id)
         return self._row_to_entity(result) if result else None
 
     def get_by_id(self, technician_id: int) -> Optional[Technician]:
@@ -79,12 +89,14 @@ class TechnicianRepository(BaseUserRepository):
         :param technician_id: ID del técnico a buscar.
         :return: Technician si se encuentra, None si no existe.
         """
-        query = "SELECT * FROM technicians WHERE id = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
-            cursor.execute(query, (technician_id,))
-            row = cursor.fetchone()
-            self._db_manager.close_connection()
-        return self._row_to_entity(row) if row else None
+        def load() -> Optional[Technician]:
+            query = f"SELECT {', '.join(self._COLUMNS)} FROM technicians WHERE id = %s"
+            with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+                cursor.execute(query, (technician_id,))
+                row = cursor.fetchone()
+            return self._row_to_entity(row) if row else None
+
+        return self._cached(technician_id, load)
 
     def get_by_email(self, email: str) -> Optional[Technician]:
         """
@@ -92,12 +104,41 @@ class TechnicianRepository(BaseUserRepository):
         :param email: Correo electrónico del técnico a buscar.
         :return: Technician si se encuentra, None si no existe.
         """
-        query = "SELECT * FROM technicians WHERE email = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
-            cursor.execute(query, (email,))
-            row = cursor.fetchone()
-            self._db_manager.close_connection()
-        return self._row_to_entity(row) if row else None
+        def load() -> Optional[Technician]:
+            query = f"SELECT {', '.join(self._COLUMNS)} FROM technicians WHERE email = %s"
+            with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+                cursor.execute(query, (email,))
+                row = cursor.fetchone()
+            return self._row_to_entity(row) if row else None
+
+        return self._cached(('email', email), load)
+
+    def lock_available(self, limit: int) -> List[Tuple[int, int]]:
+        """
+        Bloquea hasta limit técnicos activos con capacidad libre, los menos cargados primero, salteando los que ya
+        bloqueó otra transacción (FOR UPDATE SKIP LOCKED). Debe usarse dentro de una unidad de trabajo; mientras
+        dure, ninguna otra asignación (manual o de otro despachador) puede cambiar la carga de estos técnicos.
+        La carga se calcula agrupando una sola vez las órdenes en curso (no con una subconsulta por técnico, cuyo
+        plan depende de estadísticas que cambian rápido mientras se despacha) y se debe volver a contar después del
+        bloqueo: la de esta consulta es previa a obtenerlo.
+        :param limit: Cantidad máxima de técnicos.
+        :return: Pares (ID del técnico, max_active_orders).
+        """
+        query = """
+                SELECT t.id, t.max_active_orders
+                FROM technicians AS t
+                         LEFT JOIN (SELECT assigned_to, COUNT(*) AS active_orders
+                                    FROM work_orders
+                                    WHERE status = 'IN_PROGRESS'
+                                    GROUP BY assigned_to) AS load ON load.assigned_to = t.id
+                WHERE t.active
+                  AND COALESCE(load.active_orders, 0) < t.max_active_orders
+                ORDER BY COALESCE(load.active_orders, 0)::float / t.max_active_orders, t.id
+                LIMIT %s FOR UPDATE OF t SKIP LOCKED
+                """
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            cursor.execute(query, (limit,))
+            return cursor.fetchall()
 
     def email_exist(self, email: str) -> bool:
         """
@@ -106,10 +147,9 @@ class TechnicianRepository(BaseUserRepository):
         :return: True si el correo existe, False en caso contrario.
         """
         query = "SELECT COUNT(*) FROM technicians WHERE email = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
             cursor.execute(query, (email,))
             count = cursor.fetchone()[0]
-            self._db_manager.close_connection()
         return count > 0
 
     def exists_by_credentials(self, email: str, password: str) -> bool:
@@ -120,10 +160,9 @@ class TechnicianRepository(BaseUserRepository):
         :return: True si existe el técnico con esas credenciales, False en caso contrario.
         """
         query = "SELECT COUNT(*) FROM technicians WHERE email = %s AND password = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
             cursor.execute(query, (email, password))
             count = cursor.fetchone()[0]
-            self._db_manager.close_connection()
         return count > 0
 
     def list_by_criteria(self, criteria: dict) -> List[Technician]:
@@ -133,9 +172,59 @@ class TechnicianRepository(BaseUserRepository):
         :return: Lista de Technician que cumplen con los criterios, o None si no hay resultados.
         """
         _TABLE_NAME = 'TECHNICIANS'
-        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria)
+        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria, self._COLUMNS)
         return [self._row_to_entity(result) for result in results]
 
+    def iter_by_criteria(self, criteria: dict, itersize: int = 2000) -> Iterator[Technician]:
+        """
+        Igual que list_by_criteria, pero devuelve los técnicos de a uno con un cursor del lado del servidor.
+        :param criteria: Diccionario con los criterios de búsqueda (ejemplo: {'active': True}).
+        :param itersize: Cantidad de filas traídas del servidor en cada viaje.
+        :return: Generador de Technician que cumplen con los criterios.
+        """
+        _TABLE_NAME = 'TECHNICIANS'
+        for row in Criteria.iter_by_criteria(_TABLE_NAME, self._db_manager, criteria, itersize,
+                                             self._COLUMNS):
+            yield self._row_to_entity(row)
+
+    def page_by_criteria(self, criteria: dict, page_size: int = 50,
+                         after: Optional[str] = None) -> Page[Technician]:
+        """
+        Igual que list_by_criteria, pero de a una página por vez con paginación por keyset.
+        :param criteria: Diccionario con los criterios de búsqueda.
+        :param page_size: Cantidad máxima de resultados por página.
+        :param after: next_cursor de la página anterior; None para la primera página.
+        :return: Page de Technician y el cursor de la página siguiente.
+        """
+        _TABLE_NAME = "TECHNICIANS"
+        page = Criteria.page_by_criteria(_TABLE_NAME, self._db_manager, criteria, page_size,
+                                         'id', after, self._COLUMNS)
+        return Page([self._row_to_entity(row) for row in page.items], page.next_cursor)
+
+    def list_projection(self, criteria: dict, projection: str | Sequence[str] = 'summary') -> List[tuple]:
+        """
+        Igual que list_by_criteria, pero lee solo las columnas de la proyección y devuelve modelos de lectura.
+        :param criteria: Diccionario con los criterios de búsqueda.
+        :param projection: Nombre de una vista ('summary') o lista de columnas.
+        :return: Lista de namedtuple con un campo por columna.
+        """
+        _TABLE_NAME = "TECHNICIANS"
+        view = Projection.resolve(projection, self._VIEWS, self._PROJECTABLE_COLUMNS)
+        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria, view.fields)
+        return [view.to_model(result) for result in results]
+
+    def page_projection(self, criteria: dict, projection: str | Sequence[str] = 'summary', page_size: int = 50,
+                        after: Optional[str] = None) -> Page[tuple]:
+        """
+        Igual que page_by_criteria, pero con los modelos de lectura de list_projection.
+        La proyección debe incluir el id.
+        """
+        _TABLE_NAME = "TECHNICIANS"
+        view = Projection.resolve(projection, self._VIEWS, self._PROJECTABLE_COLUMNS)
+        page = Criteria.page_by_criteria(_TABLE_NAME, self._db_manager, criteria, page_size,
+                                         'id', after, view.fields)
+        return Page([view.to_model(row) for row in page.items], page.next_cursor)
+
     def delete(self, technician_id: int) -> bool:
         """
         Elimina un técnico por ID.
@@ -143,12 +232,11 @@ class TechnicianRepository(BaseUserRepository):
         :return: True si se eliminó correctamente, False si no se encontró el registro.
         """
         query = "DELETE FROM technicians WHERE id = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (technician_id,))
-            self._db_manager.commit_transaction()
             resutl = cursor.rowcount
-            self._db_manager.close_connection()
-            return resutl > 0
+        self._evict(technician_id)
+        return resutl > 0
 
     @staticmethod
     def _row_to_entity(row) -> Technician:
@@ -1,19 +1,85 @@
-from typing import Optional, List
+import uuid
+from contextlib import AbstractContextManager
+from datetime import datetime
+from typing import Callable, Dict, IO, Iterable, Iterator, Optional, List, Sequence, Tuple
+from psycopg2.extras import execute_values
 from enertech.src.database.DatabaseManager import DatabaseManager
+from enertech.src.domain.AssignmentOutcome import AssignmentOutcome
+from enertech.src.domain.AssignmentResult import AssignmentResult
 from enertech.src.domain.WorkOrder import WorkOrder
 from enertech.src.domain.MaintenanceType import MaintenanceType
 from enertech.src.domain.PriorityLevel import PriorityLevel
 from enertech.src.domain.TimeUnit import TimeUnit
 from enertech.src.domain.Status import Status
+from enertech.src.repository.BulkCopy import BulkCopy
+from enertech.src.repository.ColumnKind import ColumnKind
 from enertech.src.repository.Criteria import Criteria
+from enertech.src.repository.Page import Page
+from enertech.src.repository.Projection import Projection
 
 
 # Repositorio para manejar operaciones de base de datos para órdenes de trabajo (WorkOrder)
 class WorkOrderRepository:
+    # Columnas que se cargan en las inserciones masivas (save_many)
+    _BULK_COLUMNS = ('id', 'title', 'assigned_to', 'created_by', 'asset_id', 'maintenance_type', 'priority', 'status',
+                     'opened_at', 'estimated_time', 'estimated_time_unit', 'description')
+    # Columnas que se leen para construir la entidad, en el orden que espera _row_to_entity
+    _COLUMNS = ('id', 'title', 'assigned_to', 'created_by', 'asset_id', 'maintenance_type', 'priority', 'status',
+                'opened_at', 'resolved_at', 'estimated_time', 'estimated_time_unit', 'resolved_on_time', 'description',
+                'closure_comments')
+    # Proyecciones con nombre para los listados (ver list_projection)
+    _VIEWS = {
+        'summary': ('id', 'title', 'description'),
+        'board': ('id', 'title', 'status', 'priority', 'assigned_to', 'opened_at'),
+    }
+    # Columnas por las que se puede paginar (cada una tiene un índice compuesto con el id)
+    _SORT_KEYS = ('id', 'opened_at')
+    # Estados desde los que una orden se puede asignar a un técnico
+    _ASSIGNABLE_STATUSES = (Status.UNASSIGNED, Status.REOPENED)
+    # Orden de atención del despacho: prioridad (CRITICAL primero) y luego vencimiento más próximo. La expresión debe
+    # coincidir con la del índice idx_work_orders_unassigned_dispatch (migración 0008) para que se use
+    _PRIORITY_RANK_SQL = ("CASE priority " + " ".join(f"WHEN '{level.value}' THEN {rank}"
+                                                       for rank, level in enumerate(PriorityLevel)) + " END")
+    # Columnas de la exportación (ver export_columns): (nombre, expresión SQL, tipo). Las órdenes se leen con el
+    # alias w, el activo con a y el técnico asignado con t
+    _EXPORT_COLUMNS = (
+        ('id', 'w.id', ColumnKind.ID), ('title', 'w.title', ColumnKind.TEXT),
+        ('status', 'w.status', ColumnKind.ENUM), ('priority', 'w.priority', ColumnKind.ENUM),
+        ('maintenance_type', 'w.maintenance_type', ColumnKind.ENUM), ('asset_id', 'w.asset_id', ColumnKind.ID),
+        ('created_by', 'w.created_by', ColumnKind.ID), ('assigned_to', 'w.assigned_to', ColumnKind.ID),
+        ('opened_at', 'w.opened_at', ColumnKind.TIMESTAMP), ('resolved_at', 'w.resolved_at', ColumnKind.TIMESTAMP),
+        ('deadline_at', 'w.deadline_at', ColumnKind.TIMESTAMP),
+        ('estimated_time', 'w.estimated_time', ColumnKind.INTEGER),
+        ('estimated_time_unit', 'w.estimated_time_unit', ColumnKind.ENUM),
+        ('overdue', 'w.overdue', ColumnKind.BOOLEAN), ('resolved_on_time', 'w.resolved_on_time', ColumnKind.BOOLEAN),
+        ('description', 'w.description', ColumnKind.TEXT), ('closure_comments', 'w.closure_comments', ColumnKind.TEXT),
+    )
+    _EXPORT_ASSET_COLUMNS = (
+        ('asset_type', 'a.asset_type', ColumnKind.TEXT), ('asset_model', 'a.model', ColumnKind.TEXT),
+        ('asset_location', 'a.location', ColumnKind.TEXT),
+        ('asset_acquisition_date', 'a.acquisition_date', ColumnKind.DATE),
+    )
+    _EXPORT_TECHNICIAN_COLUMNS = (
+        ('technician_name', "t.first_name || ' ' || t.last_name", ColumnKind.TEXT),
+        ('technician_email', 't.email', ColumnKind.TEXT),
+    )
+    # Representación entera de NaT (fecha vacía) en NumPy, para las lecturas por microsegundos
+    _NAT_MICROSECONDS = -2 ** 63
+    # Estados abiertos, con el mismo texto que el predicado del índice idx_work_orders_pending_overdue
+    _OPEN_STATUSES_SQL = "('UNASSIGNED', 'IN_PROGRESS', 'REOPENED', 'WAITING_PARTS', 'ON_HOLD')"
+
     def __init__(self, db_manager: DatabaseManager):
         # Constructor que recibe un gestor de base de datos para manejar conexiones 
         self._db_manager = db_manager
 
+    def unit_of_work(self) -> AbstractContextManager:
+        """Abre una unidad de trabajo compartida por todos los repositorios del mismo DatabaseManager"""
+        return self._db_manager.unit_of_work()
+
+    def after_commit(self, callback: Callable[[], None]):
+        """Ejecuta callback cuando se confirma la transacción actual (ver DatabaseManager.after_commit)"""
+        self._db_manager.after_commit(callback)
+
     def save(self, order: WorkOrder) -> WorkOrder:
         # Inserta una nueva orden de trabajo en la base de datos y devuelve la entidad creada con el ID asignado
         query = """
@@ -23,21 +89,42 @@ class WorkOrderRepository:
                 resolved_at, estimated_time, estimated_time_unit, resolved_on_time, description, closure_comments; \
                 """
         # Abre cursor para ejecutar la consulta
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             # Ejecuta la consulta con los valores del objeto order, usando el atributo value para los enums
             cursor.execute(query, (order.title, order.assigned_to, order.created_by, order.asset_id,
                                    order.maintenance_type.value, order.priority.value, order.status.value,
                                    order.opened_at, order.estimated_time,
                                    order.estimated_time_unit.value, order.description))
-            # Confirma la transacción para guardar los cambios en la base de datos
-            self._db_manager.commit_transaction()
             # Obtiene la fila retornada con los datos del registro insertado
             row = cursor.fetchone()
-            # Cierra la conexión a la base de datos
-            self._db_manager.close_connection()
             # Convierte la fila obtenida en un objeto WorkOrder y lo retorna
             return self._row_to_entity(row)
 
+    def save_many(self, orders: Iterable[WorkOrder], use_copy: bool = True) -> List[int]:
+        """
+        Inserta muchas órdenes de trabajo en una sola transacción (un único commit).
+        Los IDs se reservan de antemano en la secuencia de la tabla, por lo que se devuelven en el mismo orden
+        que las órdenes recibidas.
+        :param orders: Órdenes a insertar.
+        :param use_copy: True para cargar con COPY (más rápido); False para usar INSERT multi-fila (execute_values).
+        :return: Lista de IDs generados, en el orden de las órdenes recibidas.
+        """
+        orders = list(orders)
+        if not orders:
+            return []
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            # Reserva un ID por orden en una sola consulta
+            cursor.execute("SELECT nextval(pg_get_serial_sequence('work_orders', 'id')) "
+                           "FROM generate_series(1, %s)", (len(orders),))
+            ids = sorted(row[0] for row in cursor.fetchall())
+            rows = (self._to_bulk_row(order_id, order) for order_id, order in zip(ids, orders))
+            if use_copy:
+                BulkCopy.copy_rows(cursor, 'WORK_ORDERS', self._BULK_COLUMNS, rows)
+            else:
+                execute_values(cursor, f"INSERT INTO WORK_ORDERS ({', '.join(self._BULK_COLUMNS)}) VALUES %s",
+                               rows, page_size=1000)
+        return ids
+
     def update(self, order: WorkOrder) -> Optional[WorkOrder]:
         # Actualiza una orden de trabajo existente en la base de datos y devuelve la entidad actualizada
         query = """
@@ -58,7 +145,7 @@ class WorkOrderRepository:
                 WHERE id = %s RETURNING id, title, assigned_to, created_by, asset_id, maintenance_type, priority, status, opened_at, 
                 resolved_at, estimated_time, estimated_time_unit, resolved_on_time, description, closure_comments; \
                 """
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             # Ejecuta la actualización con los valores del objeto order
             cursor.execute(query, (
                 order.title,
@@ -76,41 +163,413 @@ class WorkOrderRepository:
                 order.status.value,
                 order.id
             ))
-            # Confirma la transacción
-            self._db_manager.commit_transaction()
             # Obtiene la fila actualizada (si existe)
             row = cursor.fetchone()
-            self._db_manager.close_connection()
             # Convierte la fila a objeto WorkOrder o retorna None si no se encontró el registro
             return self._row_to_entity(row) if row else None
 
+    def assign(self, order_id: int, technician_id: int) -> AssignmentResult:
+        """
+        Asigna la orden al técnico de forma atómica, aunque varios supervisores asignen a la vez: bloquea la fila del
+        técnico y luego la de la orden (SELECT ... FOR UPDATE, siempre en ese orden para evitar deadlocks), cuenta
+        sus órdenes en curso y actualiza la orden en la misma transacción. Otra asignación al mismo técnico o de la
+        misma orden espera a que esta termine y después ve su resultado.
+        Dentro de una unidad de trabajo, los bloqueos se mantienen hasta que esta termina.
+        :param order_id: ID de la orden a asignar.
+        :param technician_id: ID del técnico.
+        :return: AssignmentResult con la orden actualizada o el motivo por el que no se asignó.
+        """
+        update_query = f"""
+                       UPDATE WORK_ORDERS
+                       SET assigned_to = %s,
+                           status      = %s
+                       WHERE id = %s RETURNING {', '.join(self._COLUMNS)}
+                       """
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT max_active_orders, active FROM technicians WHERE id = %s FOR UPDATE",
+                           (technician_id,))
+            technician_row = cursor.fetchone()
+            if technician_row is None:
+                return AssignmentResult(AssignmentOutcome.TECHNICIAN_NOT_FOUND)
+            max_active_orders, active = technician_row
+            if not active:
+                return AssignmentResult(AssignmentOutcome.TECHNICIAN_INACTIVE, max_active_orders=max_active_orders)
+            cursor.execute("SELECT status FROM WORK_ORDERS WHERE id = %s FOR UPDATE", (order_id,))
+            order_row = cursor.fetchone()
+            if order_row is None:
+                return AssignmentResult(AssignmentOutcome.ORDER_NOT_FOUND)
+            if Status(order_row[0]) not in self._ASSIGNABLE_STATUSES:
+                return AssignmentResult(AssignmentOutcome.ORDER_NOT_ASSIGNABLE, order_status=Status(order_row[0]))
+            cursor.execute("SELECT COUNT(*) FROM WORK_ORDERS WHERE status = %s AND assigned_to = %s",
+                           (Status.IN_PROGRESS.value, technician_id))
+            active_orders = cursor.fetchone()[0]
+            if active_orders >= max_active_orders:
+                return AssignmentResult(AssignmentOutcome.TECHNICIAN_AT_CAPACITY, active_orders=active_orders,
+                                        max_active_orders=max_active_orders)
+            cursor.execute(update_query, (technician_id, Status.IN_PROGRESS.value, order_id))
+            work_order = self._row_to_entity(cursor.fetchone())
+        return AssignmentResult(AssignmentOutcome.ASSIGNED, work_order, active_orders, max_active_orders)
+
+    def claim_unassigned(self, limit: int) -> List[int]:
+        """
+        Bloquea hasta limit órdenes sin asignar, las más prioritarias y de vencimiento más próximo primero, salteando
+        las que ya bloqueó otra transacción (FOR UPDATE SKIP LOCKED): varios despachadores en paralelo reciben
+        órdenes distintas sin esperarse. Debe usarse dentro de una unidad de trabajo, que mantiene los bloqueos.
+        :param limit: Cantidad máxima de órdenes.
+        :return: IDs de las órdenes bloqueadas, en orden de atención.
+        """
+        query = f"""
+                SELECT id
+                FROM WORK_ORDERS
+                WHERE status = %s
+                ORDER BY {self._PRIORITY_RANK_SQL}, deadline_at, id
+                LIMIT %s FOR UPDATE SKIP LOCKED
+                """
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            cursor.execute(query, (Status.UNASSIGNED.value, limit))
+            return [row[0] for row in cursor.fetchall()]
+
+    def assign_many(self, assignments: Sequence[Tuple[int, int]]) -> int:
+        """
+        Asigna muchas órdenes con un solo UPDATE ... FROM (VALUES ...). No verifica capacidad: es para órdenes y
+        técnicos ya bloqueados por claim_unassigned y TechnicianRepository.lock_available, en la misma transacción.
+        :param assignments: Pares (ID de orden, ID de técnico).
+        :return: Cantidad de órdenes asignadas.
+        """
+        if not assignments:
+            return 0
+        query = """
+                UPDATE WORK_ORDERS AS w
+                SET assigned_to = v.technician_id,
+                    status      = %s
+                FROM (VALUES %%s) AS v (id, technician_id)
+                WHERE w.id = v.id
+                """
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            execute_values(cursor, cursor.mogrify(query, (Status.IN_PROGRESS.value,)).decode(), assignments,
+                           page_size=len(assignments))
+            return cursor.rowcount
+
+    def flag_overdue(self, batch_size: int = 5000) -> int:
+        """
+        Marca overdue = TRUE en las órdenes abiertas cuyo vencimiento (deadline_at) ya pasó, con un UPDATE por lote
+        que lee el índice parcial idx_work_orders_pending_overdue (el ARRAY(...) hace que las filas se actualicen
+        por clave primaria en lugar de recorrer la tabla para el join). Las filas bloqueadas por otra transacción se
+        saltean (SKIP LOCKED) y quedan para el próximo barrido.
+        :param batch_size: Máximo de órdenes marcadas por sentencia (y por transacción).
+        :return: Cantidad de órdenes marcadas en este lote; menor que batch_size cuando no quedan más.
+        """
+        query = f"""
+                UPDATE WORK_ORDERS
+                SET overdue = TRUE
+                WHERE id = ANY (ARRAY(SELECT id
+                                      FROM WORK_ORDERS
+                                      WHERE NOT overdue
+                                        AND status IN {self._OPEN_STATUSES_SQL}
+                                        AND deadline_at < now()
+                                      LIMIT %s FOR UPDATE SKIP LOCKED))
+                """
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            cursor.execute(query, (batch_size,))
+            return cursor.rowcount
+
+    def fill_resolved_on_time(self, batch_size: int = 5000) -> int:
+        """
+        Calcula resolved_on_time (resolved_at <= deadline_at) en las órdenes resueltas que todavía no lo tienen,
+        con un UPDATE por lote sobre el índice parcial idx_work_orders_pending_on_time.
+        :param batch_size: Máximo de órdenes por sentencia (y por transacción).
+        :return: Cantidad de órdenes actualizadas en este lote; menor que batch_size cuando no quedan más.
+        """
+        query = """
+                UPDATE WORK_ORDERS
+                SET resolved_on_time = resolved_at <= deadline_at
+                WHERE id = ANY (ARRAY(SELECT id
+                                      FROM WORK_ORDERS
+                                      WHERE resolved_at IS NOT NULL
+                                        AND resolved_on_time IS NULL
+                                      LIMIT %s FOR UPDATE SKIP LOCKED))
+                """
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
+            cursor.execute(query, (batch_size,))
+            return cursor.rowcount
+
     def get_by_id(self, order_id: int) -> Optional[WorkOrder]:
         # Busca y devuelve una orden de trabajo por su ID, o None si no existe
-        query = "SELECT * FROM WORK_ORDERS WHERE id = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
+        query = f"SELECT {', '.join(self._COLUMNS)} FROM WORK_ORDERS WHERE id = %s"
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
             cursor.execute(query, (order_id,))
             row = cursor.fetchone()
-            self._db_manager.close_connection()
             return self._row_to_entity(row) if row else None
 
+    def count_active_by_technician(self, technician_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Cuenta las órdenes en curso (IN_PROGRESS) de varios técnicos con una sola consulta sobre el índice parcial
+        idx_work_orders_in_progress_assigned_to. Se lee del primario porque el resultado decide asignaciones.
+        :param technician_ids: IDs de los técnicos.
+        :return: Diccionario ID de técnico: cantidad de órdenes en curso (0 si no tiene ninguna).
+        """
+        ids = list(dict.fromkeys(technician_ids))
+        if not ids:
+            return {}
+        query = """
+                SELECT assigned_to, COUNT(*)
+                FROM WORK_ORDERS
+                WHERE status = %s AND assigned_to = ANY(%s)
+                GROUP BY assigned_to
+                """
+        loads = dict.fromkeys(ids, 0)
+        with self._db_manager.use_primary(), self._db_manager.connection(readonly=True) as conn, \
+                conn.cursor() as cursor:
+            cursor.execute(query, (Status.IN_PROGRESS.value, ids))
+            loads.update(cursor.fetchall())
+        return loads
+
     def list_by_criteria(self, criteria: dict) -> List[WorkOrder]:
         """
         Lista las órdenes de trabajo que cumplan con ciertos criterios de búsqueda (filtros)
-        :param criteria: Diccionario con valores de tipo columna: valor. Ej.: {'created_by': '1', 'assigned_to': 5}
+        :param criteria: Diccionario con valores de tipo columna: valor. Ej.: {'created_by': 1, 'status': Status.UNASSIGNED,
+        'priority': {'in': [PriorityLevel.CRITICAL, PriorityLevel.URGENT]}}. Ver Criteria.build_where para los operadores.
         :return: Lista de órdenes filtrada. Si no aplican filtros, devuelve todos los registros de la tabla.
         Puede devolver una lista vacía en caso de que no hallan registros.
         """
         _TABLE_NAME = "WORK_ORDERS"
-        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria)
+        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria, self._COLUMNS)
         return [self._row_to_entity(result) for result in results]
 
+    def list_projection(self, criteria: dict, projection: str | Sequence[str] = 'summary') -> List[tuple]:
+        """
+        Igual que list_by_criteria, pero lee solo las columnas de la proyección y devuelve modelos de lectura
+        (namedtuple) en lugar de entidades, para listados que muestran pocos campos.
+        :param criteria: Diccionario con valores de tipo columna: valor.
+        :param projection: Nombre de una vista ('summary', 'board') o lista de columnas.
+        :return: Lista de namedtuple con un campo por columna; los enums quedan como texto.
+        """
+        _TABLE_NAME = "WORK_ORDERS"
+        view = Projection.resolve(projection, self._VIEWS, self._COLUMNS)
+        results = Criteria.list_by_criteria(_TABLE_NAME, self._db_manager, criteria, view.fields)
+        return [view.to_model(result) for result in results]
+
+    def iter_by_criteria(self, criteria: dict, itersize: int = 2000) -> Iterator[WorkOrder]:
+        """
+        Igual que list_by_criteria, pero devuelve las órdenes de a una con un cursor del lado del servidor,
+        para recorrer tablas grandes (exportaciones, reportes) sin cargarlas completas en memoria.
+        :param criteria: Diccionario con valores de tipo columna: valor.
+        :param itersize: Cantidad de filas traídas del servidor en cada viaje.
+        :return: Generador de órdenes de trabajo.
+        """
+        _TABLE_NAME = "WORK_ORDERS"
+        for row in Criteria.iter_by_criteria(_TABLE_NAME, self._db_manager, criteria, itersize,
+                                             self._COLUMNS):
+            yield self._row_to_entity(row)
+
+    def page_by_criteria(self, criteria: dict, page_size: int = 50, sort_key: str = 'id',
+                         after: Optional[str] = None) -> Page[WorkOrder]:
+        """
+        Igual que list_by_criteria, pero de a una página por vez con paginación por keyset.
+        :param criteria: Diccionario con los criterios de búsqueda.
+        :param page_size: Cantidad máxima de resultados por página.
+        :param sort_key: Columna de orden, una de id, opened_at.
+        :param after: next_cursor de la página anterior; None para la primera página.
+        :return: Page de WorkOrder y el cursor de la página siguiente.
+        """
+        if sort_key not in self._SORT_KEYS:
+            raise ValueError(f"No se puede ordenar por {sort_key}")
+        _TABLE_NAME = "WORK_ORDERS"
+        page = Criteria.page_by_criteria(_TABLE_NAME, self._db_manager, criteria, page_size,
+                                         sort_key, after, self._COLUMNS)
+        return Page([self._row_to_entity(row) for row in page.items], page.next_cursor)
+
+    def page_projection(self, criteria: dict, projection: str | Sequence[str] = 'summary', page_size: int = 50,
+                        sort_key: str = 'id', after: Optional[str] = None) -> Page[tuple]:
+        """
+        Igual que page_by_criteria, pero con los modelos de lectura de list_projection.
+        La proyección debe incluir el id y la columna de orden.
+        """
+        if sort_key not in self._SORT_KEYS:
+            raise ValueError(f"No se puede ordenar por {sort_key}")
+        _TABLE_NAME = "WORK_ORDERS"
+        view = Projection.resolve(projection, self._VIEWS, self._COLUMNS)
+        page = Criteria.page_by_criteria(_TABLE_NAME, self._db_manager, criteria, page_size,
+                                         sort_key, after, view.fields)
+        return Page([view.to_model(row) for row in page.items], page.next_cursor)
+
+    def search(self, text: str, filters: Optional[dict] = None, limit: int = 20) -> List[WorkOrder]:
+        """
+        Busca órdenes por texto libre en título, descripción y comentarios de cierre usando el índice de texto
+        completo (search_vector). Acepta la sintaxis de buscadores web: "frase exacta", -excluir, a or b.
+        :param text: Texto a buscar.
+        :param filters: Criterios adicionales con el mismo formato que list_by_criteria.
+        :param limit: Cantidad máxima de resultados.
+        :return: Órdenes que coinciden, de la más relevante a la menos relevante.
+        """
+        where_clause, params = Criteria.build_where("WORK_ORDERS", filters)
+        query = f"""
+                SELECT {', '.join(self._COLUMNS)}
+                FROM work_orders, websearch_to_tsquery('spanish', %s) AS search_query
+                WHERE search_vector @@ search_query {'AND ' + where_clause if where_clause else ''}
+                ORDER BY ts_rank_cd(search_vector, search_query) DESC, id DESC
+                LIMIT %s
+                """
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+            cursor.execute(query, [text, *params, limit])
+            return [self._row_to_entity(row) for row in cursor.fetchall()]
+
+    def fetch_sla_rows(self, criteria: Optional[dict] = None) -> List[tuple]:
+        """
+        Lee las columnas del SLA de las órdenes que cumplan los criterios, para BatchSla.from_rows. Los instantes se
+        devuelven como microsegundos desde la época Unix (bigint), así no se crea un datetime por fila.
+        :param criteria: Criterios con el mismo formato que list_by_criteria; None para todas las órdenes.
+        :return: Filas (id, apertura, resolución o None, tiempo estimado, unidad) ordenadas por ID.
+        """
+        where_clause, params = Criteria.build_where("WORK_ORDERS", criteria)
+        query = f"""
+                SELECT id,
+                       (EXTRACT(EPOCH FROM opened_at) * 1000000)::bigint,
+                       (EXTRACT(EPOCH FROM resolved_at) * 1000000)::bigint,
+                       estimated_time,
+                       estimated_time_unit
+                FROM WORK_ORDERS
+                {'WHERE ' + where_clause if where_clause else ''}
+                ORDER BY id
+                """
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+            cursor.execute(query, params)
+            return cursor.fetchall()
+
+    def export_columns(self, include_assets: bool = False,
+                       include_technicians: bool = False) -> List[Tuple[str, ColumnKind]]:
+        """Nombre y tipo de las columnas que exportan export_batches y copy_export_csv, en orden"""
+        return [(name, kind) for name, _, kind in self._export_spec(include_assets, include_technicians)]
+
+    def export_batches(self, criteria: Optional[dict] = None, include_assets: bool = False,
+                       include_technicians: bool = False, batch_size: int = 10000) -> Iterator[List[tuple]]:
+        """
+        Recorre las órdenes que cumplan los criterios con un cursor del lado del servidor y las devuelve en lotes
+        de batch_size filas, así la memoria usada no depende de la cantidad de órdenes. Para no crear un objeto
+        por valor, las columnas TIMESTAMP se leen como microsegundos desde la época Unix (bigint) y las DATE
+        como días desde la época (int). La conexión queda prestada hasta terminar de recorrer el generador.
+        :param criteria: Criterios con el mismo formato que list_by_criteria; None para todas las órdenes.
+        :param include_assets: Agrega los datos del activo (columnas asset_*).
+        :param include_technicians: Agrega nombre y email del técnico asignado.
+        :param batch_size: Filas por lote (y por viaje al servidor).
+        :return: Generador de listas de tuplas en el orden de export_columns, ordenadas por ID de orden.
+        """
+        spec = self._export_spec(include_assets, include_technicians)
+        select_list = ', '.join(self._export_value(expression, kind) for _, expression, kind in spec)
+        query, params = self._export_query(select_list, criteria, include_assets, include_technicians)
+        with self._db_manager.connection(readonly=True) as conn, \
+                conn.cursor(name=f"export_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+
+    def copy_export_csv(self, file: IO, criteria: Optional[dict] = None, include_assets: bool = False,
+                        include_technicians: bool = False) -> int:
+        """
+        Escribe las órdenes que cumplan los criterios en file como CSV (con encabezado) usando COPY ... TO STDOUT:
+        el servidor genera el CSV y psycopg2 lo copia al archivo a medida que llega, sin crear tuplas en Python.
+        :param file: Archivo abierto para escritura (texto o binario).
+        :return: Cantidad de filas exportadas.
+        """
+        spec = self._export_spec(include_assets, include_technicians)
+        select_list = ', '.join(f'{expression} AS {name}' for name, expression, _ in spec)
+        query, params = self._export_query(select_list, criteria, include_assets, include_technicians)
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+            # COPY no admite parámetros: se incrustan ya escapados con mogrify
+            cursor.copy_expert(f"COPY ({cursor.mogrify(query, params).decode()}) TO STDOUT WITH (FORMAT csv, HEADER)",
+                               file)
+            return cursor.rowcount
+
+    def _export_spec(self, include_assets: bool, include_technicians: bool) -> List[Tuple[str, str, ColumnKind]]:
+        return [*self._EXPORT_COLUMNS, *(self._EXPORT_ASSET_COLUMNS if include_assets else ()),
+                *(self._EXPORT_TECHNICIAN_COLUMNS if include_technicians else ())]
+
+    @staticmethod
+    def _export_query(select_list: str, criteria: Optional[dict], include_assets: bool,
+                      include_technicians: bool) -> Tuple[str, List]:
+        # Los criterios se aplican a work_orders antes de los JOIN, así sus columnas no quedan ambiguas
+        where_clause, params = Criteria.build_where("WORK_ORDERS", criteria)
+        query = (f"SELECT {select_list} "
+                 f"FROM (SELECT * FROM work_orders {'WHERE ' + where_clause if where_clause else ''}) AS w")
+        if include_assets:
+            query += " JOIN industrial_assets a ON a.id = w.asset_id"
+        if include_technicians:
+            query += " LEFT JOIN technicians t ON t.id = w.assigned_to"
+        return query + " ORDER BY w.id", params
+
+    @staticmethod
+    def _export_value(expression: str, kind: ColumnKind) -> str:
+        if kind == ColumnKind.TIMESTAMP:
+            return f"(EXTRACT(EPOCH FROM {expression}) * 1000000)::bigint"
+        if kind == ColumnKind.DATE:
+            return f"({expression} - DATE '1970-01-01')"
+        return expression
+
+    def snapshot_batches(self, modified_since: Optional[datetime] = None,
+                         batch_size: int = 50000) -> Iterator[List[tuple]]:
+        """
+        Lee las columnas numéricas de las órdenes para WorkOrderSnapshot, con un cursor del lado del servidor y en
+        lotes. Todas las columnas son enteros, así la copia en memoria se arma sin crear objetos Python por valor:
+        los enums se devuelven como su posición en el enum (status, priority, maintenance_type y
+        estimated_time_unit), los instantes como microsegundos desde la época Unix (resolved_at sin resolver como
+        el mínimo de int64, que NumPy interpreta como NaT) y assigned_to sin técnico como 0.
+        :param modified_since: Solo las órdenes con updated_at >= este instante; None para todas.
+        :param batch_size: Filas por lote.
+        :return: Generador de listas de tuplas (id, status, priority, maintenance_type, estimated_time_unit,
+        asset_id, created_by, assigned_to, estimated_time, opened_at, resolved_at, deadline_at, updated_at).
+        """
+        codes = {'status': Status, 'priority': PriorityLevel, 'maintenance_type': MaintenanceType,
+                 'estimated_time_unit': TimeUnit}
+        nat = f"({self._NAT_MICROSECONDS})::bigint"
+        query = f"""
+                SELECT id,
+                       {', '.join(f"array_position(%s::text[], {column}::text) - 1" for column in codes)},
+                       asset_id, created_by, COALESCE(assigned_to, 0), estimated_time,
+                       {', '.join(f"COALESCE((EXTRACT(EPOCH FROM {column}) * 1000000)::bigint, {nat})"
+                                  for column in ('opened_at', 'resolved_at', 'deadline_at', 'updated_at'))}
+                FROM WORK_ORDERS
+                {'WHERE updated_at >= %s' if modified_since is not None else ''}
+                """
+        params = [[member.value for member in enum] for enum in codes.values()]
+        if modified_since is not None:
+            params.append(modified_since)
+        with self._db_manager.connection(readonly=True) as conn, \
+                conn.cursor(name=f"snapshot_{uuid.uuid4().hex}") as cursor:
+            cursor.itersize = batch_size
+            cursor.execute(query, params)
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                yield rows
+
+    def list_ids(self) -> List[int]:
+        """IDs de todas las órdenes, ordenados (para detectar eliminaciones en copias en memoria)"""
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT id FROM WORK_ORDERS ORDER BY id")
+            return [row[0] for row in cursor.fetchall()]
+
+    def count_all(self) -> int:
+        with self._db_manager.connection(readonly=True) as conn, conn.cursor() as cursor:
+            cursor.execute("SELECT COUNT(*) FROM WORK_ORDERS")
+            return cursor.fetchone()[0]
+
     def delete(self, order_id: int) -> None:
         """Elimina una orden de trabajo por ID"""
         query = "DELETE FROM WORK_ORDERS WHERE id = %s"
-        with self._db_manager.get_connection().cursor() as cursor:
+        with self._db_manager.connection() as conn, conn.cursor() as cursor:
             cursor.execute(query, (order_id,))
-            self._db_manager.commit_transaction()
-            self._db_manager.close_connection()
+
+    @staticmethod
+    def _to_bulk_row(order_id: int, order: WorkOrder) -> tuple:
+        # Valores de una orden en el orden de _BULK_COLUMNS, usando el atributo value para los enums
+        return (order_id, order.title, order.assigned_to, order.created_by, order.asset_id,
+                order.maintenance_type.value, order.priority.value, order.status.value, order.opened_at,
+                order.estimated_time, order.estimated_time_unit.value, order.description)
 
     @staticmethod
     def _row_to_entity(row) -> WorkOrder:
@@ -0,0 +1,87 @@
+import heapq
+import time
+from typing import List, Optional, Sequence, Tuple
+
+from enertech.src.domain.DispatchReport import DispatchReport
+from enertech.src.service.TechnicianService import TechnicianService
+from enertech.src.service.WorkOrderService import WorkOrderService
+
+
+class DispatchService:
+    """
+    Despacho automático de órdenes sin asignar. Cada lote es una transacción que:
+      1. bloquea técnicos activos con capacidad libre (FOR UPDATE SKIP LOCKED) y cuenta su carga,
+      2. bloquea órdenes UNASSIGNED por prioridad y vencimiento más próximo (FOR UPDATE SKIP LOCKED),
+      3. asigna cada orden, en ese orden, al técnico con menor carga relativa que todavía tenga lugar,
+      4. guarda todas las asignaciones con un solo UPDATE.
+    Como los bloqueos saltean las filas ya tomadas, varios despachadores (hilos o procesos) pueden ejecutar
+    run() a la vez sobre la misma base sin asignar dos veces una orden ni superar max_active_orders; las
+    asignaciones manuales (WorkOrderService.assign) esperan a que termine el lote que bloqueó a su técnico.
+    """
+
+    def __init__(self, work_order_service: WorkOrderService, technician_service: TechnicianService,
+                 batch_size: int = 500):
+        """
+        :param work_order_service: Servicio de órdenes de trabajo.
+        :param technician_service: Servicio de técnicos.
+        :param batch_size: Máximo de órdenes por lote (y de técnicos bloqueados por lote).
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size debe ser un número entero positivo")
+        self._work_order_service = work_order_service
+        self._technician_service = technician_service
+        self._batch_size = batch_size
+
+    def dispatch_batch(self) -> List[Tuple[int, int]]:
+        """
+        Asigna un lote de órdenes en una transacción.
+        :return: Pares (ID de orden, ID de técnico) asignados; vacío si no hay órdenes o técnicos disponibles.
+        """
+        with self._work_order_service.unit_of_work():
+            technicians = self._technician_service.lock_available_technicians(self._batch_size)
+            free_slots = sum(max_active_orders - active_orders for _, active_orders, max_active_orders in technicians)
+            if free_slots <= 0:
+                return []
+            order_ids = self._work_order_service.claim_unassigned(min(self._batch_size, free_slots))
+            assignments = DispatchService._match(order_ids, technicians)
+            self._work_order_service.assign_many(assignments)
+        return assignments
+
+    def run(self, max_batches: Optional[int] = None) -> DispatchReport:
+        """
+        Despacha lotes hasta que no queden órdenes sin asignar o técnicos con capacidad (o hasta max_batches).
+        :param max_batches: Cantidad máxima de lotes; None para no limitar.
+        :return: DispatchReport con las órdenes asignadas.
+        """
+        report = DispatchReport()
+        started = time.perf_counter()
+        while max_batches is None or report.batches < max_batches:
+            assignments = self.dispatch_batch()
+            if not assignments:
+                break
+            report.add_batch(len(assignments))
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    @staticmethod
+    def _match(order_ids: Sequence[int], technicians: Sequence[Tuple[int, int, int]]) -> List[Tuple[int, int]]:
+        """
+        [USO INTERNO] Reparto voraz: recorre las órdenes en orden de atención y da cada una al técnico con menor
+        carga relativa (órdenes en curso / máximo) que tenga lugar, usando un heap.
+        :param order_ids: IDs de las órdenes, en orden de atención.
+        :param technicians: Tríos (ID, órdenes en curso, máximo de órdenes activas).
+        :return: Pares (ID de orden, ID de técnico).
+        """
+        heap = [(active / maximum, active, technician_id, maximum)
+                for technician_id, active, maximum in technicians if active < maximum]
+        heapq.heapify(heap)
+        assignments = []
+        for order_id in order_ids:
+            if not heap:
+                break
+            _, active, technician_id, maximum = heapq.heappop(heap)
+            assignments.append((order_id, technician_id))
+            active += 1
+            if active < maximum:
+                heapq.heappush(heap, (active / maximum, active, technician_id, maximum))
+        return assignments
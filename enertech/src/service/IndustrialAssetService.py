@@ -1,12 +1,26 @@
+import csv
 from datetime import datetime
+from itertools import islice
+from typing import Callable, Iterator, List, Optional, TextIO, Tuple
+import psycopg2
+from enertech.src.AppLogger import AppLogger
 from enertech.src.repository.IndustrialAssetRepository import IndustrialAssetRepository
+from enertech.src.domain.AssetImportReport import AssetImportReport
 from enertech.src.domain.IndustrialAsset import IndustrialAsset
 from enertech.src.domain.IndustrialAssetData import IndustrialAssetData
 
 
 class IndustrialAssetService:
+    # Columnas obligatorias del CSV de importación
+    _CSV_COLUMNS = ('asset_type', 'model', 'location', 'acquisition_date')
+    # Límite de fechas ya convertidas que se recuerdan durante una importación
+    _MAX_CACHED_DATES = 20_000
+    # Largo máximo de los campos de texto (VARCHAR(100) en industrial_assets)
+    _MAX_TEXT_LENGTH = 100
+
     def __init__(self, repository: IndustrialAssetRepository):
         self._repository = repository
+        self._log = AppLogger.setup_logger(IndustrialAssetService.__name__)
 
     def create_asset(self, asset_data: IndustrialAssetData) -> IndustrialAsset:
         """
@@ -60,14 +74,15 @@ class IndustrialAssetService:
         Returns:
             IndustrialAsset: El objeto actualizado con todos sus datos.
         """
-        self.get_asset_by_id(asset_id)  # Verifica que el activo exista
-        asset_to_update = IndustrialAsset(
-            asset_type=asset_data.asset_type,
-            model=asset_data.model,
-            location=asset_data.location,
-            acquisition_date=self._validate_and_parse_date(asset_data.acquisition_date),
-        )
-        asset_updated = self._repository.update(asset_to_update)
+        with self._repository.unit_of_work():
+            self.get_asset_by_id(asset_id)  # Verifica que el activo exista
+            asset_to_update = IndustrialAsset(
+                asset_type=asset_data.asset_type,
+                model=asset_data.model,
+                location=asset_data.location,
+                acquisition_date=self._validate_and_parse_date(asset_data.acquisition_date),
+            )
+            asset_updated = self._repository.update(asset_to_update)
         return asset_updated
 
     def get_assets_by_criteria(self, criteria: dict) -> list[IndustrialAsset]:
@@ -82,6 +97,94 @@ class IndustrialAssetService:
             raise TypeError("Los criterios deben ser un diccionario")
         return self._repository.list_by_criteria(criteria)
 
+    def import_assets_from_csv(self, csv_file: str | TextIO, chunk_size: int = 5000,
+                               on_reject: Optional[Callable[[int, str], None]] = None) -> AssetImportReport:
+        """
+        Importa activos industriales desde un CSV con las columnas asset_type, model, location y
+        acquisition_date (dd/mm/yyyy). El archivo se lee de forma perezosa y se procesa por bloques de
+        chunk_size filas, así que la memoria no crece con el tamaño del archivo. Cada bloque se carga con COPY
+        y se confirma por separado (dentro de una unidad de trabajo, como un SAVEPOINT). Las filas inválidas se
+        rechazan sin detener la importación: si la base rechaza el COPY de un bloque, ese bloque se reintenta
+        fila por fila y solo se rechazan las filas que fallan.
+        Args:
+            csv_file: Ruta del archivo o archivo de texto ya abierto.
+            chunk_size: Cantidad de filas validadas y cargadas por bloque.
+            on_reject: Función que recibe (número de línea, motivo) por cada fila rechazada.
+                       Por defecto el rechazo se registra en el log.
+        Returns:
+            AssetImportReport: Cantidad de filas aceptadas y rechazadas.
+        """
+        if on_reject is None:
+            on_reject = self._log_reject
+        report = AssetImportReport()
+        if isinstance(csv_file, str):
+            with open(csv_file, newline='', encoding='utf-8-sig') as file:
+                return self._import_rows(self._read_csv_rows(file), chunk_size, on_reject, report)
+        return self._import_rows(self._read_csv_rows(csv_file), chunk_size, on_reject, report)
+
+    def _import_rows(self, rows: Iterator[Tuple[int, dict]], chunk_size: int,
+                     on_reject: Callable[[int, str], None], report: AssetImportReport) -> AssetImportReport:
+        """Valida y carga las filas por bloques, cada uno en su propia transacción"""
+        parsed_dates = {}  # cada fecha distinta se convierte una sola vez (como máximo _MAX_CACHED_DATES)
+        while True:
+            chunk = list(islice(rows, chunk_size))
+            if not chunk:
+                break
+            if len(parsed_dates) > self._MAX_CACHED_DATES:
+                parsed_dates.clear()
+            assets = []
+            for line_number, row in chunk:
+                try:
+                    assets.append((line_number, self._row_to_asset(row, parsed_dates)))
+                except (TypeError, ValueError) as e:
+                    report.rejected += 1
+                    on_reject(line_number, str(e))
+            self._copy_chunk(assets, on_reject, report)
+        return report
+
+    def _copy_chunk(self, assets: List[Tuple[int, IndustrialAsset]], on_reject: Callable[[int, str], None],
+                    report: AssetImportReport):
+        """Carga un bloque con un solo COPY; si la base lo rechaza, carga las filas de a una y rechaza las que fallan"""
+        try:
+            report.accepted += self._repository.copy_many(asset for _, asset in assets)
+            return
+        except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+            self._log.warning(f"COPY del bloque rechazado ({str(e).strip()}), se reintenta fila por fila")
+        for line_number, asset in assets:
+            try:
+                report.accepted += self._repository.copy_many([asset])
+            except (psycopg2.DataError, psycopg2.IntegrityError) as e:
+                report.rejected += 1
+                on_reject(line_number, str(e).strip())
+
+    def _row_to_asset(self, row: dict, parsed_dates: dict) -> IndustrialAsset:
+        """Valida una fila del CSV y la convierte en IndustrialAsset"""
+        date_str = row['acquisition_date']
+        acquisition_date = parsed_dates.get(date_str)
+        if acquisition_date is None:
+            try:
+                acquisition_date = self._validate_and_parse_date(date_str)
+            except (TypeError, ValueError) as e:
+                raise type(e)(f"Fecha inválida: {str(e)}") from e
+            parsed_dates[date_str] = acquisition_date
+        self._validate_text_field(row['location'], "Ubicación")
+        self._validate_text_field(row['model'], "Modelo")
+        self._validate_text_field(row['asset_type'], "Tipo de activo")
+        return IndustrialAsset(asset_type=row['asset_type'], model=row['model'],
+                               location=row['location'], acquisition_date=acquisition_date)
+
+    def _read_csv_rows(self, file: TextIO) -> Iterator[Tuple[int, dict]]:
+        """Generador que devuelve (número de línea, fila) sin cargar el archivo completo en memoria"""
+        reader = csv.DictReader(file)
+        missing = [column for column in self._CSV_COLUMNS if column not in (reader.fieldnames or [])]
+        if missing:
+            raise ValueError(f"Faltan columnas en el CSV: {', '.join(missing)}")
+        for row in reader:
+            yield reader.line_num, row
+
+    def _log_reject(self, line_number: int, reason: str):
+        self._log.warning(f"Fila {line_number} rechazada: {reason}")
+
     @staticmethod
     def _validate_and_parse_date(date_str: str) -> datetime.date:
         """Valida y convierte una cadena de fecha en formato dd/mm/yyyy a date."""
@@ -100,6 +203,8 @@ class IndustrialAssetService:
         """Valida campos de texto genéricos según requisitos."""
         if not isinstance(value, str):
             raise TypeError(f"{field_name} debe ser una cadena de texto")
+        if len(value) > IndustrialAssetService._MAX_TEXT_LENGTH:
+            raise ValueError(f"{field_name} no puede superar los {IndustrialAssetService._MAX_TEXT_LENGTH} caracteres")
         value = value.strip()
         if not value:
             raise ValueError(f"{field_name} no puede estar vacío")
@@ -0,0 +1,137 @@
+import bisect
+import threading
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from enertech.src.domain.PriorityLevel import PriorityLevel
+from enertech.src.domain.Status import Status
+from enertech.src.domain.TimeUnit import TimeUnit
+from enertech.src.domain.WorkOrder import WorkOrder
+
+# Modelo de lectura de una orden abierta dentro del índice
+OpenWorkOrder = namedtuple('OpenWorkOrder', ('id', 'title', 'priority', 'status', 'assigned_to', 'deadline'))
+
+
+class OpenWorkOrderIndex:
+    """
+    Índice en memoria de las órdenes abiertas, para responder "qué sigue" sin consultar la base de datos:
+    las primeras K por prioridad y vencimiento, las vencidas y las que vencen dentro de N horas.
+    Mantiene dos listas ordenadas (por (prioridad, vencimiento, id) y por (vencimiento, id)) que se actualizan con
+    bisect; las consultas son búsquedas binarias más la lectura del resultado.
+    Se carga una vez con load() y WorkOrderService lo actualiza tras cada alta, asignación y resolución
+    confirmadas. Solo ve los cambios hechos por este proceso: si otros procesos escriben en la base, conviene
+    recargarlo cada tanto (WorkOrderService.rebuild_open_index).
+    """
+    OPEN_STATUSES = (Status.UNASSIGNED, Status.IN_PROGRESS, Status.REOPENED, Status.WAITING_PARTS, Status.ON_HOLD)
+    _PRIORITY_RANK = {level: rank for rank, level in enumerate(PriorityLevel)}
+    _UNIT_DURATION = {TimeUnit.HOURS: timedelta(hours=1), TimeUnit.DAYS: timedelta(days=1),
+                      TimeUnit.WEEKS: timedelta(weeks=1)}
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._orders: Dict[int, OpenWorkOrder] = {}
+        self._by_priority: List[tuple] = []  # (rango de prioridad, vencimiento, id)
+        self._by_deadline: List[tuple] = []  # (vencimiento, id)
+
+    def __len__(self) -> int:
+        return len(self._orders)
+
+    def load(self, orders: Iterable[WorkOrder]):
+        """Reemplaza el contenido del índice por las órdenes abiertas recibidas (las cerradas se ignoran)"""
+        entries = [OpenWorkOrderIndex._to_entry(order) for order in orders
+                   if order.status in OpenWorkOrderIndex.OPEN_STATUSES]
+        with self._lock:
+            self._orders = {entry.id: entry for entry in entries}
+            self._by_priority = sorted(OpenWorkOrderIndex._priority_key(entry) for entry in self._orders.values())
+            self._by_deadline = sorted((entry.deadline, entry.id) for entry in self._orders.values())
+
+    def upsert(self, order: WorkOrder):
+        """Agrega o actualiza una orden; si ya no está abierta, la quita"""
+        if order.status not in OpenWorkOrderIndex.OPEN_STATUSES:
+            self.remove(order.id)
+            return
+        entry = OpenWorkOrderIndex._to_entry(order)
+        with self._lock:
+            self._remove(entry.id)
+            self._orders[entry.id] = entry
+            bisect.insort(self._by_priority, OpenWorkOrderIndex._priority_key(entry))
+            bisect.insort(self._by_deadline, (entry.deadline, entry.id))
+
+    def mark_assigned(self, order_id: int, technician_id: int):
+        """Refleja una asignación (la orden pasa a IN_PROGRESS); prioridad y vencimiento no cambian"""
+        with self._lock:
+            entry = self._orders.get(order_id)
+            if entry is not None:
+                self._orders[order_id] = entry._replace(status=Status.IN_PROGRESS, assigned_to=technician_id)
+
+    def remove(self, order_id: int):
+        """Quita una orden (resuelta, cancelada o eliminada)"""
+        with self._lock:
+            self._remove(order_id)
+
+    def get(self, order_id: int) -> Optional[OpenWorkOrder]:
+        return self._orders.get(order_id)
+
+    def top(self, k: int, statuses: Optional[Sequence[Status]] = None) -> List[OpenWorkOrder]:
+        """
+        Las k órdenes más urgentes: mayor prioridad primero y, a igual prioridad, vencimiento más próximo.
+        :param k: Cantidad máxima de órdenes.
+        :param statuses: Estados a incluir (ej.: solo UNASSIGNED); None para todas las abiertas.
+        """
+        result = []
+        with self._lock:
+            for _, _, order_id in self._by_priority:
+                if len(result) >= k:
+                    break
+                entry = self._orders[order_id]
+                if statuses is None or entry.status in statuses:
+                    result.append(entry)
+        return result
+
+    def overdue(self, now: Optional[datetime] = None, limit: Optional[int] = None) -> List[OpenWorkOrder]:
+        """Órdenes abiertas con el vencimiento ya pasado, la más atrasada primero"""
+        now = OpenWorkOrderIndex._aware(now or datetime.now())
+        with self._lock:
+            end = bisect.bisect_left(self._by_deadline, (now,))
+            if limit is not None:
+                end = min(end, limit)
+            return [self._orders[order_id] for _, order_id in self._by_deadline[:end]]
+
+    def due_within(self, hours: float, now: Optional[datetime] = None) -> List[OpenWorkOrder]:
+        """Órdenes abiertas que vencen entre ahora y dentro de hours horas, la más próxima primero"""
+        now = OpenWorkOrderIndex._aware(now or datetime.now())
+        with self._lock:
+            start = bisect.bisect_left(self._by_deadline, (now,))
+            end = bisect.bisect_left(self._by_deadline, (now + timedelta(hours=hours),))
+            return [self._orders[order_id] for _, order_id in self._by_deadline[start:end]]
+
+    def _remove(self, order_id: int):
+        entry = self._orders.pop(order_id, None)
+        if entry is None:
+            return
+        OpenWorkOrderIndex._delete(self._by_priority, OpenWorkOrderIndex._priority_key(entry))
+        OpenWorkOrderIndex._delete(self._by_deadline, (entry.deadline, entry.id))
+
+    @staticmethod
+    def _delete(sorted_list: List[tuple], key: tuple):
+        position = bisect.bisect_left(sorted_list, key)
+        if position < len(sorted_list) and sorted_list[position] == key:
+            del sorted_list[position]
+
+    @staticmethod
+    def _priority_key(entry: OpenWorkOrder) -> tuple:
+        return OpenWorkOrderIndex._PRIORITY_RANK[entry.priority], entry.deadline, entry.id
+
+    @staticmethod
+    def _to_entry(order: WorkOrder) -> OpenWorkOrder:
+        # Mismo vencimiento que usa el despacho: apertura + tiempo estimado (días de 24 h, semanas de 168 h)
+        deadline = (OpenWorkOrderIndex._aware(order.opened_at)
+                    + order.estimated_time * OpenWorkOrderIndex._UNIT_DURATION[order.estimated_time_unit])
+        return OpenWorkOrder(order.id, order.title, order.priority, order.status, order.assigned_to, deadline)
+
+    @staticmethod
+    def _aware(moment: datetime) -> datetime:
+        # Las fechas leídas de la base tienen zona horaria y las creadas en memoria son locales sin zona: todo se
+        # pasa a UTC, que además hace rápidas las comparaciones (mismo tzinfo, sin calcular desplazamientos)
+        return moment.astimezone(timezone.utc)
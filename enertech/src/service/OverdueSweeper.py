@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import Optional
+
+from enertech.src.AppLogger import AppLogger
+from enertech.src.domain.SweepReport import SweepReport
+from enertech.src.service.WorkOrderService import WorkOrderService
+
+
+class OverdueSweeper:
+    """
+    Barrido periódico del SLA sobre la columna deadline_at (mantenida por un disparador, ver migración 0007):
+      - marca overdue = TRUE en las órdenes abiertas cuyo vencimiento ya pasó,
+      - completa resolved_on_time (resolved_at <= deadline_at) en las órdenes recién resueltas.
+    Cada paso es un UPDATE por lote sobre un índice parcial que solo contiene las filas pendientes, así que el costo
+    depende de cuántas órdenes cambiaron desde el barrido anterior y no del tamaño de la tabla. Los lotes saltean las
+    filas bloqueadas (SKIP LOCKED), por lo que se puede ejecutar junto al despacho o en varios procesos.
+    """
+
+    def __init__(self, work_order_service: WorkOrderService, interval: float = 60.0, batch_size: int = 5000):
+        """
+        :param work_order_service: Servicio de órdenes de trabajo.
+        :param interval: Segundos entre barridos cuando se ejecuta en segundo plano (start).
+        :param batch_size: Máximo de órdenes por UPDATE (y por transacción).
+        """
+        if interval <= 0:
+            raise ValueError("interval debe ser un número positivo")
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size debe ser un número entero positivo")
+        self._work_order_service = work_order_service
+        self._interval = interval
+        self._batch_size = batch_size
+        self._log = AppLogger.setup_logger(OverdueSweeper.__name__)
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def sweep(self) -> SweepReport:
+        """
+        Ejecuta un barrido completo: repite cada UPDATE hasta que un lote quede incompleto.
+        :return: SweepReport con las órdenes actualizadas.
+        """
+        report = SweepReport()
+        started = time.perf_counter()
+        while True:
+            flagged = self._work_order_service.flag_overdue(self._batch_size)
+            report.add_flagged(flagged)
+            if flagged < self._batch_size:
+                break
+        while True:
+            checked = self._work_order_service.fill_resolved_on_time(self._batch_size)
+            report.add_resolved(checked)
+            if checked < self._batch_size:
+                break
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    def start(self):
+        """Inicia los barridos periódicos en un hilo en segundo plano (el primero, de inmediato)"""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=OverdueSweeper.__name__, daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = None):
+        """Detiene los barridos periódicos; espera a que termine el barrido en curso (hasta timeout segundos)"""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def _run(self):
+        while not self._stop.is_set():
+            try:
+                report = self.sweep()
+                if report.flagged_overdue or report.resolved_checked:
+                    self._log.info(str(report))
+            except Exception as e:
+                # Un error (ej.: la base no responde) no detiene el hilo: se reintenta en el próximo barrido
+                self._log.error(f"Falló el barrido de órdenes vencidas: {e}")
+            self._stop.wait(self._interval)
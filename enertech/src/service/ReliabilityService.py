@@ -0,0 +1,59 @@
+from typing import List, Optional
+
+from enertech.src.domain.ReliabilityMetrics import ReliabilityMetrics
+from enertech.src.repository.ReliabilityRepository import ReliabilityRepository
+
+
+class ReliabilityService:
+    """
+    Indicadores de confiabilidad de los activos (MTTR y MTBF) por activo, tipo de activo y ubicación.
+    Las consultas leen las tablas de resumen ya calculadas; refresh() las pone al día recalculando solo los activos
+    con órdenes creadas, resueltas, canceladas o eliminadas desde el refresco anterior.
+    """
+
+    def __init__(self, repository: ReliabilityRepository, batch_size: int = 1000):
+        """
+        :param repository: Repositorio de las tablas de resumen.
+        :param batch_size: Máximo de activos recalculados por transacción.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size debe ser un número entero positivo")
+        self._repository = repository
+        self._batch_size = batch_size
+
+    def refresh(self) -> int:
+        """
+        Recalcula los activos pendientes, en lotes, hasta que no quede ninguno. Si otro proceso está refrescando,
+        no hace nada (ese proceso se encarga de los pendientes).
+        :return: Cantidad de activos recalculados.
+        """
+        refreshed = 0
+        while True:
+            result = self._repository.refresh(self._batch_size)
+            if result is None:
+                return refreshed
+            assets, _ = result
+            refreshed += assets
+            if assets < self._batch_size:
+                return refreshed
+
+    def pending_assets(self) -> int:
+        """Activos con cambios que el próximo refresh() va a recalcular"""
+        return self._repository.count_pending()
+
+    def asset_reliability(self, asset_id: int) -> Optional[ReliabilityMetrics]:
+        if not isinstance(asset_id, int) or asset_id <= 0:
+            raise ValueError("asset_id debe ser un número entero positivo")
+        return self._repository.get_by_asset(asset_id)
+
+    def worst_assets(self, order_by: str = 'mttr', limit: int = 10) -> List[ReliabilityMetrics]:
+        """Activos con peor confiabilidad según order_by ('mttr', 'mtbf' o 'failures')"""
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit debe ser un número entero positivo")
+        return self._repository.list_assets(order_by, limit)
+
+    def reliability_by_asset_type(self) -> List[ReliabilityMetrics]:
+        return self._repository.list_groups(ReliabilityMetrics.ASSET_TYPE)
+
+    def reliability_by_location(self) -> List[ReliabilityMetrics]:
+        return self._repository.list_groups(ReliabilityMetrics.LOCATION)
@@ -24,45 +24,51 @@ class SupervisorService:
     def create_supervisor(self, base_data: UserBaseData, assigned_area: str) -> Supervisor:
         self._validate_type(base_data, assigned_area)
         self._validate_content(base_data, assigned_area)
-        if self._repository.email_exist(base_data.email):
-            raise ValueError("El email ya existe en la base de datos")
-        # Creación del supervisor
-        supervisor = Supervisor(first_name=base_data.first_name, last_name=base_data.last_name,
-                                email=base_data.email, password=base_data.password, assigned_area=assigned_area)
-        # Persistencia y retorno
-        return self._repository.save(supervisor)
+        # La verificación del email y el alta se hacen en una sola transacción
+        with self._repository.unit_of_work():
+            if self._repository.email_exist(base_data.email):
+                raise ValueError("El email ya existe en la base de datos")
+            # Creación del supervisor
+            supervisor = Supervisor(first_name=base_data.first_name, last_name=base_data.last_name,
+                                    email=base_data.email, password=base_data.password, assigned_area=assigned_area)
+            # Persistencia y retorno
+            return self._repository.save(supervisor)
 
     def update_supervisor_details(self, supervisor_id: int, base_data: UserBaseData, assigned_area: str) -> Supervisor:
         self._validate_type(base_data, assigned_area)
         self._validate_content(base_data, assigned_area)
-        # Verificamos si el supervisor existe
-        supervisor = self.get_supervisor_by_id(supervisor_id)
-        # Actualizamos los datos del supervisor
-        if base_data.first_name and base_data.last_name not in (None, ""):
-            supervisor.first_name = base_data.first_name
-        if base_data.last_name and base_data.last_name not in (None, ""):
-            supervisor.last_name = base_data.last_name
-        if base_data.email and base_data.email not in (None, ""):
-            if self._repository.email_exist(base_data.email):
-                raise ValueError("El email ya existe en la base de datos")
-            supervisor.email = base_data.email
-        if base_data.password and base_data.password not in (None, ""):
-            supervisor.password = base_data.password
-        if assigned_area and assigned_area not in (None, ""):
-            supervisor.assigned_area = assigned_area
-        # Guardamos los cambios y retornamos el supervisor actualizado
-        return self._repository.update(supervisor)
+        # Lectura, validación del email y actualización en una sola transacción
+        with self._repository.unit_of_work():
+            # Verificamos si el supervisor existe
+            supervisor = self.get_supervisor_by_id(supervisor_id)
+            # Actualizamos los datos del supervisor
+            if base_data.first_name and base_data.last_name not in (None, ""):
+                supervisor.first_name = base_data.first_name
+            if base_data.last_name and base_data.last_name not in (None, ""):
+                supervisor.last_name = base_data.last_name
+            if base_data.email and base_data.email not in (None, ""):
+                if self._repository.email_exist(base_data.email):
+                    raise ValueError("El email ya existe en la base de datos")
+                supervisor.email = base_data.email
+            if base_data.password and base_data.password not in (None, ""):
+                supervisor.password = base_data.password
+            if assigned_area and assigned_area not in (None, ""):
+                supervisor.assigned_area = assigned_area
+            # Guardamos los cambios y retornamos el supervisor actualizado
+            return self._repository.update(supervisor)
 
     def initiate_work_order(self, order_data: WorkOrderData, asset_id: int, supervisor_id: int) -> WorkOrder:
-        asset = self._industrial_asset_service.get_asset_by_id(asset_id)
-        supervisor = self.get_supervisor_by_id(supervisor_id)
-        # Guardamos la orden de trabajo y retornamos
-        return self._work_order_service.create_work_order(order_data, supervisor, asset)
+        # Todas las consultas comparten una conexión y se confirman con un único commit
+        with self._repository.unit_of_work():
+            asset = self._industrial_asset_service.get_asset_by_id(asset_id)
+            supervisor = self.get_supervisor_by_id(supervisor_id)
+            # Guardamos la orden de trabajo y retornamos
+            return self._work_order_service.create_work_order(order_data, supervisor, asset)
 
     def assign_work_order(self, tehcnician_id: int, work_order_id: int) -> WorkOrder:
-        technician = self._technician_service.get_technician_by_id(tehcnician_id)
-        work_order = self._work_order_service.get_work_order_by_id(work_order_id)
-        return self._work_order_service.assign_technician(work_order, technician)
+        # La asignación es atómica y bloquea las filas del técnico y de la orden: varios supervisores pueden
+        # asignar en paralelo sin superar la capacidad del técnico ni tomar la misma orden
+        return self._work_order_service.assign(work_order_id, tehcnician_id)
 
     def get_supervisor_by_id(self, supervisor_id: int) -> Supervisor:
         if not isinstance(supervisor_id, int) or supervisor_id <= 0:
@@ -1,3 +1,4 @@
+from typing import Dict, Iterable, List, Tuple
 from enertech.src.domain.Status import Status
 from enertech.src.domain.Technician import Technician
 from enertech.src.domain.UserBaseData import UserBaseData
@@ -14,12 +15,13 @@ class TechnicianService:
     def create_technician(self, base_data: UserBaseData, max_active_orders: int) -> Technician:
         self._validate_type(base_data, max_active_orders)
         self._validate_content(base_data, max_active_orders)
-        if self._repository.email_exist(base_data.email):
-            raise ValueError("El email ya existe en la base de datos")
-        technician = Technician(first_name=base_data.first_name, last_name=base_data.last_name,
-                                email=base_data.email, password=base_data.password,
-                                max_active_orders=max_active_orders)
-        return self._repository.save(technician)
+        with self._repository.unit_of_work():
+            if self._repository.email_exist(base_data.email):
+                raise ValueError("El email ya existe en la base de datos")
+            technician = Technician(first_name=base_data.first_name, last_name=base_data.last_name,
+                                    email=base_data.email, password=base_data.password,
+                                    max_active_orders=max_active_orders)
+            return self._repository.save(technician)
 
     def get_technician_by_id(self, technician_id: int) -> Technician:
         if not isinstance(technician_id, int) or technician_id < 0:
@@ -30,11 +32,12 @@ class TechnicianService:
         return technician
 
     def mark_order_as_resolved(self, order_id: int, technician_id: int, closure_comments: str) -> WorkOrder:
-        order = self._work_order_service.get_work_order_by_id(order_id)
-        technician = self.get_technician_by_id(technician_id)
-        if order.assigned_to != technician.id:
-            raise PermissionError("La orden de trabajo no pertenece al técnico indicado")
-        return self._work_order_service.resolve_order(order, closure_comments)
+        with self._repository.unit_of_work():
+            order = self._work_order_service.get_work_order_by_id(order_id)
+            technician = self.get_technician_by_id(technician_id)
+            if order.assigned_to != technician.id:
+                raise PermissionError("La orden de trabajo no pertenece al técnico indicado")
+            return self._work_order_service.resolve_order(order, closure_comments)
 
     def exist_technician_by_credentials(self, email: str, password: str) -> bool:
         if not isinstance(email, str) or not isinstance(password, str):
@@ -55,6 +58,37 @@ class TechnicianService:
             raise PermissionError("Debe ser un técnico para obtener sus órdenes de trabajo asignadas")
         return self._work_order_service.list_work_orders({'assigned_to': technician.id, 'status': Status.IN_PROGRESS.value})
 
+    def get_workloads(self, technicians: Iterable[Technician]) -> Dict[int, Tuple[int, int]]:
+        """
+        Carga de trabajo de varios técnicos con una sola consulta.
+        :param technicians: Técnicos a consultar.
+        :return: Diccionario ID de técnico: (órdenes en curso, máximo de órdenes activas).
+        """
+        technicians = list(technicians)
+        if not all(isinstance(technician, Technician) for technician in technicians):
+            raise TypeError("Todos los elementos deben ser instancias de Technician")
+        loads = self._work_order_service.count_active_orders([technician.id for technician in technicians])
+        return {technician.id: (loads[technician.id], technician.max_active_orders) for technician in technicians}
+
+    def lock_available_technicians(self, limit: int) -> List[Tuple[int, int, int]]:
+        """
+        Bloquea (FOR UPDATE SKIP LOCKED) hasta limit técnicos activos con capacidad libre y cuenta su carga ya con
+        el bloqueo tomado. Se usa dentro de WorkOrderService.unit_of_work().
+        :param limit: Cantidad máxima de técnicos.
+        :return: Tríos (ID del técnico, órdenes en curso, máximo de órdenes activas).
+        """
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit debe ser un número entero positivo")
+        technicians = self._repository.lock_available(limit)
+        loads = self._work_order_service.count_active_orders([technician_id for technician_id, _ in technicians])
+        return [(technician_id, loads[technician_id], max_active_orders)
+                for technician_id, max_active_orders in technicians]
+
+    def has_capacity(self, technician: Technician) -> bool:
+        """Indica si el técnico puede recibir otra orden sin superar su máximo de órdenes activas"""
+        active_orders, max_active_orders = self.get_workloads([technician])[technician.id]
+        return active_orders < max_active_orders
+
     @staticmethod
     def _validate_type(base_data: UserBaseData, max_active_orders: int):
         if not isinstance(base_data.first_name, str):
@@ -0,0 +1,142 @@
+import argparse
+import gzip
+import os
+import sys
+import time
+from contextlib import contextmanager
+from datetime import date
+from typing import Iterator, List, Optional
+
+import psycopg2
+
+from enertech.src.database.DatabaseManager import DatabaseManager
+from enertech.src.domain.ExportReport import ExportReport
+from enertech.src.repository.WorkOrderRepository import WorkOrderRepository
+
+
+class WorkOrderExportService:
+    """
+    Exportación de órdenes de trabajo a archivos para herramientas de BI, opcionalmente con los datos del activo y
+    del técnico asignado. Los filtros usan el formato de Criteria (ver WorkOrderRepository.list_by_criteria).
+    Los archivos se escriben en RUTA.tmp y se renombran a la ruta final solo si la exportación termina bien: si falla
+    a mitad de camino (error de la base, disco lleno) el temporal se borra y no queda un archivo truncado que
+    parezca válido.
+    Ambos formatos leen en streaming, así que exportar millones de filas usa memoria acotada:
+      - CSV: COPY ... TO STDOUT, el servidor genera el CSV y se copia al archivo a medida que llega
+        (con extensión .gz se comprime con gzip).
+      - Parquet: cursor del lado del servidor leído en lotes y escrito en grupos de filas de tamaño fijo
+        (requiere el extra opcional export: pip install -e .[export]).
+    """
+
+    def __init__(self, repository: WorkOrderRepository):
+        self._repository = repository
+
+    def export_csv(self, path: str, criteria: Optional[dict] = None, include_assets: bool = False,
+                   include_technicians: bool = False) -> ExportReport:
+        """
+        Exporta las órdenes que cumplan los criterios a un archivo CSV con encabezado.
+        :param path: Archivo a crear; si termina en .gz se comprime con gzip.
+        :param criteria: Criterios de filtrado; None para todas las órdenes.
+        :param include_assets: Agrega tipo, modelo, ubicación y fecha de adquisición del activo.
+        :param include_technicians: Agrega nombre y email del técnico asignado.
+        :return: ExportReport con la cantidad de filas.
+        """
+        report = ExportReport(path, 'csv')
+        started = time.perf_counter()
+        opener = gzip.open if path.endswith('.gz') else open
+        with WorkOrderExportService._atomic_file(path) as temporary_path, opener(temporary_path, 'wb') as file:
+            report.rows = self._repository.copy_export_csv(file, criteria, include_assets, include_technicians)
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    def export_parquet(self, path: str, criteria: Optional[dict] = None, include_assets: bool = False,
+                       include_technicians: bool = False, row_group_size: int = 100000, batch_size: int = 10000,
+                       compression: str = 'zstd') -> ExportReport:
+        """
+        Exporta las órdenes que cumplan los criterios a un archivo Parquet.
+        :param path: Archivo a crear.
+        :param criteria: Criterios de filtrado; None para todas las órdenes.
+        :param include_assets: Agrega tipo, modelo, ubicación y fecha de adquisición del activo.
+        :param include_technicians: Agrega nombre y email del técnico asignado.
+        :param row_group_size: Filas por grupo del archivo Parquet.
+        :param batch_size: Filas leídas de la base por viaje.
+        :param compression: Códec de compresión ('zstd', 'snappy', 'gzip' o 'none').
+        :return: ExportReport con la cantidad de filas y de grupos.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size debe ser un número entero positivo")
+        # pyarrow es una dependencia opcional: solo se importa al exportar a Parquet
+        from enertech.src.export.ParquetExportWriter import ParquetExportWriter
+
+        report = ExportReport(path, 'parquet')
+        started = time.perf_counter()
+        columns = self._repository.export_columns(include_assets, include_technicians)
+        with WorkOrderExportService._atomic_file(path) as temporary_path, \
+                ParquetExportWriter(temporary_path, columns, row_group_size, compression) as writer:
+            for rows in self._repository.export_batches(criteria, include_assets, include_technicians, batch_size):
+                writer.write_rows(rows)
+        report.rows = writer.rows
+        report.row_groups = writer.row_groups
+        report.elapsed_seconds = time.perf_counter() - started
+        return report
+
+    @staticmethod
+    @contextmanager
+    def _atomic_file(path: str) -> Iterator[str]:
+        """Entrega la ruta temporal path + '.tmp'; al salir la renombra a path, o la borra si hubo una excepción"""
+        temporary_path = path + '.tmp'
+        try:
+            yield temporary_path
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+        os.replace(temporary_path, path)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada para exportaciones programadas:
+    python -m enertech.src.service.WorkOrderExportService {csv|parquet} ARCHIVO [--since AAAA-MM-DD] [...]
+    """
+    parser = argparse.ArgumentParser(description="Exporta las órdenes de trabajo de EnerTech a CSV o Parquet")
+    parser.add_argument('format', choices=['csv', 'parquet'])
+    parser.add_argument('path', help="Archivo a crear (para CSV, con extensión .gz se comprime)")
+    parser.add_argument('--since', type=date.fromisoformat, help="Solo órdenes abiertas desde esta fecha")
+    parser.add_argument('--until', type=date.fromisoformat, help="Solo órdenes abiertas antes de esta fecha")
+    parser.add_argument('--status', nargs='+', help="Solo órdenes en estos estados (ej.: RESOLVED CANCELLED)")
+    parser.add_argument('--include-assets', action='store_true', help="Agrega los datos del activo")
+    parser.add_argument('--include-technicians', action='store_true', help="Agrega los datos del técnico asignado")
+    parser.add_argument('--row-group-size', type=int, default=100000, help="Filas por grupo (Parquet)")
+    parser.add_argument('--host', default=os.environ.get('PGHOST', 'localhost'))
+    parser.add_argument('--port', type=int, default=int(os.environ.get('PGPORT', 5432)))
+    parser.add_argument('--user', default=os.environ.get('PGUSER', 'postgres'))
+    parser.add_argument('--dbname', default=os.environ.get('PGDATABASE', 'enertech_db'))
+    args = parser.parse_args(argv)
+    # La contraseña se toma de PGPASSWORD o ~/.pgpass, para no dejarla en el historial de comandos
+    db_config = {'host': args.host, 'port': args.port, 'user': args.user, 'dbname': args.dbname}
+    criteria = {}
+    if args.since or args.until:
+        criteria['opened_at'] = {'range': (args.since, args.until)}
+    if args.status:
+        criteria['status'] = {'in': args.status}
+    db_manager = DatabaseManager(db_config, max_pool_size=2)
+    try:
+        db_manager.initialize()
+        service = WorkOrderExportService(WorkOrderRepository(db_manager))
+        if args.format == 'csv':
+            report = service.export_csv(args.path, criteria, args.include_assets, args.include_technicians)
+        else:
+            report = service.export_parquet(args.path, criteria, args.include_assets, args.include_technicians,
+                                            args.row_group_size)
+        print(report)
+    except (ValueError, psycopg2.Error) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    finally:
+        db_manager.close()
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
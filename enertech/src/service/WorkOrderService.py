@@ -1,6 +1,11 @@
+from contextlib import AbstractContextManager
 from datetime import datetime
-from typing import Optional
+from typing import Any, Callable, Dict, Iterable, Optional, Sequence, Tuple
+from enertech.src.repository.Page import Page
 from enertech.src.repository.WorkOrderRepository import WorkOrderRepository
+from enertech.src.service.OpenWorkOrderIndex import OpenWorkOrder, OpenWorkOrderIndex
+from enertech.src.domain.AssignmentOutcome import AssignmentOutcome
+from enertech.src.domain.AssignmentResult import AssignmentResult
 from enertech.src.domain.WorkOrder import WorkOrder
 from enertech.src.domain.WorkOrderData import WorkOrderData
 from enertech.src.domain.Supervisor import Supervisor
@@ -14,10 +19,239 @@ from enertech.src.domain.TimeUnit import TimeUnit
 
 # Definimos el atributo protegido y el constructor público con parámetro.
 class WorkOrderService:
-    def __init__(self, repository: WorkOrderRepository):
+    _MAX_SEARCH_RESULTS = 100
+    _ASSIGNMENT_ERRORS = {
+        AssignmentOutcome.ORDER_NOT_FOUND: "Orden de trabajo con ID {order_id} no encontrada",
+        AssignmentOutcome.ORDER_NOT_ASSIGNABLE: "La orden de trabajo {order_id} no se puede asignar (estado {status})",
+        AssignmentOutcome.TECHNICIAN_NOT_FOUND: "Técnico con ID {technician_id} no encontrado",
+        AssignmentOutcome.TECHNICIAN_INACTIVE: "El técnico {technician_id} no está activo",
+        AssignmentOutcome.TECHNICIAN_AT_CAPACITY: "El técnico ya tiene el máximo de órdenes de trabajo activas",
+    }
+
+    def __init__(self, repository: WorkOrderRepository, open_index: Optional[OpenWorkOrderIndex] = None):
+        """
+        :param repository: Repositorio de órdenes de trabajo.
+        :param open_index: Índice en memoria de las órdenes abiertas (opcional). Se carga con rebuild_open_index()
+        y se actualiza con las altas, asignaciones y resoluciones hechas por este servicio, al confirmarse.
+        """
         self._repository = repository
+        self._open_index = open_index
 
     def create_work_order(self, order_data: WorkOrderData, supervisor: Supervisor, industrial_asset: IndustrialAsset) -> WorkOrder:
+        order = self._build_work_order(order_data, supervisor, industrial_asset)
+        order = self._repository.save(order)
+        self._update_open_index(lambda index: index.upsert(order))
+        return order
+
+    def create_work_orders_bulk(self, orders: Iterable[Tuple[WorkOrderData, IndustrialAsset]],
+                                supervisor: Supervisor, use_copy: bool = True) -> list[WorkOrder]:
+        """
+        Crea muchas órdenes de trabajo de una vez (por ejemplo, una campaña preventiva sobre varios activos).
+        Aplica las mismas validaciones que create_work_order a todas las órdenes antes de insertar ninguna,
+        y las guarda con una sola transacción.
+        :param orders: Pares (datos de la orden, activo industrial).
+        :param supervisor: Supervisor que crea las órdenes.
+        :param use_copy: True para cargar con COPY; False para usar INSERT multi-fila.
+        :return: Órdenes creadas con su ID asignado, en el mismo orden recibido.
+        """
+        work_orders = []
+        for index, (order_data, industrial_asset) in enumerate(orders):
+            try:
+                work_orders.append(self._build_work_order(order_data, supervisor, industrial_asset))
+            except (TypeError, ValueError) as e:
+                raise type(e)(f"Orden #{index}: {e}") from e
+        ids = self._repository.save_many(work_orders, use_copy=use_copy)
+        for order, order_id in zip(work_orders, ids):
+            order.id = order_id
+
+        def add_to_index(index: OpenWorkOrderIndex):
+            for created_order in work_orders:
+                index.upsert(created_order)
+
+        self._update_open_index(add_to_index)
+        return work_orders
+
+    def get_work_order_by_id(self, work_order_id: int) -> WorkOrder:
+        if not isinstance(work_order_id, int) or work_order_id <= 0:
+            raise ValueError("work_order_id debe ser un número entero positivo")
+        work_order = self._repository.get_by_id(work_order_id)
+        if not work_order:
+            raise ValueError(f"Orden de trabajo con ID {work_order_id} no encontrada")
+        return work_order
+
+    def assign_technician(self, work_order: WorkOrder, technician: Technician) -> WorkOrder:
+        if not isinstance(work_order, WorkOrder) or work_order is None:
+            raise TypeError("work_order debe ser una instancia de WorkOrder")
+        if not isinstance(technician, Technician) or technician is None:
+            raise TypeError("technician debe ser una instancia de Technician")
+        return self.assign(work_order.id, technician.id)
+
+    def assign(self, work_order_id: int, technician_id: int) -> WorkOrder:
+        """
+        Asigna la orden al técnico (ver try_assign) y convierte los conflictos en ValueError.
+        :return: Orden asignada y en curso.
+        """
+        result = self.try_assign(work_order_id, technician_id)
+        if not result.assigned:
+            raise ValueError(self._ASSIGNMENT_ERRORS[result.outcome].format(
+                order_id=work_order_id, technician_id=technician_id,
+                status=result.order_status.value if result.order_status else None))
+        return result.work_order
+
+    def try_assign(self, work_order_id: int, technician_id: int) -> AssignmentResult:
+        """
+        Asigna la orden al técnico de forma atómica: la capacidad del técnico y el estado de la orden se verifican
+        con las filas bloqueadas, así dos supervisores que asignan a la vez nunca superan max_active_orders ni
+        toman la misma orden. Los conflictos se devuelven en el resultado, sin lanzar excepciones.
+        :param work_order_id: ID de la orden.
+        :param technician_id: ID del técnico.
+        :return: AssignmentResult con la orden asignada o el motivo del conflicto.
+        """
+        if not isinstance(work_order_id, int) or work_order_id <= 0:
+            raise ValueError("work_order_id debe ser un número entero positivo")
+        if not isinstance(technician_id, int) or technician_id <= 0:
+            raise ValueError("technician_id debe ser un número entero positivo")
+        result = self._repository.assign(work_order_id, technician_id)
+        if result.assigned:
+            self._update_open_index(lambda index: index.mark_assigned(work_order_id, technician_id))
+        return result
+
+    def count_active_orders(self, technician_ids: Iterable[int]) -> Dict[int, int]:
+        """
+        Cantidad de órdenes en curso de cada técnico, con una sola consulta.
+        :param technician_ids: IDs de los técnicos.
+        :return: Diccionario ID de técnico: órdenes en curso.
+        """
+        technician_ids = list(technician_ids)
+        if not all(isinstance(technician_id, int) and technician_id > 0 for technician_id in technician_ids):
+            raise ValueError("Los IDs de técnico deben ser números enteros positivos")
+        return self._repository.count_active_by_technician(technician_ids)
+
+    def unit_of_work(self) -> AbstractContextManager:
+        """Abre una unidad de trabajo compartida por todos los repositorios del mismo DatabaseManager"""
+        return self._repository.unit_of_work()
+
+    def claim_unassigned(self, limit: int) -> list[int]:
+        """
+        Bloquea (FOR UPDATE SKIP LOCKED) hasta limit órdenes sin asignar en orden de atención: prioridad y luego
+        vencimiento. Se usa dentro de unit_of_work().
+        """
+        if not isinstance(limit, int) or limit <= 0:
+            raise ValueError("limit debe ser un número entero positivo")
+        return self._repository.claim_unassigned(limit)
+
+    def assign_many(self, assignments: Sequence[Tuple[int, int]]) -> int:
+        """
+        Asigna en bloque pares (orden, técnico) ya bloqueados con claim_unassigned y
+        TechnicianService.lock_available_technicians en la misma unidad de trabajo.
+        :return: Cantidad de órdenes asignadas.
+        """
+        assigned = self._repository.assign_many(assignments)
+
+        def mark_in_index(index: OpenWorkOrderIndex):
+            for order_id, technician_id in assignments:
+                index.mark_assigned(order_id, technician_id)
+
+        self._update_open_index(mark_in_index)
+        return assigned
+
+    def flag_overdue(self, batch_size: int = 5000) -> int:
+        """
+        Marca como vencidas (overdue) las órdenes abiertas cuya fecha límite ya pasó, un lote por llamada.
+        :return: Cantidad de órdenes marcadas; menor que batch_size cuando no quedan más.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size debe ser un número entero positivo")
+        return self._repository.flag_overdue(batch_size)
+
+    def fill_resolved_on_time(self, batch_size: int = 5000) -> int:
+        """
+        Completa resolved_on_time en las órdenes resueltas que todavía no lo tienen, un lote por llamada.
+        :return: Cantidad de órdenes actualizadas; menor que batch_size cuando no quedan más.
+        """
+        if not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("batch_size debe ser un número entero positivo")
+        return self._repository.fill_resolved_on_time(batch_size)
+
+    def resolve_order(self, order: WorkOrder, closure_coments: str) -> WorkOrder:
+        order.closure_comments = closure_coments
+        order.status = Status.RESOLVED
+        order.resolved_at = datetime.now()
+        resolved_order = self._repository.update(order)
+        self._update_open_index(lambda index: index.remove(order.id))
+        return resolved_order
+
+    def rebuild_open_index(self) -> int:
+        """
+        Carga (o recarga) el índice de órdenes abiertas desde la base de datos.
+        :return: Cantidad de órdenes abiertas cargadas.
+        """
+        index = self._require_open_index()
+        index.load(self._repository.iter_by_criteria({'status': {'in': list(OpenWorkOrderIndex.OPEN_STATUSES)}}))
+        return len(index)
+
+    def next_work_orders(self, k: int = 10, statuses: Optional[Sequence[Status]] = None) -> list[OpenWorkOrder]:
+        """Las k órdenes abiertas más urgentes (prioridad y luego vencimiento), sin consultar la base de datos"""
+        if not isinstance(k, int) or k <= 0:
+            raise ValueError("k debe ser un número entero positivo")
+        return self._require_open_index().top(k, statuses)
+
+    def overdue_work_orders(self, limit: Optional[int] = None) -> list[OpenWorkOrder]:
+        """Órdenes abiertas ya vencidas, la más atrasada primero, sin consultar la base de datos"""
+        return self._require_open_index().overdue(limit=limit)
+
+    def work_orders_due_within(self, hours: float) -> list[OpenWorkOrder]:
+        """Órdenes abiertas que vencen dentro de las próximas hours horas, sin consultar la base de datos"""
+        if not isinstance(hours, (int, float)) or hours <= 0:
+            raise ValueError("hours debe ser un número positivo")
+        return self._require_open_index().due_within(hours)
+
+    def list_work_orders(self, criteria: Optional[dict] = None) -> list[WorkOrder]:
+        if criteria is None:
+            criteria = {}
+        if not isinstance(criteria, dict):
+            raise TypeError("criteria debe ser un diccionario")
+        return self._repository.list_by_criteria(criteria)
+
+    def page_work_orders(self, criteria: Optional[dict] = None, page_size: int = 50, sort_key: str = 'id',
+                         after: Optional[str] = None) -> Page[WorkOrder]:
+        if criteria is None:
+            criteria = {}
+        if not isinstance(criteria, dict):
+            raise TypeError("criteria debe ser un diccionario")
+        return self._repository.page_by_criteria(criteria, page_size, sort_key, after)
+
+    def page_work_order_views(self, criteria: Optional[dict] = None, view: str | Sequence[str] = 'summary',
+                              page_size: int = 50, sort_key: str = 'id', after: Optional[str] = None) -> Page[tuple]:
+        if criteria is None:
+            criteria = {}
+        if not isinstance(criteria, dict):
+            raise TypeError("criteria debe ser un diccionario")
+        return self._repository.page_projection(criteria, view, page_size, sort_key, after)
+
+    def search_work_orders(self, text: str, criteria: Optional[dict] = None, limit: int = 20) -> list[WorkOrder]:
+        if not isinstance(text, str) or not text.strip():
+            raise ValueError("El texto a buscar no puede estar vacío")
+        if criteria is not None and not isinstance(criteria, dict):
+            raise TypeError("criteria debe ser un diccionario")
+        if not isinstance(limit, int) or not 0 < limit <= self._MAX_SEARCH_RESULTS:
+            raise ValueError(f"limit debe ser un entero entre 1 y {self._MAX_SEARCH_RESULTS}")
+        return self._repository.search(text.strip(), criteria, limit)
+
+    def _update_open_index(self, change: Callable[[OpenWorkOrderIndex], Any]):
+        # El índice refleja solo cambios confirmados: dentro de una unidad de trabajo se aplica al hacer commit
+        if self._open_index is not None:
+            index = self._open_index
+            self._repository.after_commit(lambda: change(index))
+
+    def _require_open_index(self) -> OpenWorkOrderIndex:
+        if self._open_index is None:
+            raise RuntimeError("El servicio no tiene un índice de órdenes abiertas (parámetro open_index)")
+        return self._open_index
+
+    @staticmethod
+    def _build_work_order(order_data: WorkOrderData, supervisor: Supervisor, industrial_asset: IndustrialAsset) -> WorkOrder:
+        """Valida los datos recibidos y construye la orden de trabajo (sin guardarla)"""
         for field_name in ['title', 'description']:
             value = getattr(order_data, field_name, None)
             if not isinstance(value, str):
@@ -53,40 +287,4 @@ class WorkOrderService:
 
         order.assigned_to = None
         order.status = Status.UNASSIGNED
-        order = self._repository.save(order)
         return order
-
-    def get_work_order_by_id(self, work_order_id: int) -> WorkOrder:
-        if not isinstance(work_order_id, int) or work_order_id <= 0:
-            raise ValueError("work_order_id debe ser un número entero positivo")
-        work_order = self._repository.get_by_id(work_order_id)
-        if not work_order:
-            raise ValueError(f"Orden de trabajo con ID {work_order_id} no encontrada")
-        return work_order
-
-    def assign_technician(self, work_order: WorkOrder, technician: Technician) -> WorkOrder:
-        if not isinstance(work_order, WorkOrder) or work_order is None:
-            raise TypeError("work_order debe ser una instancia de WorkOrder")
-        if not isinstance(technician, Technician) or technician is None:
-            raise TypeError("technician debe ser una instancia de Technician")
-        orders_assigned_to_this_technician = self._repository.list_by_criteria(
-            {'assigned_to': technician.id, 'status': Status.IN_PROGRESS})
-        if len(orders_assigned_to_this_technician) >= technician.max_active_orders:
-            raise ValueError("El técnico ya tiene el máximo de órdenes de trabajo activas")
-        work_order.assigned_to = technician.id
-        work_order.status = Status.IN_PROGRESS
-        return self._repository.update(work_order)
-
-    def resolve_order(self, order: WorkOrder, closure_coments: str) -> WorkOrder:
-        order.closure_comments = closure_coments
-        order.status = Status.RESOLVED
-        order.resolved_at = datetime.now()
-        return self._repository.update(order)
-
-    def list_work_orders(self, criteria: Optional[dict] = None) -> list[WorkOrder]:
-        if criteria is None:
-            criteria = {}
-        if not isinstance(criteria, dict):
-            raise TypeError("criteria debe ser un diccionario")
-        return self._repository.list_by_criteria(criteria)
-